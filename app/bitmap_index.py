@@ -0,0 +1,516 @@
+import json
+import threading
+from itertools import combinations
+
+import click
+from flask import current_app, has_app_context
+from sqlalchemy import text
+
+from .columnar import ARG_COLUMNS, SCRIPT_COLUMNS, VERB_COLUMNS, CollationProfile, compared_values
+from .extensions import db
+from .filter_spec import DEPENDENCY_KEYS, FEATURE_FILTERS, FEATURE_LABELS
+from .versions import corpus_version
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency: the other engines are used without it
+    np = None
+
+
+# -------------------------------------------------------------------
+# Optional bitmap inverted index over verb occurrences
+# -------------------------------------------------------------------
+# Every filter ends up as a set of verb occurrences (sent_id, token_id). Each
+# occurrence gets a dense id (in (sent_id, token_id) order) and every value of
+# an indexed column a bitmap of the occurrences that have it:
+#
+#   - verb columns (verb, gloss, sense, source, stored initials, the nine
+#     features) are bitmaps over occurrences;
+#   - argument columns (dep_rel, case value, lemma, and their translit variants)
+#     are bitmaps over argument rows (grouped by head occurrence). A dependency
+#     block ANDs them, so one argument token has to match all its selections,
+#     and is then projected onto its head occurrences.
+#
+# A value set on many ids is kept as a NumPy packed bit array (np.packbits);
+# a sparse one as runs of consecutive ids, whichever is smaller. Filters are
+# bitwise ANDs (ORs for multi-selects), counts are popcounts, and "which values
+# remain" is one popcount per dense value plus a prefix-sum lookup per run.
+#
+# Values are compared exactly. As in the columnar engine, a spec is only covered
+# where that gives the SQL results under the column collations: the build records
+# the database's view of the strings (columnar.CollationProfile), and every value
+# the spec compares must be stored exactly in its column. Blocks that one argument
+# could satisfy together need pairwise distinct tokens, which bitmaps don't carry;
+# two blocks are only known apart when they pin different stored values on the
+# same column. Specs not covered go to the columnar engine / SQL (bitmap_engine()
+# returns None). Ingest's one verbs row per occurrence is assumed.
+#
+# The index is built offline into a .npz file (flask build-bitmap-index, or by
+# flask ingest when BITMAP_INDEX is set) stamped with the corpus version. Every
+# process loads it from BITMAP_INDEX on first use and ignores it while its stamp
+# differs from the live corpus version.
+
+# Derived verb columns: the verbs list groups by (verb, gloss) senses.
+SENSE_COLUMNS = {
+    'language': ('lemma', 'gloss'),
+    'translit': ('translit_verb', 'gloss'),
+}
+
+VERB_INDEX_COLUMNS = (
+    'lemma', 'gloss', 'translit_verb', 'source_id', 'lemma_initial', 'translit_initial',
+    'gloss_norm', 'translit_verb_norm',
+) + tuple(column for _, column, _ in FEATURE_FILTERS)
+
+ARG_INDEX_COLUMNS = ('dep_rel', 'case_value', 'lemma', 'translit_dep_lemma', 'translit_lemma')
+
+# Layout of the .npz file; files of another format are not used.
+INDEX_FORMAT = 2
+
+_load_lock = threading.Lock()
+
+if np is not None:
+    _POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def _popcount(packed):
+    """Set bits per byte of a packed array."""
+    if hasattr(np, 'bitwise_count'):  # NumPy >= 2.0
+        return np.bitwise_count(packed)
+    return _POPCOUNT[packed]
+
+
+def _sense_column(script):
+    return '+'.join(SENSE_COLUMNS[script])
+
+
+def _arg_column(column):
+    return f'arguments.{column}'
+
+
+def _key(value):
+    # JSON turns tuples (sense values) into lists
+    return tuple(value) if isinstance(value, list) else value
+
+
+class BitmapColumn:
+    """
+    Bitmaps of one column over n ids: a packed row per dense value, runs
+    [run_start, run_end) tagged with their value for the sparse ones.
+    """
+
+    def __init__(self, n, values, cardinality, dense_values, packed, run_value, run_start, run_end):
+        self.n = n
+        self.values = values
+        self.vocab = {value: code for code, value in enumerate(values)}
+        self.cardinality = cardinality
+        self.dense_values = dense_values
+        self.dense_row = {code: row for row, code in enumerate(dense_values.tolist())}
+        self.packed = packed
+        self.run_value = run_value
+        self.run_start = run_start
+        self.run_end = run_end
+        offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(run_value, minlength=len(values)), out=offsets[1:])
+        self.run_offsets = offsets
+
+    @classmethod
+    def build(cls, n, ids, raw):
+        """From parallel id / value sequences (one pair per row)."""
+        values = {}
+        codes = np.fromiter((values.setdefault(v, len(values)) for v in raw), dtype=np.int64, count=len(raw))
+        pairs = np.unique((codes << 32) | np.asarray(ids, dtype=np.int64))
+        code, pos = pairs >> 32, pairs & 0xFFFFFFFF
+
+        # A run starts at every value change and every gap in the ids
+        starts = np.ones(len(pairs), dtype=bool)
+        starts[1:] = (code[1:] != code[:-1]) | (pos[1:] != pos[:-1] + 1)
+        first = np.flatnonzero(starts)
+        last = np.append(first[1:], len(pairs))[:len(first)] - 1
+        run_value, run_start, run_end = code[first], pos[first], pos[last] + 1
+
+        n_values = len(values)
+        cardinality = np.bincount(code, minlength=n_values).astype(np.int64)
+        runs = np.bincount(run_value, minlength=n_values)
+        # Runs cost two int32 each, a packed row n/8 bytes
+        dense = np.flatnonzero(runs * 8 >= (n + 7) // 8)
+
+        packed = np.zeros((len(dense), (n + 7) // 8), dtype=np.uint8)
+        for row, value in enumerate(dense.tolist()):
+            selected = run_value == value
+            packed[row] = _runs_to_packed(n, run_start[selected], run_end[selected])
+
+        sparse = ~np.isin(run_value, dense)
+        return cls(
+            n, list(values), cardinality, dense.astype(np.int32), packed,
+            run_value[sparse].astype(np.int32), run_start[sparse].astype(np.int32),
+            run_end[sparse].astype(np.int32),
+        )
+
+    def bits(self, codes):
+        """Packed union of the bitmaps of codes."""
+        result = np.zeros((self.n + 7) // 8, dtype=np.uint8)
+        starts, ends = [], []
+        for code in codes:
+            row = self.dense_row.get(code)
+            if row is not None:
+                result |= self.packed[row]
+            else:
+                lo, hi = self.run_offsets[code], self.run_offsets[code + 1]
+                starts.append(self.run_start[lo:hi])
+                ends.append(self.run_end[lo:hi])
+        if starts:
+            result |= _runs_to_packed(self.n, np.concatenate(starts), np.concatenate(ends))
+        return result
+
+    def eq(self, value):
+        code = self.vocab.get(value)
+        return self.bits([] if code is None else [code])
+
+    def isin(self, values):
+        return self.bits([self.vocab[v] for v in values if v in self.vocab])
+
+    def counts(self, filt):
+        """Per-value number of ids in filt (None: all ids)."""
+        if filt is None:
+            return self.cardinality.copy()
+        counts = np.zeros(len(self.values), dtype=np.int64)
+        if len(self.dense_values):
+            counts[self.dense_values] = _popcount(self.packed & filt).sum(axis=1, dtype=np.int64)
+        if len(self.run_value):
+            prefix = np.zeros(self.n + 1, dtype=np.int64)
+            np.cumsum(np.unpackbits(filt, count=self.n), out=prefix[1:])
+            counts += np.bincount(
+                self.run_value, weights=prefix[self.run_end] - prefix[self.run_start], minlength=len(self.values),
+            ).astype(np.int64)
+        return counts
+
+    def nbytes(self):
+        return self.packed.nbytes + self.run_value.nbytes + self.run_start.nbytes + self.run_end.nbytes
+
+
+def _runs_to_packed(n, starts, ends):
+    edges = np.zeros(n + 1, dtype=np.int32)
+    np.add.at(edges, starts, 1)
+    np.add.at(edges, ends, -1)
+    return np.packbits(np.cumsum(edges[:n]) > 0)
+
+
+def _can_share_token(dep_a, dep_b):
+    # Stored values of a collision-free column: different means different in SQL.
+    return not any(dep_a.get(key) and dep_b.get(key) and dep_a[key] != dep_b[key] for key in DEPENDENCY_KEYS)
+
+
+def _and(*bitmaps):
+    """AND of the given packed bitmaps, None (everything) when none applies."""
+    result = None
+    for bits in bitmaps:
+        if bits is not None:
+            result = bits if result is None else result & bits
+    return result
+
+
+class BitmapIndex:
+
+    def __init__(self, columns, occurrence_sentence, arg_occurrence, version=None, collation=None):
+        self.columns = columns
+        self.collation = collation or CollationProfile()
+        self.occurrence_sentence = occurrence_sentence
+        self.arg_occurrence = arg_occurrence
+        self.version = version
+        self.n_occurrences = len(occurrence_sentence)
+        self.n_args = len(arg_occurrence)
+
+    # ---------------------------------------------------------------
+    # Building / storage
+    # ---------------------------------------------------------------
+    @classmethod
+    def from_rows(cls, verb_rows, arg_rows, version=None, collation=None):
+        """From verbs/arguments rows in columnar.VERB_COLUMNS / ARG_COLUMNS order."""
+        verb_cols = dict(zip(VERB_COLUMNS, zip(*verb_rows))) if verb_rows else dict.fromkeys(VERB_COLUMNS, ())
+        arg_cols = dict(zip(ARG_COLUMNS, zip(*arg_rows))) if arg_rows else dict.fromkeys(ARG_COLUMNS, ())
+
+        # Dense occurrence ids in (sent_id, token_id) order
+        sentences = sorted(set(verb_cols['sent_id']))
+        sentence_code = {sent_id: code for code, sent_id in enumerate(sentences)}
+        verb_sent = np.fromiter((sentence_code[s] for s in verb_cols['sent_id']), dtype=np.int64,
+                                count=len(verb_rows))
+        occurrence_keys, verb_occurrence = np.unique(
+            (verb_sent << 32) | np.asarray(verb_cols['token_id'], dtype=np.int64), return_inverse=True,
+        )
+        n = len(occurrence_keys)
+
+        columns = {}
+        for column in VERB_INDEX_COLUMNS:
+            columns[column] = BitmapColumn.build(n, verb_occurrence, verb_cols[column])
+        for script, sense in SENSE_COLUMNS.items():
+            columns[_sense_column(script)] = BitmapColumn.build(
+                n, verb_occurrence, list(zip(*(verb_cols[c] for c in sense))),
+            )
+
+        # Arguments of an indexed occurrence, in head occurrence order
+        arg_sent = np.fromiter((sentence_code.get(s, -1) for s in arg_cols['sent_id']), dtype=np.int64,
+                               count=len(arg_rows))
+        head_key = (arg_sent << 32) | np.asarray(arg_cols['head_id'], dtype=np.int64)
+        pos = np.minimum(np.searchsorted(occurrence_keys, head_key), max(n - 1, 0))
+        attached = (arg_sent >= 0) & (occurrence_keys[pos] == head_key) if n else np.zeros(len(arg_rows), bool)
+        order = np.flatnonzero(attached)[np.argsort(pos[attached], kind='stable')]
+        arg_occurrence = pos[order].astype(np.int32)
+        for column in ARG_INDEX_COLUMNS:
+            raw = arg_cols[column]
+            columns[_arg_column(column)] = BitmapColumn.build(
+                len(order), np.arange(len(order)), [raw[i] for i in order.tolist()],
+            )
+
+        return cls(columns, (occurrence_keys >> 32).astype(np.int32), arg_occurrence, version, collation)
+
+    @classmethod
+    def build(cls, version=None):
+        verb_cols = ", ".join(f"`{c}`" for c in VERB_COLUMNS)
+        arg_cols = ", ".join(f"`{c}`" for c in ARG_COLUMNS)
+        with db.engine.connect() as conn:
+            verb_rows = [tuple(r) for r in conn.execute(text(f"SELECT {verb_cols} FROM verbs"))]
+            arg_rows = [tuple(r) for r in conn.execute(text(f"SELECT {arg_cols} FROM arguments"))]
+            collation = CollationProfile.read(conn, verb_rows, arg_rows)
+        return cls.from_rows(verb_rows, arg_rows, version, collation)
+
+    def save(self, path):
+        names = list(self.columns)
+        arrays = {'occurrence_sentence': self.occurrence_sentence, 'arg_occurrence': self.arg_occurrence}
+        for i, name in enumerate(names):
+            col = self.columns[name]
+            arrays.update({
+                f'c{i}_cardinality': col.cardinality, f'c{i}_dense_values': col.dense_values,
+                f'c{i}_packed': col.packed, f'c{i}_run_value': col.run_value,
+                f'c{i}_run_start': col.run_start, f'c{i}_run_end': col.run_end,
+            })
+        meta = {
+            'format': INDEX_FORMAT,
+            'version': self.version,
+            'collation': {'colliding': list(self.collation.colliding), 'order': self.collation.order},
+            'columns': [{'name': name, 'n': self.columns[name].n, 'values': self.columns[name].values}
+                        for name in names],
+        }
+        with open(path, 'wb') as f:
+            np.savez(f, meta=np.array(json.dumps(meta, ensure_ascii=False)), **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            if meta.get('format') != INDEX_FORMAT:
+                raise ValueError(f"bitmap index format {meta.get('format')} (expected {INDEX_FORMAT})")
+            columns = {}
+            for i, col in enumerate(meta['columns']):
+                columns[col['name']] = BitmapColumn(
+                    col['n'], [_key(v) for v in col['values']], data[f'c{i}_cardinality'],
+                    data[f'c{i}_dense_values'], data[f'c{i}_packed'], data[f'c{i}_run_value'],
+                    data[f'c{i}_run_start'], data[f'c{i}_run_end'],
+                )
+            return cls(
+                columns, data['occurrence_sentence'], data['arg_occurrence'], meta['version'],
+                CollationProfile(**meta['collation']),
+            )
+
+    def nbytes(self):
+        return sum(col.nbytes() for col in self.columns.values())
+
+    # ---------------------------------------------------------------
+    # Filters
+    # ---------------------------------------------------------------
+    def covers(self, spec):
+        """
+        Whether spec can be answered exactly: every compared value is stored (so,
+        without collisions, distinct values never compare equal in the database)
+        and no two active blocks can share a token.
+        """
+        if self.collation.colliding:
+            return False
+        for table, column, value in compared_values(spec):
+            if value not in self.columns[column if table == 'verbs' else _arg_column(column)].vocab:
+                return False
+        blocks = [dep for _, dep in spec.active_dependencies()]
+        return not any(_can_share_token(a, b) for a, b in combinations(blocks, 2))
+
+    def verb_bits(self, spec, *, initial='list', search=True, sense='verb+gloss', features=True):
+        """Occurrences matching spec's verb-level predicates (same switches as FilterSpec.compile)."""
+        cols = SCRIPT_COLUMNS[spec.script]
+        verb_col = self.columns[cols['verb']]
+        gloss_col = self.columns['gloss']
+        predicates = []
+
+        if sense and spec.selected_verb:
+            predicates.append(verb_col.eq(spec.selected_verb))
+            if sense == 'verb+gloss' and spec.selected_verb_gloss:
+                predicates.append(gloss_col.eq(spec.selected_verb_gloss))
+
+        if search and spec.search_query:
+            query = spec.search_query.lower() if spec.script == 'translit' else spec.search_query
+            predicates.append(self.columns[cols['search']].eq(query))
+        if search and spec.english_search_query:
+            predicates.append(self.columns['gloss_norm'].eq(spec.english_search_query.lower()))
+
+        if spec.initial_letter and (initial == 'always' or (initial == 'list' and not spec.selected_verb)):
+            predicates.append(self.columns[cols['initial']].eq(spec.initial_letter))
+
+        if spec.selected_sources:
+            ids = spec.source_ids()
+            if ids:
+                predicates.append(self.columns['source_id'].isin(ids))
+        elif spec.source_submitted:
+            predicates.append(np.zeros((self.n_occurrences + 7) // 8, dtype=np.uint8))
+
+        if features:
+            predicates.extend(self.feature_bits(spec).values())
+
+        return _and(*predicates)
+
+    def feature_bits(self, spec):
+        """{verbs column: occurrences having one of the selected values}."""
+        return {
+            column: self.columns[column].isin(values)
+            for column, values in spec.features.items() if values
+        }
+
+    def dependency_bits(self, spec):
+        """Occurrences with an argument matching each active block (None without blocks)."""
+        cols = SCRIPT_COLUMNS[spec.script]
+        keys = (('deprel', 'dep_rel'), ('case_value', cols['case_value']), ('lemma', cols['lemma']))
+        result = None
+        for _, dep in spec.active_dependencies():
+            args = _and(*(
+                self.columns[_arg_column(column)].eq(dep[key]) for key, column in keys if dep.get(key)
+            ))
+            occurrences = np.zeros(self.n_occurrences, dtype=bool)
+            occurrences[self.arg_occurrence[np.flatnonzero(np.unpackbits(args, count=self.n_args))]] = True
+            result = _and(result, np.packbits(occurrences))
+        return result
+
+    def matching_bits(self, spec, **flags):
+        return _and(self.verb_bits(spec, **flags), self.dependency_bits(spec))
+
+    # ---------------------------------------------------------------
+    # Results (same shapes as the ColumnarIndex methods)
+    # ---------------------------------------------------------------
+    def value_counts(self, column, filt):
+        """{value: occurrences} of the values of column remaining in filt."""
+        col = self.columns[column]
+        counts = col.counts(filt)
+        return {col.values[code]: int(counts[code]) for code in np.flatnonzero(counts).tolist()}
+
+    def verbs_list(self, spec, sort_order, order_direction, **flags):
+        """[(verb, gloss, frequency)] like the verbs-list query."""
+        counts = self.value_counts(_sense_column(spec.script), self.matching_bits(spec, **flags))
+        rows = [(verb, gloss, n) for (verb, gloss), n in counts.items()]
+        reverse = order_direction != 'asc'
+        if sort_order == 'frequency':
+            rows.sort(key=lambda r: r[2], reverse=reverse)
+        else:
+            verb_key = self.collation.sort_key(SENSE_COLUMNS[spec.script][0])
+            rows.sort(key=lambda r: verb_key(r[0]), reverse=reverse)
+        return rows
+
+    def sentence_count(self, spec, **flags):
+        filt = self.matching_bits(spec, **flags)
+        sentences = self.occurrence_sentence
+        if filt is not None:
+            sentences = sentences[np.flatnonzero(np.unpackbits(filt, count=self.n_occurrences))]
+        # occurrence ids are in sentence order
+        return int(np.count_nonzero(np.diff(sentences)) + 1) if len(sentences) else 0
+
+    def verb_values(self, spec, column='verb', **flags):
+        """Distinct verb strings or, column='initial', initials under the filters."""
+        column = SCRIPT_COLUMNS[spec.script][column]
+        return list(self.value_counts(column, self.matching_bits(spec, **flags)))
+
+    def feature_counts(self, spec, disjunctive=False, **flags):
+        """{UI feature name: {value: occurrences}} like facets.fold_feature_facets()."""
+        base = _and(self.verb_bits(spec, features=False, **flags), self.dependency_bits(spec))
+        selected = self.feature_bits(spec)
+        result = {}
+        for _, column, _ in FEATURE_FILTERS:
+            others = [bits for other, bits in selected.items() if not (disjunctive and other == column)]
+            counts = self.value_counts(column, _and(base, *others))
+            counts.pop(None, None)
+            result[FEATURE_LABELS[column]] = counts
+        return result
+
+
+def init_bitmap_index(app):
+    """BITMAP_INDEX: path of the .npz built by flask build-bitmap-index ('' disables it)."""
+    app.config.setdefault('BITMAP_INDEX', '')
+    app.extensions['bitmap_index'] = None
+
+
+def bitmap_index():
+    """
+    The loaded BitmapIndex, or None when disabled, missing, of another format,
+    built for another corpus version or over values that collide in the database.
+    """
+    if not has_app_context() or not current_app.config.get('BITMAP_INDEX'):
+        return None
+    if np is None:
+        current_app.logger.warning("BITMAP_INDEX is set but NumPy is not installed; not using it.")
+        current_app.config['BITMAP_INDEX'] = ''
+        return None
+
+    version = corpus_version()
+    state = current_app.extensions.get('bitmap_index')
+    if state is None or state[0] != version:
+        with _load_lock:
+            state = current_app.extensions.get('bitmap_index')
+            if state is None or state[0] != version:
+                path = current_app.config['BITMAP_INDEX']
+                index = None
+                try:
+                    index = BitmapIndex.load(path)
+                except OSError:
+                    current_app.logger.warning("Bitmap index %s not found; run flask build-bitmap-index.", path)
+                except ValueError as exc:
+                    current_app.logger.warning("Bitmap index %s: %s; run flask build-bitmap-index.", path, exc)
+                else:
+                    if index.collation.colliding:
+                        current_app.logger.warning(
+                            "Bitmap index %s: values of %s collide under the column collation; not using it.",
+                            path, ', '.join(index.collation.colliding),
+                        )
+                        index = None
+                    elif index.version != version:
+                        current_app.logger.warning(
+                            "Bitmap index %s is for corpus version %s (live: %s); not using it.",
+                            path, index.version, version,
+                        )
+                        index = None
+                state = (version, index)
+                current_app.extensions['bitmap_index'] = state
+    return state[1]
+
+
+def bitmap_engine(spec):
+    """The bitmap index when it can answer spec exactly, else None."""
+    index = bitmap_index()
+    return index if index is not None and index.covers(spec) else None
+
+
+def build_bitmap_index(path):
+    """Build the index of the live corpus into path; returns a one-line summary."""
+    index = BitmapIndex.build(corpus_version())
+    index.save(path)
+    dense = sum(len(col.dense_values) for col in index.columns.values())
+    values = sum(len(col.values) for col in index.columns.values())
+    summary = (f"{index.n_occurrences} occurrences, {values} bitmaps ({dense} packed), "
+               f"{index.nbytes() / 2 ** 20:.1f} MiB, corpus version {index.version}")
+    if index.collation.colliding:
+        summary += f"; not used: values of {', '.join(index.collation.colliding)} collide"
+    return summary
+
+
+@click.command("build-bitmap-index")
+@click.argument("path", required=False)
+def build_bitmap_index_command(path):
+    """Build the bitmap index file (default: BITMAP_INDEX)."""
+    path = path or current_app.config.get('BITMAP_INDEX')
+    if not path:
+        raise click.ClickException("no path given and BITMAP_INDEX is not set")
+    if np is None:
+        raise click.ClickException("the bitmap index needs NumPy")
+    click.echo(f"{path}: {build_bitmap_index(path)}")
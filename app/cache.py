@@ -0,0 +1,245 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, has_app_context
+
+from .metrics import count_cache_lookup, query_family
+from .versions import spec_version
+
+
+# -------------------------------------------------------------------
+# Cross-request result cache for filter-combination results
+# -------------------------------------------------------------------
+# The corpus is read-only between loads, so the verbs list, dropdown facets,
+# feature values and initials for a given filter combination never change until
+# the next load. They are cached per process (or per host with the SQLite
+# backend, shared by all gunicorn workers) under:
+#
+#     (result name, FilterSpec.cache_key(), extra args, version stamp)
+#
+# The version stamp covers only the data the spec reads (see app/versions.py): a
+# source-restricted spec is stamped with its sources' versions, anything else with
+# the corpus version. Reloading one source makes the entries touching it
+# unreachable and leaves the rest valid; stale entries age out through LRU/TTL
+# eviction.
+#
+# Values must be plain picklable data (tuples, lists, dicts, sets, str, int):
+# never SQLAlchemy rows or ORM objects.
+
+_MISSING = object()
+
+
+def _entry_size(payload):
+    return len(payload) + 64  # rough per-entry overhead
+
+
+class MemoryBackend:
+    """In-process LRU bounded by the pickled size of its values, with TTL."""
+
+    def __init__(self, max_bytes, ttl):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, payload)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, payload = entry
+            if expires_at < time.monotonic():
+                self._drop(key)
+                return _MISSING
+            self._entries.move_to_end(key)
+        return pickle.loads(payload)
+
+    def set(self, key, value):
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        size = _entry_size(payload)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, payload)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                self._drop(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _drop(self, key):
+        _, payload = self._entries.pop(key)
+        self._bytes -= _entry_size(payload)
+
+
+class SQLiteBackend:
+    """
+    File-backed LRU shared by all worker processes on one host.
+
+    Every process opens its own connection (WAL mode, so readers never block the
+    writer). Recency is tracked in last_used; eviction drops the least recently
+    used rows until the total size fits max_bytes again.
+    """
+
+    def __init__(self, path, max_bytes, ttl):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._local = threading.local()
+        self._conn().execute("""
+            CREATE TABLE IF NOT EXISTS result_cache (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn().execute(
+            "CREATE INDEX IF NOT EXISTS ix_result_cache_last_used ON result_cache (last_used)"
+        )
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        now = time.time()
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT value, expires_at FROM result_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return _MISSING
+        payload, expires_at = row
+        if expires_at < now:
+            conn.execute("DELETE FROM result_cache WHERE key = ?", (key,))
+            return _MISSING
+        conn.execute("UPDATE result_cache SET last_used = ? WHERE key = ?", (now, key))
+        return pickle.loads(payload)
+
+    def set(self, key, value):
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        size = _entry_size(payload)
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR REPLACE INTO result_cache (key, value, size, expires_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, sqlite3.Binary(payload), size, now + self.ttl, now),
+            )
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM result_cache").fetchone()[0]
+            if total > self.max_bytes:
+                self._evict(conn, total - self.max_bytes, now)
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _evict(self, conn, excess, now):
+        conn.execute("DELETE FROM result_cache WHERE expires_at < ?", (now,))
+        freed = 0
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM result_cache ORDER BY last_used"):
+            if freed >= excess:
+                break
+            doomed.append((key,))
+            freed += size
+        conn.executemany("DELETE FROM result_cache WHERE key = ?", doomed)
+
+    def clear(self):
+        self._conn().execute("DELETE FROM result_cache")
+
+
+class ResultCache:
+    """Front end: key construction, version stamping and hit/miss counters."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, name, spec_key, extra=(), version=''):
+        raw = repr((name, spec_key, extra, version))
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def get_or_compute(self, name, spec_key, compute, extra=(), version=''):
+        key = self.make_key(name, spec_key, extra, version)
+        value = self.backend.get(key)
+        if value is not _MISSING:
+            self.hits += 1
+            count_cache_lookup(name, True)
+            return value
+        self.misses += 1
+        count_cache_lookup(name, False)
+        value = compute()
+        self.backend.set(key, value)
+        return value
+
+    def clear(self):
+        self.backend.clear()
+
+
+def init_result_cache(app):
+    """
+    Configure the result cache from app.config:
+
+      RESULT_CACHE_BACKEND    'memory' (default), 'sqlite' or 'none'
+      RESULT_CACHE_MAX_BYTES  byte budget for cached values (default 64 MiB)
+      RESULT_CACHE_TTL        seconds an entry stays valid (default 1 day)
+      RESULT_CACHE_PATH       SQLite file for the 'sqlite' backend
+    """
+    app.config.setdefault('RESULT_CACHE_BACKEND', 'memory')
+    app.config.setdefault('RESULT_CACHE_MAX_BYTES', 64 * 1024 * 1024)
+    app.config.setdefault('RESULT_CACHE_TTL', 24 * 3600)
+    app.config.setdefault('RESULT_CACHE_PATH', os.path.join(app.instance_path, 'result_cache.sqlite3'))
+
+    kind = app.config['RESULT_CACHE_BACKEND']
+    max_bytes = int(app.config['RESULT_CACHE_MAX_BYTES'])
+    ttl = float(app.config['RESULT_CACHE_TTL'])
+
+    if kind == 'none':
+        backend = None
+    elif kind == 'sqlite':
+        os.makedirs(os.path.dirname(app.config['RESULT_CACHE_PATH']), exist_ok=True)
+        backend = SQLiteBackend(app.config['RESULT_CACHE_PATH'], max_bytes, ttl)
+    elif kind == 'memory':
+        backend = MemoryBackend(max_bytes, ttl)
+    else:
+        raise ValueError(f"Unknown RESULT_CACHE_BACKEND: {kind!r}")
+
+    app.extensions['result_cache'] = ResultCache(backend) if backend else None
+
+
+def cached_result(name, spec, compute, *extra):
+    """
+    Return compute() for (name, spec, extra), served from the result cache when
+    one is configured. extra carries any non-spec inputs (sort order, level...).
+    Its statements are timed under the query family of name (metrics.QUERY_FAMILIES).
+    """
+    cache = current_app.extensions.get('result_cache') if has_app_context() else None
+    with query_family(name):
+        if cache is None:
+            return compute()
+        return cache.get_or_compute(name, spec.cache_key(), compute, extra, spec_version(spec))
@@ -0,0 +1,448 @@
+import threading
+from itertools import combinations
+
+from flask import current_app, has_app_context
+from sqlalchemy import text
+
+from .versions import corpus_version
+from .extensions import db
+from .filter_spec import FEATURE_FILTERS, is_active_dependency
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency: the SQL path is used without it
+    np = None
+
+
+# -------------------------------------------------------------------
+# Optional in-process columnar engine over verbs/arguments
+# -------------------------------------------------------------------
+# verbs and arguments are loaded once into dictionary-encoded NumPy arrays.
+# Filters are evaluated as vectorized masks instead of multi-way self-joins:
+#
+#   - verb-level predicates (sense, searches, initial, sources, features) are
+#     evaluated once per distinct value and broadcast through the code arrays;
+#   - each dependency block marks the argument tokens it matches (one bit per block)
+#     under the verb's (sent_id, head_id) group;
+#   - "pairwise distinct argument tokens" is exactly the existence of a system of
+#     distinct representatives, checked with Hall's condition: for every subset S
+#     of the active blocks, at least |S| tokens must match some block in S.
+#
+# Enabled with COLUMNAR_INDEX=1. The arrays are rebuilt when the corpus version
+# changes (see app/versions.py).
+#
+# SQL compares, groups and sorts strings under the column collations (mostly
+# case/accent-insensitive); the engine works on the exact stored values. It only
+# answers a spec where the two agree (answers(), columnar_index(spec)):
+#   - the database counts as many distinct values in every loaded string column
+#     as there are exact ones (CollationProfile, read at load time), so grouping
+#     by exact value is grouping under the collation and a stored value equals
+#     no other stored value;
+#   - every value the spec compares (selected verb, searches against the stored
+#     *_norm columns, initial, features, dependency values) is stored exactly in
+#     its column. Anything else, e.g. a search typed with other capitals, is
+#     left to SQL.
+# The verbs list is sorted by each verb's position in the database's ORDER BY.
+
+VERB_COLUMNS = (
+    'sent_id', 'token_id', 'lemma', 'gloss', 'translit_verb', 'source_id',
+    'lemma_initial', 'translit_initial', 'gloss_norm', 'translit_verb_norm',
+) + tuple(column for _, column, _ in FEATURE_FILTERS)
+
+ARG_COLUMNS = (
+    'sent_id', 'head_id', 'token_id', 'dep_rel', 'case_value', 'lemma',
+    'translit_dep_lemma', 'translit_lemma',
+)
+
+# Per-script column names (see filter_spec.SCRIPTS for the SQL equivalents).
+SCRIPT_COLUMNS = {
+    'language': {'verb': 'lemma', 'initial': 'lemma_initial', 'case_value': 'case_value', 'lemma': 'lemma',
+                 'search': 'lemma'},
+    'translit': {'verb': 'translit_verb', 'initial': 'translit_initial', 'case_value': 'translit_dep_lemma',
+                 'lemma': 'translit_lemma', 'search': 'translit_verb_norm'},
+}
+
+# Integer columns; every other loaded column is a string under a collation.
+ID_COLUMNS = ('token_id', 'head_id', 'source_id')
+
+# Verbs list sort columns (ORDER BY verbs.<verb>).
+SORT_COLUMNS = ('lemma', 'translit_verb')
+
+_load_lock = threading.Lock()
+
+
+class CollationProfile:
+    """
+    What the database's collations make of the stored strings: the loaded columns
+    whose values collide (fewer distinct values under the collation than exact
+    ones) and the verbs' ORDER BY sequence per SORT_COLUMNS column. The default
+    profile is that of binary collations.
+    """
+
+    def __init__(self, colliding=(), order=None):
+        self.colliding = tuple(colliding)
+        self.order = dict(order or {})
+        self._rank = {column: {value: rank for rank, value in enumerate(values)}
+                      for column, values in self.order.items()}
+
+    @classmethod
+    def read(cls, conn, verb_rows, arg_rows):
+        """From the database, for verbs/arguments rows in VERB_COLUMNS / ARG_COLUMNS order."""
+        colliding = []
+        for table, names, rows in (('verbs', VERB_COLUMNS, verb_rows), ('arguments', ARG_COLUMNS, arg_rows)):
+            columns = [(pos, name) for pos, name in enumerate(names) if name not in ID_COLUMNS]
+            counts = conn.execute(text(
+                "SELECT " + ", ".join(f"COUNT(DISTINCT `{name}`)" for _, name in columns) + f" FROM {table}"
+            )).fetchone()
+            for (pos, name), count in zip(columns, counts):
+                if count != len({row[pos] for row in rows} - {None}):
+                    colliding.append(f'{table}.{name}')
+        order = {
+            column: [row[0] for row in conn.execute(text(
+                f"SELECT DISTINCT `{column}` FROM verbs ORDER BY `{column}`"
+            ))]
+            for column in SORT_COLUMNS
+        }
+        return cls(colliding, order)
+
+    def sort_key(self, column):
+        """Key function giving the database's ascending order of column's values."""
+        rank = self._rank.get(column)
+        if rank is None:
+            return lambda value: (value is not None, value or '')
+        return lambda value: rank.get(value, len(rank))
+
+
+class EncodedColumn:
+    """Dictionary-encoded column: codes[i] indexes values; vocab maps value -> code."""
+
+    def __init__(self, raw, vocab=None):
+        self.vocab = vocab if vocab is not None else {}
+        self.codes = np.fromiter(
+            (self.vocab.setdefault(v, len(self.vocab)) for v in raw),
+            dtype=np.int32, count=len(raw),
+        )
+
+    @property
+    def values(self):
+        return list(self.vocab)
+
+    def eq(self, value):
+        code = self.vocab.get(value)
+        if code is None:
+            return np.zeros(len(self.codes), dtype=bool)
+        return self.codes == code
+
+    def isin(self, values):
+        codes = [self.vocab[v] for v in values if v in self.vocab]
+        return np.isin(self.codes, np.asarray(codes, dtype=np.int32))
+
+
+def compared_values(spec):
+    """[(table, column, value)] of every value spec compares with a stored column."""
+    cols = SCRIPT_COLUMNS[spec.script]
+    values = []
+    if spec.selected_verb:
+        values.append(('verbs', cols['verb'], spec.selected_verb))
+    if spec.selected_verb_gloss:
+        values.append(('verbs', 'gloss', spec.selected_verb_gloss))
+    if spec.search_query:
+        query = spec.search_query.lower() if spec.script == 'translit' else spec.search_query
+        values.append(('verbs', cols['search'], query))
+    if spec.english_search_query:
+        values.append(('verbs', 'gloss_norm', spec.english_search_query.lower()))
+    if spec.initial_letter:
+        values.append(('verbs', cols['initial'], spec.initial_letter))
+    for column, selected in spec.features.items():
+        values.extend(('verbs', column, value) for value in selected or ())
+    for _, dep in spec.active_dependencies():
+        for key, column in (('deprel', 'dep_rel'), ('case_value', cols['case_value']), ('lemma', cols['lemma'])):
+            if dep.get(key):
+                values.append(('arguments', column, dep[key]))
+    return values
+
+
+class ColumnarIndex:
+
+    def __init__(self, verb_rows, arg_rows, version=None, collation=None):
+        self.version = version
+        self.collation = collation or CollationProfile()
+        verb_cols = list(zip(*verb_rows)) if verb_rows else [()] * len(VERB_COLUMNS)
+        arg_cols = list(zip(*arg_rows)) if arg_rows else [()] * len(ARG_COLUMNS)
+
+        sent_vocab = {}
+        self.verbs = {}
+        for name, raw in zip(VERB_COLUMNS, verb_cols):
+            if name == 'token_id':
+                self.verb_token = np.asarray(raw, dtype=np.int64)
+            else:
+                self.verbs[name] = EncodedColumn(raw, sent_vocab if name == 'sent_id' else None)
+
+        self.args = {}
+        for name, raw in zip(ARG_COLUMNS, arg_cols):
+            if name == 'head_id':
+                self.arg_head = np.asarray(raw, dtype=np.int64)
+            elif name == 'token_id':
+                self.arg_token = np.asarray(raw, dtype=np.int64)
+            else:
+                self.args[name] = EncodedColumn(raw, sent_vocab if name == 'sent_id' else None)
+
+        self.n_verbs = len(self.verb_token)
+        self.n_args = len(self.arg_token)
+
+        verb_sent = self.verbs['sent_id'].codes.astype(np.int64)
+        arg_sent = self.args['sent_id'].codes.astype(np.int64)
+
+        # Distinct verb occurrences (sent_id, token_id)
+        verb_key = (verb_sent << 32) | self.verb_token
+        _, self.verb_occurrence = np.unique(verb_key, return_inverse=True)
+
+        # Argument groups (sent_id, head_id) = one head verb token; CSR-style ordering
+        group_key = (arg_sent << 32) | self.arg_head
+        group_keys, self.arg_group = np.unique(group_key, return_inverse=True)
+        self.n_groups = len(group_keys)
+
+        pos = np.searchsorted(group_keys, verb_key)
+        found = pos < self.n_groups
+        found[found] = group_keys[pos[found]] == verb_key[found]
+        self.verb_group = np.where(found, pos, -1)
+
+        # Distinct argument tokens per group: (group, token_id) pairs
+        pair_key = (self.arg_group.astype(np.int64) << 32) | self.arg_token
+        pair_keys, self.arg_pair = np.unique(pair_key, return_inverse=True)
+        self.pair_group = (pair_keys >> 32).astype(np.int64)
+        self.n_pairs = len(pair_keys)
+
+    # ---------------------------------------------------------------
+    # Loading
+    # ---------------------------------------------------------------
+    @classmethod
+    def load(cls, version=None):
+        verb_cols = ", ".join(f"`{c}`" for c in VERB_COLUMNS)
+        arg_cols = ", ".join(f"`{c}`" for c in ARG_COLUMNS)
+        with db.engine.connect() as conn:
+            verb_rows = [tuple(r) for r in conn.execute(text(f"SELECT {verb_cols} FROM verbs"))]
+            arg_rows = [tuple(r) for r in conn.execute(text(f"SELECT {arg_cols} FROM arguments"))]
+            collation = CollationProfile.read(conn, verb_rows, arg_rows)
+        return cls(verb_rows, arg_rows, version, collation)
+
+    # ---------------------------------------------------------------
+    # Coverage
+    # ---------------------------------------------------------------
+    def answers(self, spec):
+        """Whether the exact-value evaluation of spec gives the SQL results (see module comment)."""
+        tables = {'verbs': self.verbs, 'arguments': self.args}
+        return not self.collation.colliding and all(
+            value in tables[table][column].vocab for table, column, value in compared_values(spec)
+        )
+
+    # ---------------------------------------------------------------
+    # Masks
+    # ---------------------------------------------------------------
+    def verb_mask(self, spec, *, initial='list', search=True, sense='verb+gloss'):
+        """Verb-level predicates of spec (same switches as FilterSpec.compile)."""
+        cols = SCRIPT_COLUMNS[spec.script]
+        verb_col = self.verbs[cols['verb']]
+        mask = np.ones(self.n_verbs, dtype=bool)
+
+        if sense and spec.selected_verb:
+            mask &= verb_col.eq(spec.selected_verb)
+            if sense == 'verb+gloss' and spec.selected_verb_gloss:
+                mask &= self.verbs['gloss'].eq(spec.selected_verb_gloss)
+
+        if search and spec.search_query:
+            query = spec.search_query.lower() if spec.script == 'translit' else spec.search_query
+            mask &= self.verbs[cols['search']].eq(query)
+        if search and spec.english_search_query:
+            mask &= self.verbs['gloss_norm'].eq(spec.english_search_query.lower())
+
+        if spec.initial_letter and (initial == 'always' or (initial == 'list' and not spec.selected_verb)):
+            mask &= self.verbs[cols['initial']].eq(spec.initial_letter)
+
+        if spec.selected_sources:
+            ids = spec.source_ids()
+            if ids:
+                mask &= self.verbs['source_id'].isin(ids)
+        elif spec.source_submitted:
+            mask[:] = False
+
+        for column, values in spec.features.items():
+            if values:
+                mask &= self.verbs[column].isin(values)
+
+        return mask
+
+    def _pair_bits(self, spec, blocks):
+        """uint8 per (group, token) pair: bit b set if the token matches block b."""
+        cols = SCRIPT_COLUMNS[spec.script]
+        bits = np.zeros(self.n_pairs, dtype=np.uint8)
+        for b, dep in enumerate(blocks):
+            match = np.ones(self.n_args, dtype=bool)
+            if dep.get('deprel'):
+                match &= self.args['dep_rel'].eq(dep['deprel'])
+            if dep.get('case_value'):
+                match &= self.args[cols['case_value']].eq(dep['case_value'])
+            if dep.get('lemma'):
+                match &= self.args[cols['lemma']].eq(dep['lemma'])
+            np.bitwise_or.at(bits, self.arg_pair[match], np.uint8(1 << b))
+        return bits
+
+    def _subset_counts(self, bits, n_blocks):
+        """{subset bitmask: per-group count of tokens matching some block of it}."""
+        counts = {}
+        for size in range(1, n_blocks + 1):
+            for combo in combinations(range(n_blocks), size):
+                subset = sum(1 << b for b in combo)
+                hit = (bits & subset) != 0
+                counts[subset] = np.bincount(self.pair_group, weights=hit, minlength=self.n_groups)
+        return counts
+
+    def group_mask(self, spec, exclude_level=None):
+        """Groups whose argument tokens satisfy all active blocks with distinct tokens."""
+        blocks = [dep for idx, dep in enumerate(spec.dependencies)
+                  if is_active_dependency(dep) and idx != exclude_level]
+        ok = np.ones(self.n_groups, dtype=bool)
+        if not blocks:
+            return ok, blocks, None
+        bits = self._pair_bits(spec, blocks)
+        counts = self._subset_counts(bits, len(blocks))
+        for subset, count in counts.items():
+            ok &= count >= bin(subset).count('1')
+        return ok, blocks, (bits, counts)
+
+    def matching_verbs(self, spec, **flags):
+        mask = self.verb_mask(spec, **flags)
+        if spec.has_dependency_filters():
+            group_ok, _, _ = self.group_mask(spec)
+            has_group = self.verb_group >= 0
+            dep_ok = np.zeros(self.n_verbs, dtype=bool)
+            dep_ok[has_group] = group_ok[self.verb_group[has_group]]
+            mask &= dep_ok
+        return mask
+
+    # ---------------------------------------------------------------
+    # Results
+    # ---------------------------------------------------------------
+    def verbs_list(self, spec, sort_order, order_direction, **flags):
+        """[(verb, gloss, frequency)] like the verbs-list query."""
+        verb_column = SCRIPT_COLUMNS[spec.script]['verb']
+        verb_col = self.verbs[verb_column]
+        gloss_col = self.verbs['gloss']
+        mask = self.matching_verbs(spec, **flags)
+
+        triples = np.unique(np.stack([
+            verb_col.codes[mask], gloss_col.codes[mask], self.verb_occurrence[mask],
+        ]), axis=1)
+        pairs, freq = np.unique(triples[:2], axis=1, return_counts=True)
+
+        verb_values, gloss_values = verb_col.values, gloss_col.values
+        rows = [
+            (verb_values[v], gloss_values[g], int(n))
+            for v, g, n in zip(pairs[0].tolist(), pairs[1].tolist(), freq.tolist())
+        ]
+        reverse = order_direction != 'asc'
+        if sort_order == 'frequency':
+            rows.sort(key=lambda r: r[2], reverse=reverse)
+        else:
+            verb_key = self.collation.sort_key(verb_column)
+            rows.sort(key=lambda r: verb_key(r[0]), reverse=reverse)
+        return rows
+
+    def sentence_count(self, spec, **flags):
+        mask = self.matching_verbs(spec, **flags)
+        return int(len(np.unique(self.verbs['sent_id'].codes[mask])))
+
+    def verb_values(self, spec, column='verb', **flags):
+        """Distinct verb strings (lemma / translit_verb) or, column='initial', initials under the filters."""
+        verb_col = self.verbs[SCRIPT_COLUMNS[spec.script][column]]
+        mask = self.matching_verbs(spec, **flags)
+        values = verb_col.values
+        return [values[c] for c in np.unique(verb_col.codes[mask]).tolist()]
+
+    def feature_rows(self, spec, **flags):
+        """[(VerbForm, ..., Voice, unmatched, occurrences)] like facets.feature_bundle_rows()."""
+        columns = [self.verbs[column] for _, column, _ in FEATURE_FILTERS]
+        mask = self.matching_verbs(spec.with_(features={}), **flags)
+        unmatched = np.zeros(self.n_verbs, dtype=np.int64)
+        for bit, (_, column, _) in enumerate(FEATURE_FILTERS):
+            if spec.features.get(column):
+                unmatched[~self.verbs[column].isin(spec.features[column])] |= 1 << bit
+        distinct = np.unique(np.stack(
+            [col.codes[mask] for col in columns] + [unmatched[mask], self.verb_occurrence[mask]]
+        ), axis=1)
+        bundles, occurrences = np.unique(distinct[:-1], axis=1, return_counts=True)
+
+        vocabs = [col.values for col in columns]
+        return [
+            tuple(vocabs[i][code] for i, code in enumerate(bundle[:-1])) + (bundle[-1], int(n))
+            for bundle, n in zip(bundles.T.tolist(), occurrences.tolist())
+        ]
+
+    def dependency_rows(self, spec, level, **flags):
+        """
+        Distinct (dep_rel, case_value, lemma) rows a dependency block at `level` can
+        take under the other blocks and the verb filters (the facet candidate set).
+        """
+        cols = SCRIPT_COLUMNS[spec.script]
+        verb_ok = self.verb_mask(spec, **flags)
+        has_group = self.verb_group >= 0
+        group_verb_ok = np.zeros(self.n_groups, dtype=bool)
+        group_verb_ok[self.verb_group[has_group & verb_ok]] = True
+
+        group_ok, blocks, state = self.group_mask(spec, exclude_level=level)
+        arg_ok = group_verb_ok[self.arg_group] & group_ok[self.arg_group]
+
+        if blocks:
+            # The open block's token must leave a distinct assignment for the others:
+            # Hall's condition with that token removed from its group.
+            bits, counts = state
+            arg_bits = bits[self.arg_pair]
+            for subset, count in counts.items():
+                remaining = count[self.arg_group] - ((arg_bits & subset) != 0)
+                arg_ok &= remaining >= bin(subset).count('1')
+
+        columns = [self.args['dep_rel'], self.args[cols['case_value']], self.args[cols['lemma']]]
+        if not arg_ok.any():
+            return []
+        codes = np.unique(np.stack([c.codes[arg_ok] for c in columns]), axis=1)
+        vocabs = [c.values for c in columns]
+        return [
+            tuple(vocabs[i][code] for i, code in enumerate(triple))
+            for triple in codes.T.tolist()
+        ]
+
+
+def init_columnar_index(app):
+    """COLUMNAR_INDEX enables the engine; it is built lazily on first use."""
+    app.config.setdefault('COLUMNAR_INDEX', False)
+    app.extensions['columnar_index'] = None
+
+
+def columnar_index(spec=None):
+    """
+    The loaded ColumnarIndex, or None when disabled / NumPy is unavailable or,
+    given a spec, when the index cannot answer it exactly (ColumnarIndex.answers).
+    """
+    if not has_app_context() or not current_app.config.get('COLUMNAR_INDEX'):
+        return None
+    if np is None:
+        current_app.logger.warning("COLUMNAR_INDEX is set but NumPy is not installed; using SQL.")
+        current_app.config['COLUMNAR_INDEX'] = False
+        return None
+
+    version = corpus_version()
+    index = current_app.extensions.get('columnar_index')
+    if index is None or index.version != version:
+        with _load_lock:
+            index = current_app.extensions.get('columnar_index')
+            if index is None or index.version != version:
+                index = ColumnarIndex.load(version)
+                if index.collation.colliding:
+                    current_app.logger.warning(
+                        "COLUMNAR_INDEX: values of %s collide under the column collation; using SQL.",
+                        ', '.join(index.collation.colliding),
+                    )
+                current_app.extensions['columnar_index'] = index
+    if spec is not None and not index.answers(spec):
+        return None
+    return index
@@ -0,0 +1,99 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app, g, has_request_context
+from flask.globals import request_ctx
+
+
+# -------------------------------------------------------------------
+# Concurrent query families within one page render
+# -------------------------------------------------------------------
+# home()/translit() need several results that do not depend on each other: the
+# verbs list, the total sentence count, the facet options of every dependency
+# block, the feature values, the initials bar and the switch-link mappings. With
+# CONCURRENT_QUERIES they are dispatched on a bounded per-process thread pool
+# (CONCURRENT_QUERIES_WORKERS threads) while the request thread builds the
+# sentences page, and joined before rendering; the page then waits for the
+# slowest family instead of the sum of all of them.
+#
+#     queries = QueryFanout()
+#     queries.submit('verbs_list', lambda: cached_result('verbs_list', ...))
+#     ...
+#     verbs_result = queries.result('verbs_list')
+#
+# Every task runs in a copy of the request context with an app context of its
+# own, so Flask-SQLAlchemy hands it its own session and pooled connection. The
+# request-scoped bookkeeping on flask.g (query memo and its counters, the query
+# profile, the data version stamps) is shared with the request thread, so memo
+# hits, Server-Timing and X-Corpus-Version still cover the whole render; the memo
+# and its counters are guarded by a per-request lock (see app/query_memo.py).
+# SQLALCHEMY_ENGINE_OPTIONS' pool must allow one connection per worker thread
+# on top of the request threads.
+#
+# Off (the default), or outside a request, submit() only records the callable
+# and result() runs it inline on first use: the render is sequential exactly as
+# before.
+SHARED_G = ('query_memo', 'query_memo_stats', 'query_memo_lock', 'query_profile', 'data_versions')
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def _pool(workers):
+    """The process-wide executor; recreated after a fork (gunicorn --preload)."""
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ud_val-query')
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def _run_in_context(ctx, shared, fn):
+    with ctx:
+        for name, value in shared.items():
+            setattr(g, name, value)
+        return fn()
+
+
+class QueryFanout:
+    """Named independent tasks of one request, run concurrently when enabled."""
+
+    def __init__(self):
+        self._futures = {}
+        self._pending = {}
+        self._done = {}
+        self.concurrent = has_request_context() and current_app.config.get('CONCURRENT_QUERIES', False)
+        if self.concurrent:
+            # Created here so the tasks share them instead of each starting its own.
+            g.setdefault('query_memo', {})
+            g.setdefault('query_memo_stats', {'executed': 0, 'deduplicated': 0})
+            g.setdefault('query_memo_lock', threading.Lock())
+            g.setdefault('data_versions', set())
+            self._shared = {name: g.get(name) for name in SHARED_G if name in g}
+            self._pool = _pool(int(current_app.config['CONCURRENT_QUERIES_WORKERS']))
+
+    def submit(self, name, fn):
+        if self.concurrent:
+            self._futures[name] = self._pool.submit(_run_in_context, request_ctx.copy(), self._shared, fn)
+        else:
+            self._pending[name] = fn
+
+    def result(self, name):
+        """The task's return value (re-raising its exception); waits if still running."""
+        if name in self._futures:
+            return self._futures[name].result()
+        if name not in self._done:
+            self._done[name] = self._pending.pop(name)()
+        return self._done[name]
+
+
+def init_concurrent_queries(app):
+    """
+    CONCURRENT_QUERIES: run the independent query families of a page concurrently.
+    CONCURRENT_QUERIES_WORKERS: size of the per-process thread pool.
+    """
+    app.config.setdefault('CONCURRENT_QUERIES', False)
+    app.config.setdefault('CONCURRENT_QUERIES_WORKERS', 4)
@@ -0,0 +1,196 @@
+import json
+import zlib
+
+from sqlalchemy import text
+
+from .extensions import db
+
+
+# -------------------------------------------------------------------
+# Streaming export of the filtered verb occurrences
+# -------------------------------------------------------------------
+# Every occurrence matching the current filters, not just one page:
+#   - with a selected verb: the sentence-page filters of that verb (selected sense,
+#     sources on the sentence, dependency blocks, features);
+#   - without: the verbs-list filters (initial, searches included) over all verbs.
+#
+# Rows are read with a server-side cursor (stream_results) in EXPORT_CHUNK_ROWS
+# partitions and written out as they arrive, so memory stays constant whatever the
+# result size. These statements bypass memo_execute on purpose: the memo keeps whole
+# result sets.
+#
+# Formats:
+#   tsv     one line per (verb occurrence, argument): verb, gloss, dep_rel,
+#           case_value, lemma, sent_id (argument columns empty for a verb without
+#           arguments)
+#   jsonl   one object per verb occurrence with its arguments
+#   conllu  every sentence containing a matching occurrence, from the words table
+EXPORT_CHUNK_ROWS = 1000
+EXPORT_BUFFER_BYTES = 64 * 1024  # bytes collected before a chunk is sent
+
+# format -> (mimetype, file extension)
+EXPORT_FORMATS = {
+    'tsv': ('text/tab-separated-values', 'tsv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+    'conllu': ('text/plain', 'conllu'),
+}
+
+TSV_COLUMNS = ('verb', 'gloss', 'dep_rel', 'case_value', 'lemma', 'sent_id')
+
+# Per-script columns (see filter_spec.SCRIPTS for the filter side).
+EXPORT_COLUMNS = {
+    'language': {'verb': 'lemma', 'case_value': 'case_value', 'lemma': 'lemma', 'form': 'form'},
+    'translit': {'verb': 'translit_verb', 'case_value': 'translit_dep_lemma',
+                 'lemma': 'translit_lemma', 'form': 'translit'},
+}
+
+
+def export_filters(spec):
+    """(joins, conditions, params) selecting the matching occurrences as verbs `fv`."""
+    if spec.selected_verb:
+        joins, conditions, params = spec.compile(
+            'fv', dependency_join='LEFT JOIN', initial=None, search=False, source_alias='s'
+        )
+        joins = "JOIN sentences s ON s.sent_id = fv.sent_id\n" + joins
+    else:
+        joins, conditions, params = spec.compile('fv')
+    return joins, conditions, params
+
+
+def _matching(spec, columns):
+    joins, conditions, params = export_filters(spec)
+    where_clause = ' AND '.join(conditions) if conditions else '1=1'
+    return f"SELECT {columns} FROM verbs fv {joins} WHERE {where_clause}", params
+
+
+def stream_rows(sql, params):
+    """Yield the rows of sql from a server-side cursor, one partition at a time."""
+    with db.engine.connect() as conn:
+        result = conn.execution_options(
+            stream_results=True, max_row_buffer=EXPORT_CHUNK_ROWS
+        ).execute(text(sql), params)
+        for partition in result.partitions(EXPORT_CHUNK_ROWS):
+            yield from partition
+
+
+def _occurrence_rows(spec):
+    """(sent_id, token_id, verb, gloss, dep_rel, case_value, lemma, arg token_id) in occurrence order."""
+    cols = EXPORT_COLUMNS[spec.script]
+    matching, params = _matching(spec, "fv.sent_id, fv.token_id")
+    return stream_rows(f"""
+        SELECT v.sent_id, v.token_id, v.{cols['verb']}, v.gloss,
+               x.dep_rel, x.{cols['case_value']}, x.{cols['lemma']}, x.token_id
+        FROM verbs v
+        LEFT JOIN arguments x ON x.sent_id = v.sent_id AND x.head_id = v.token_id
+        WHERE (v.sent_id, v.token_id) IN ({matching})
+        ORDER BY v.sent_id, v.token_id, x.token_id
+    """, params)
+
+
+def _tsv_field(value):
+    if value is None:
+        return ''
+    return str(value).replace('\t', ' ').replace('\r', ' ').replace('\n', ' ')
+
+
+def tsv_lines(spec):
+    yield '\t'.join(TSV_COLUMNS) + '\n'
+    for sent_id, _, verb, gloss, dep_rel, case_value, lemma, _ in _occurrence_rows(spec):
+        yield '\t'.join(map(_tsv_field, (verb, gloss, dep_rel, case_value, lemma, sent_id))) + '\n'
+
+
+def jsonl_lines(spec):
+    current = None
+    for sent_id, token_id, verb, gloss, dep_rel, case_value, lemma, arg_id in _occurrence_rows(spec):
+        if current is None or (current['sent_id'], current['token_id']) != (sent_id, int(token_id)):
+            if current is not None:
+                yield json.dumps(current, ensure_ascii=False) + '\n'
+            current = {'sent_id': sent_id, 'token_id': int(token_id), 'verb': verb, 'gloss': gloss, 'arguments': []}
+        if arg_id is not None:
+            current['arguments'].append({
+                'token_id': int(arg_id), 'dep_rel': dep_rel, 'case_value': case_value, 'lemma': lemma,
+            })
+    if current is not None:
+        yield json.dumps(current, ensure_ascii=False) + '\n'
+
+
+def _conllu_field(value):
+    if value is None or value == '' or value == 'None':
+        return '_'
+    return _tsv_field(value)
+
+
+def _conllu_sentence(sent_id, translated_text, tokens):
+    lines = [f"# sent_id = {sent_id}", f"# text = {' '.join(t[0] for t in tokens)}"]
+    if translated_text:
+        lines.append(f"# text_en = {translated_text}")
+    lines.extend(line for _, line in tokens)
+    return '\n'.join(lines) + '\n\n'
+
+
+def conllu_lines(spec):
+    """
+    CoNLL-U of the matching sentences. The words table has no lemma or XPOS, so
+    those columns are '_'; glosses go to MISC (Gloss=...).
+    """
+    cols = EXPORT_COLUMNS[spec.script]
+    matching, params = _matching(spec, "fv.sent_id")
+    rows = stream_rows(f"""
+        SELECT w.sent_id, w.token_id, w.{cols['form']}, w.pos, CAST(w.feat AS CHAR),
+               w.head_id, w.dep_rel, w.gloss, s2.translated_text
+        FROM words w
+        JOIN sentences s2 ON s2.sent_id = w.sent_id
+        WHERE w.sent_id IN ({matching})
+        ORDER BY w.sent_id, w.token_id
+    """, params)
+
+    sent_id = translated_text = None
+    tokens = []
+    for row_sent_id, token_id, form, pos, feat, head_id, dep_rel, gloss, row_translation in rows:
+        if row_sent_id != sent_id:
+            if tokens:
+                yield _conllu_sentence(sent_id, translated_text, tokens)
+            sent_id, translated_text, tokens = row_sent_id, row_translation, []
+        form = _conllu_field(form)
+        gloss = _conllu_field(gloss)
+        misc = f"Gloss={gloss}" if gloss != '_' else '_'
+        tokens.append((form, '\t'.join((
+            str(token_id), form, '_', _conllu_field(pos), '_', _conllu_field(feat),
+            _conllu_field(head_id), _conllu_field(dep_rel), '_', misc,
+        ))))
+    if tokens:
+        yield _conllu_sentence(sent_id, translated_text, tokens)
+
+
+EXPORT_WRITERS = {
+    'tsv': tsv_lines,
+    'jsonl': jsonl_lines,
+    'conllu': conllu_lines,
+}
+
+
+def export_chunks(spec, fmt, *, compress=False):
+    """
+    Encoded export of spec in fmt as a stream of byte chunks of about
+    EXPORT_BUFFER_BYTES, gzip-compressed on the fly when compress is set.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None  # wbits 31: gzip container
+    buffer = []
+    size = 0
+    for line in EXPORT_WRITERS[fmt](spec):
+        data = line.encode('utf-8')
+        buffer.append(data)
+        size += len(data)
+        if size >= EXPORT_BUFFER_BYTES:
+            chunk = b''.join(buffer)
+            buffer, size = [], 0
+            if compressor is not None:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+
+    chunk = b''.join(buffer)
+    if compressor is not None:
+        chunk = compressor.compress(chunk) + compressor.flush()
+    if chunk:
+        yield chunk
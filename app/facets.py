@@ -0,0 +1,168 @@
+from itertools import combinations
+
+from flask import current_app
+from sqlalchemy import text
+
+from .bitmap_index import bitmap_engine
+from .cache import cached_result
+from .columnar import columnar_index
+from .filter_spec import FEATURE_FILTERS, FEATURE_LABELS
+from .query_memo import memo_execute
+
+
+# (dependency key, arguments column) pairs for each script page.
+LANGUAGE_DEPENDENCY_COLUMNS = (
+    ('deprel', 'dep_rel'),
+    ('case_value', 'case_value'),
+    ('lemma', 'lemma'),
+)
+
+TRANSLIT_DEPENDENCY_COLUMNS = (
+    ('deprel', 'dep_rel'),
+    ('case_value', 'translit_dep_lemma'),
+    ('lemma', 'translit_lemma'),
+)
+
+
+def dependency_facet_prefilter(current_dep, select_alias, columns=LANGUAGE_DEPENDENCY_COLUMNS):
+    """
+    Build an optional WHERE fragment (+ params) that trims the candidate rows of a
+    dependency block before folding.
+
+    A row is only useful for column X if it matches the block's selections on the
+    *other* columns, so with s active selections every useful row matches at least
+    s-1 of them. Returns (None, {}) when no trimming is possible.
+    """
+    preds = []
+    params = {}
+    for key, column in columns:
+        if current_dep.get(key):
+            pname = f"__facet_{key}"
+            preds.append(f"{select_alias}.{column} = :{pname}")
+            params[pname] = current_dep[key]
+
+    if len(preds) < 2:
+        return None, {}
+
+    groups = [' AND '.join(combo) for combo in combinations(preds, len(preds) - 1)]
+    return '(' + ' OR '.join(f'({g})' for g in groups) + ')', params
+
+
+def fold_dependency_facets(rows, current_dep, columns=LANGUAGE_DEPENDENCY_COLUMNS):
+    """
+    Derive the option list of every column of one dependency block from a single
+    candidate set of distinct (dep_rel, case_value, lemma) rows.
+
+    For each column, the options are the values found in rows that match the block's
+    current selections on the *other* columns, which is exactly what one
+    SELECT DISTINCT per column with those predicates used to return.
+
+    Returns {column: [values]}; values may include None (callers filter it out).
+    """
+    selections = [(pos, current_dep.get(key)) for pos, (key, _) in enumerate(columns)]
+    options = {column: set() for _, column in columns}
+
+    for row in rows:
+        for pos, (_, column) in enumerate(columns):
+            if all(sel is None or row[other] == sel for other, sel in selections if other != pos):
+                options[column].add(row[pos])
+
+    return {column: list(values) for column, values in options.items()}
+
+
+# -------------------------------------------------------------------
+# Verb feature facets
+# -------------------------------------------------------------------
+# The feature dropdowns (VerbForm ... Voice) show (value, occurrences) counts
+# folded from one grouped pass over the feature bundles under the non-feature
+# filters: the verb_frequencies summary (occurrences per sense and bundle) when
+# no dependency block is set, verbs with the blocks' joins otherwise. The same
+# pass tells, per bundle, which feature selections it fails, compared in SQL as
+# the verbs list filter does (verbs.<col> IN :values under the column
+# collation); the selections are applied from that while folding. With a bitmap
+# index (app/bitmap_index.py) the counts are popcounts instead.
+#
+# A value is counted as stored, comma-joined multi-values ("Acc,Nom") included:
+# the filter matches whole values, so that is the option that selects them.
+#
+# Conjunctive (the default): a feature's counts are taken under every selection,
+# its own included, as the verbs list is filtered. Disjunctive
+# (FEATURE_FACETS=disjunctive): each feature ignores its own selection, so its
+# options show what ticking another value (OR within a feature) would add.
+FEATURE_COLUMNS = tuple(column for _, column, _ in FEATURE_FILTERS)
+
+FEATURE_FACET_MODES = ('conjunctive', 'disjunctive')
+
+
+def feature_bundle_rows(spec, **flags):
+    """
+    [(VerbForm, ..., Voice, unmatched, occurrences)] per distinct feature bundle
+    under spec without its feature selections; bit i of unmatched is set when the
+    bundle fails the selection of FEATURE_COLUMNS[i].
+    """
+    corpus_index = columnar_index(spec)
+    if corpus_index is not None:
+        return corpus_index.feature_rows(spec, **flags)
+
+    joins, conditions, params = spec.with_(features={}).compile('verbs', **flags)
+    unmatched = []
+    for bit, column in enumerate(FEATURE_COLUMNS):
+        if spec.features.get(column):
+            unmatched.append(f"CASE WHEN verbs.{column} IN :__selected_{column} THEN 0 ELSE {1 << bit} END")
+            params[f'__selected_{column}'] = tuple(spec.features[column])
+    if spec.has_dependency_filters():
+        from_clause = "FROM verbs"
+        occurrences = "COUNT(DISTINCT verbs.token_id, verbs.sent_id)"
+    else:
+        from_clause = "FROM verb_frequencies verbs"
+        occurrences = "CAST(SUM(verbs.occurrences) AS UNSIGNED)"
+
+    columns = ', '.join(f"verbs.{column}" for column in FEATURE_COLUMNS)
+    return memo_execute(text(f"""
+        SELECT {columns}, {' + '.join(unmatched) or '0'} AS unmatched, {occurrences} AS occurrences
+        {from_clause}
+        {joins}
+        WHERE {' AND '.join(conditions) if conditions else '1=1'}
+        GROUP BY {columns}
+    """), params).fetchall()
+
+
+def fold_feature_facets(rows, disjunctive=False):
+    """
+    {UI feature name: {value: occurrences}} from feature_bundle_rows().
+
+    A bundle counts towards a feature when it matches the selections of every
+    other feature and, unless disjunctive, of that feature too.
+    """
+    counts = {column: {} for column in FEATURE_COLUMNS}
+
+    for row in rows:
+        occurrences = int(row[-1] or 0)
+        unmatched = int(row[-2] or 0)
+        failed = [pos for pos in range(len(FEATURE_COLUMNS)) if unmatched & (1 << pos)]
+        if len(failed) > 1 or (failed and not disjunctive):
+            continue
+        for pos, column in enumerate(FEATURE_COLUMNS):
+            if row[pos] is None or (failed and failed[0] != pos):
+                continue
+            counts[column][row[pos]] = counts[column].get(row[pos], 0) + occurrences
+
+    return {FEATURE_LABELS[column]: values for column, values in counts.items()}
+
+
+def feature_facet_counts(spec, mode=None, **flags):
+    """
+    {UI feature name: {value: occurrences}} of the feature dropdowns under spec;
+    mode is 'conjunctive' / 'disjunctive' (default: FEATURE_FACETS). flags go to
+    spec.compile().
+    """
+    mode = mode or current_app.config.get('FEATURE_FACETS', 'conjunctive')
+    bitmaps = bitmap_engine(spec)
+    if bitmaps is not None:
+        return bitmaps.feature_counts(spec, disjunctive=(mode == 'disjunctive'), **flags)
+
+    rows = cached_result(
+        'feature_facets', spec, lambda: feature_bundle_rows(spec, **flags),
+        tuple(sorted(flags.items())),
+    )
+    return fold_feature_facets(rows, disjunctive=(mode == 'disjunctive'))
@@ -0,0 +1,478 @@
+from functools import lru_cache
+
+from .sources import source_ids_for
+
+
+# -------------------------------------------------------------------
+# Shared filter specification for the verbs/sentences queries
+# -------------------------------------------------------------------
+# Both blueprints filter the same verbs/arguments join with the same building
+# blocks: one arguments match per active dependency block (pairwise distinct
+# argument tokens), verb feature IN-lists, source, initial letter, exact-match
+# searches and the selected verb (sense). FilterSpec parses those once from
+# request.args and compiles them to (joins, conditions, params).
+#
+# Dependency blocks compile to one of two equivalent forms:
+#   - 'join':   one arguments JOIN per block plus pairwise token_id != predicates;
+#               the row count is the product of the matching arguments per verb,
+#               so callers need DISTINCT / COUNT(DISTINCT ..)
+#   - 'exists': correlated EXISTS semi-joins, one verbs row at most per verb.
+#               The blocks are nested in one chain that carries the != predicates:
+#               whether two pinned values can match the same argument depends on
+#               the column collation, so the database decides, never Python.
+# 'auto' (the default) uses the semi-joins for every constrained block; the open
+# block of a facet query stays a join since its columns are selected.
+#
+# The SQL text only depends on the *shape* of the spec (which filters are active,
+# not their values), so it is built once per shape and cached; identical shapes
+# always produce byte-identical statements for the database statement cache.
+#
+# Case-insensitive searches compare the stored generated *_norm columns (LOWER of
+# the source column, indexed) with a value lowercased here, never LOWER(column).
+
+MAX_DEPENDENCIES = 5  # Customization: number of dependency filter blocks
+
+# (request arg, verbs column, bind param) for the multi-select verb features.
+FEATURE_FILTERS = (
+    ('verbform', 'VerbForm', 'verbforms_list'),
+    ('aspect', 'Aspect', 'aspects_list'),
+    ('case_feature', 'Case', 'cases_list'),  # "case" is a Python keyword
+    ('Negation', 'Connegative', 'conneg_list'),
+    ('mood', 'Mood', 'moods_list'),
+    ('number', 'Number', 'numbers_list'),
+    ('person', 'Person', 'persons_list'),
+    ('tense', 'Tense', 'tenses_list'),
+    ('voice', 'Voice', 'voices_list'),
+)
+
+# UI feature names (template keys) per verbs column.
+FEATURE_LABELS = {
+    'VerbForm': 'VerbForm', 'Aspect': 'Aspect', 'Case': 'Case',
+    'Connegative': 'Negation', 'Mood': 'Mood', 'Number': 'Number',
+    'Person': 'Person', 'Tense': 'Tense', 'Voice': 'Voice',
+}
+
+# --- Customizable (language dependent) list of transliterated initials, in order.
+# Multigraph initials ('tʻ', 'čʻ', ...) make a plain prefix match ambiguous: a
+# verb's initial is the longest entry it starts with (translit_initial()). Ingest
+# stores it in verbs.translit_initial (and the first letter of the lemma in
+# verbs.lemma_initial); the initial filter and the initials bars use those
+# indexed columns.
+TRANSLIT_INITIAL_LETTERS = (
+    'a', 'b', 'g', 'd', 'e', 'z', 'ē', 'ǝ', 'tʻ', 'ž', 'i', 'l', 'x', 'c', 'k', 'h', 'j', 'ł',
+    'č', 'm', 'y', 'n', 'š', 'o', 'čʻ', 'p', 'ǰ', 'ṙ', 's', 'v', 't', 'r', 'cʻ', 'w', 'pʻ',
+    'kʻ', 'f',
+)
+
+# Per-script column mapping of the verb and dependency filters.
+SCRIPTS = {
+    'language': {
+        'lemma_arg': 'case_dependant_lemma',
+        'case_value_column': 'case_value',
+        'lemma_column': 'lemma',
+        'verb_predicate': '{alias}.lemma = :{param}',
+        'search_predicate': '{alias}.lemma = :{param}',
+        'initial_column': 'lemma_initial',
+    },
+    'translit': {
+        'lemma_arg': 'translit_lemma',
+        'case_value_column': 'translit_dep_lemma',
+        'lemma_column': 'translit_lemma',
+        'verb_predicate': '{alias}.translit_verb COLLATE utf8mb4_bin = :{param}',
+        'search_predicate': '{alias}.translit_verb_norm = :{param}',
+        'initial_column': 'translit_initial',
+    },
+}
+
+DEPENDENCY_KEYS = ('deprel', 'case_value', 'lemma')
+
+DEPENDENCY_STRATEGIES = ('auto', 'join', 'exists')
+
+
+def lemma_initial(lemma):
+    """verbs.lemma_initial: the first letter of the lemma."""
+    return lemma[:1] if lemma else None
+
+
+def translit_initial(translit_verb):
+    """
+    verbs.translit_initial: the longest TRANSLIT_INITIAL_LETTERS entry the verb
+    starts with ('tʻ' for 'tʻołul', 't' for 'tal'); the first letter otherwise.
+    """
+    if not translit_verb:
+        return None
+    matched = [initial for initial in TRANSLIT_INITIAL_LETTERS if translit_verb.startswith(initial)]
+    return max(matched, key=len) if matched else translit_verb[:1]
+
+
+def order_initials(script, initials):
+    """Initials bar order: TRANSLIT_INITIAL_LETTERS order (only those) / sorted."""
+    initials = {initial for initial in initials if initial}
+    if script == 'translit':
+        return [initial for initial in TRANSLIT_INITIAL_LETTERS if initial in initials]
+    return sorted(initials)
+
+
+def _nz(s):
+    """None or zero-length/whitespace-only -> None; else stripped string."""
+    if s is None:
+        return None
+    s = s.strip()
+    return s or None
+
+
+def parse_dependencies(args, script='language'):
+    """
+    Read the dependency filter blocks from request args.
+
+    Block 1 uses syntactic_relation/case_value/<lemma arg>; blocks 2..N use the
+    co_occurring_* keys. Transliterated lemmas are whitespace-normalized.
+    """
+    lemma_arg = SCRIPTS[script]['lemma_arg']
+    clean_lemma = _nz if script == 'translit' else (lambda v: v or None)
+
+    dependencies = []
+    for idx in range(MAX_DEPENDENCIES):
+        if idx == 0:
+            dep = {
+                'deprel': args.get('syntactic_relation') or None,
+                'case_value': args.get('case_value') or None,
+                'lemma': clean_lemma(args.get(lemma_arg)),
+            }
+        else:
+            dep = {
+                'deprel': args.get(f'co_occurring_deprel_{idx + 1}') or None,
+                'case_value': args.get(f'co_occurring_case_value_{idx + 1}') or None,
+                'lemma': clean_lemma(args.get(f'co_occurring_lemma_{idx + 1}')),
+            }
+        dependencies.append(dep)
+    return dependencies
+
+
+def parse_dependency_visibility(args):
+    """Visible flags of the dependency blocks (block 1 is always visible)."""
+    return [True] + [
+        args.get(f'dependency{idx + 1}_visible', 'false') == 'true'
+        for idx in range(1, MAX_DEPENDENCIES)
+    ]
+
+
+def parse_features(args):
+    """{verbs column: tuple(selected values)} for the features the user picked."""
+    features = {}
+    for arg, column, _ in FEATURE_FILTERS:
+        values = args.getlist(arg)
+        if values:
+            features[column] = tuple(values)
+    return features
+
+
+def parse_sources(args, *, require_submit=False):
+    """
+    (selected_sources, source_submitted) from request args. With require_submit
+    the selection only counts once the sources panel was submitted (the home page:
+    a never-submitted panel means "no filter").
+    """
+    source_submitted = 'source_checkbox_submitted' in args
+    selected_sources = args.getlist('selected_source')
+    if require_submit and not source_submitted:
+        selected_sources = []
+    return selected_sources, source_submitted
+
+
+def is_active_dependency(dep):
+    return bool(dep.get('deprel') or dep.get('case_value') or dep.get('lemma'))
+
+
+class FilterSpec:
+    """
+    All filters of one request, resolved once from the URL (interactions such as a
+    search clearing the initial are decided by the view) and compiled to SQL
+    fragments on demand.
+    """
+
+    def __init__(
+        self,
+        *,
+        script='language',
+        dependencies=None,
+        features=None,
+        selected_sources=(),
+        source_submitted=False,
+        initial_letter='',
+        search_query='',
+        english_search_query='',
+        selected_verb=None,
+        selected_verb_gloss=None,
+    ):
+        self.script = script
+        self.dependencies = dependencies if dependencies is not None else [
+            dict.fromkeys(DEPENDENCY_KEYS) for _ in range(MAX_DEPENDENCIES)
+        ]
+        self.features = dict(features or {})
+        self.selected_sources = tuple(selected_sources or ())
+        self.source_submitted = bool(source_submitted)
+        self.initial_letter = initial_letter or ''
+        self.search_query = search_query or ''
+        self.english_search_query = english_search_query or ''
+        self.selected_verb = selected_verb or None
+        self.selected_verb_gloss = selected_verb_gloss or None
+
+    @classmethod
+    def from_request(cls, args, *, script='language', **resolved):
+        """
+        Parse dependencies and features from args; the remaining fields (initial,
+        searches, selected verb, sources) are passed in already resolved.
+        """
+        return cls(
+            script=script,
+            dependencies=parse_dependencies(args, script),
+            features=parse_features(args),
+            **resolved,
+        )
+
+    # ---------------------------------------------------------------
+    # Introspection helpers
+    # ---------------------------------------------------------------
+    def active_dependencies(self):
+        """[(idx, dep)] of the blocks that have at least one selection."""
+        return [(idx, dep) for idx, dep in enumerate(self.dependencies) if is_active_dependency(dep)]
+
+    def has_dependency_filters(self):
+        return any(is_active_dependency(dep) for dep in self.dependencies)
+
+    def source_ids(self):
+        return tuple(source_ids_for(self.selected_sources))
+
+    def with_(self, **changes):
+        """Copy of this spec with some fields replaced."""
+        fields = dict(
+            script=self.script,
+            dependencies=[dict(dep) for dep in self.dependencies],
+            features=dict(self.features),
+            selected_sources=self.selected_sources,
+            source_submitted=self.source_submitted,
+            initial_letter=self.initial_letter,
+            search_query=self.search_query,
+            english_search_query=self.english_search_query,
+            selected_verb=self.selected_verb,
+            selected_verb_gloss=self.selected_verb_gloss,
+        )
+        fields.update(changes)
+        return FilterSpec(**fields)
+
+    def cache_key(self):
+        """Canonical, hashable representation of every filter value."""
+        return (
+            self.script,
+            tuple(tuple(dep.get(k) for k in DEPENDENCY_KEYS) for dep in self.dependencies),
+            tuple(sorted((col, tuple(sorted(vals))) for col, vals in self.features.items())),
+            self.source_ids(),
+            self.source_submitted and not self.selected_sources,
+            self.initial_letter,
+            self.search_query,
+            self.english_search_query,
+            self.selected_verb,
+            self.selected_verb_gloss,
+        )
+
+    # ---------------------------------------------------------------
+    # Compilation
+    # ---------------------------------------------------------------
+    def compile(
+        self,
+        alias='verbs',
+        *,
+        dependency_join='JOIN',
+        dependency_strategy='auto',
+        open_level=None,
+        initial='list',
+        search=True,
+        sense='verb+gloss',
+        source_alias=None,
+    ):
+        """
+        Return (joins, conditions, params) for this spec.
+
+        alias            table alias of verbs in the calling query
+        dependency_join  'JOIN' or 'LEFT JOIN' for the per-block arguments joins
+                         (a constrained block filters its rows out either way)
+        dependency_strategy  'auto' / 'join' / 'exists' (see the module comment)
+        open_level       dependency block joined without its own constraints
+                         (dropdown options of that block); aliased a{open_level}
+        initial          'list'  -> initial letter only when no verb is selected
+                         'always' / None
+        search           apply exact-match verb/English searches
+        sense            'verb+gloss' / 'verb' / None (selected verb restriction)
+        source_alias     table alias whose source_id is filtered (default: alias)
+        """
+        if dependency_strategy not in DEPENDENCY_STRATEGIES:
+            raise ValueError(f"unknown dependency strategy: {dependency_strategy!r}")
+        joins, conditions, refs = _compile_shape(self._shape(
+            alias, dependency_join, dependency_strategy, open_level, initial, search, sense,
+            source_alias or alias,
+        ))
+        params = {name: self._value(ref) for name, ref in refs}
+        return joins, list(conditions), params
+
+    def _shape(self, alias, dependency_join, dependency_strategy, open_level, initial, search, sense,
+               source_alias):
+        deps = tuple(
+            (idx, bool(dep.get('deprel')), bool(dep.get('case_value')), bool(dep.get('lemma')))
+            for idx, dep in enumerate(self.dependencies)
+            if is_active_dependency(dep) or idx == open_level
+        )
+        if self.selected_sources:
+            sources = 'ids' if self.source_ids() else None
+        else:
+            sources = 'none' if self.source_submitted else None
+
+        apply_initial = bool(self.initial_letter) and (
+            initial == 'always' or (initial == 'list' and not self.selected_verb)
+        )
+        return (
+            self.script,
+            alias,
+            dependency_join,
+            open_level,
+            deps,
+            dependency_strategy != 'join',
+            tuple(col for _, col, _ in FEATURE_FILTERS if self.features.get(col)),
+            sources,
+            source_alias,
+            apply_initial,
+            bool(search and self.search_query),
+            bool(search and self.english_search_query),
+            bool(sense and self.selected_verb),
+            bool(sense == 'verb+gloss' and self.selected_verb and self.selected_verb_gloss),
+        )
+
+    def _value(self, ref):
+        kind = ref[0]
+        if kind == 'dep':
+            return self.dependencies[ref[1]][ref[2]]
+        if kind == 'feature':
+            return tuple(self.features[ref[1]])
+        if kind == 'sources':
+            return self.source_ids()
+        if kind == 'initial':
+            return self.initial_letter
+        if kind == 'search':
+            return self.search_query.lower() if self.script == 'translit' else self.search_query
+        if kind == 'english_search':
+            return self.english_search_query.lower()
+        if kind == 'verb':
+            return self.selected_verb
+        if kind == 'gloss':
+            return self.selected_verb_gloss
+        raise KeyError(ref)
+
+
+@lru_cache(maxsize=1024)
+def _compile_shape(shape):
+    """
+    Build the SQL text for one spec shape.
+
+    Returns (joins, conditions, refs) where refs is a tuple of
+    (bind param name, value reference) resolved by FilterSpec._value().
+    """
+    (script, alias, dependency_join, open_level, deps, semi_joins, feature_cols, sources,
+     source_alias, has_initial, has_search, has_eng_search, has_verb, has_gloss) = shape
+    cfg = SCRIPTS[script]
+
+    joins = ""
+    conditions = []
+    refs = []
+
+    # Selected verb (sense)
+    if has_verb:
+        conditions.append(cfg['verb_predicate'].format(alias=alias, param='__sel_verb'))
+        refs.append(('__sel_verb', ('verb',)))
+        if has_gloss:
+            conditions.append(f"{alias}.gloss = :__sel_gloss")
+            refs.append(('__sel_gloss', ('gloss',)))
+
+    # Exact-match searches
+    if has_search:
+        conditions.append(cfg['search_predicate'].format(alias=alias, param='__search'))
+        refs.append(('__search', ('search',)))
+    if has_eng_search:
+        conditions.append(f"{alias}.gloss_norm = :__eng_search")
+        refs.append(('__eng_search', ('english_search',)))
+
+    # Initial letter (stored, longest multigraph for translit)
+    if has_initial:
+        conditions.append(f"{alias}.{cfg['initial_column']} = :__initial")
+        refs.append(('__initial', ('initial',)))
+
+    # Source/language
+    if sources == 'none':
+        conditions.append("0=1")  # explicit user intent: show nothing
+    elif sources == 'ids':
+        conditions.append(f"{source_alias}.source_id IN :__source_ids")
+        refs.append(('__source_ids', ('sources',)))
+
+    # Verb feature filters
+    for _, column, param in FEATURE_FILTERS:
+        if column in feature_cols:
+            conditions.append(f"{alias}.{column} IN :{param}")
+            refs.append((param, ('feature', column)))
+
+    def block_predicates(idx, has_deprel, has_case_value, has_lemma):
+        a = f"a{idx}"
+        preds = []
+        if has_deprel:
+            preds.append(f"{a}.dep_rel = :deprel{idx}")
+            refs.append((f'deprel{idx}', ('dep', idx, 'deprel')))
+        if has_case_value:
+            preds.append(f"{a}.{cfg['case_value_column']} = :case_value{idx}")
+            refs.append((f'case_value{idx}', ('dep', idx, 'case_value')))
+        if has_lemma:
+            preds.append(f"{a}.{cfg['lemma_column']} = :lemma{idx}")
+            refs.append((f'lemma{idx}', ('dep', idx, 'lemma')))
+        return preds
+
+    if not semi_joins:
+        # Dependency blocks: one arguments join each, pairwise distinct argument tokens
+        for idx, has_deprel, has_case_value, has_lemma in deps:
+            a = f"a{idx}"
+            joins += (
+                f"{dependency_join} arguments {a} "
+                f"ON {alias}.token_id = {a}.head_id AND {alias}.sent_id = {a}.sent_id\n"
+            )
+            if idx != open_level:
+                conditions.extend(block_predicates(idx, has_deprel, has_case_value, has_lemma))
+
+        for i in range(len(deps)):
+            for j in range(i + 1, len(deps)):
+                conditions.append(f"a{deps[i][0]}.token_id != a{deps[j][0]}.token_id")
+
+        return joins, tuple(conditions), tuple(refs)
+
+    # Semi-joins: the open block (if any) is still joined, every other block is
+    # distinct from it; each block is nested in the previous one's EXISTS and
+    # distinct from all of them.
+    flags = {dep[0]: dep[1:] for dep in deps}
+    if open_level is not None:
+        a = f"a{open_level}"
+        joins += (
+            f"{dependency_join} arguments {a} "
+            f"ON {alias}.token_id = {a}.head_id AND {alias}.sent_id = {a}.sent_id\n"
+        )
+
+    chain = ""
+    blocks = [idx for idx, *_ in deps if idx != open_level]
+    for position, idx in reversed(list(enumerate(blocks))):
+        a = f"a{idx}"
+        preds = [f"{a}.head_id = {alias}.token_id", f"{a}.sent_id = {alias}.sent_id"]
+        preds += block_predicates(idx, *flags[idx])
+        if open_level is not None:
+            preds.append(f"{a}.token_id != a{open_level}.token_id")
+        preds += [f"{a}.token_id != a{other}.token_id" for other in blocks[:position]]
+        if chain:
+            preds.append(chain)
+        chain = f"EXISTS (SELECT 1 FROM arguments {a} WHERE {' AND '.join(preds)})"
+    if chain:
+        conditions.append(chain)
+
+    return joins, tuple(conditions), tuple(refs)
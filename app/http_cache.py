@@ -0,0 +1,143 @@
+import hashlib
+import os
+from functools import wraps
+
+from flask import Response, current_app, request
+
+from .filter_spec import FEATURE_FILTERS, MAX_DEPENDENCIES, SCRIPTS, FilterSpec, parse_sources
+from .versions import spec_version
+
+
+# -------------------------------------------------------------------
+# Conditional GET (ETag / 304) for the read-only pages and API endpoints
+# -------------------------------------------------------------------
+# The HTML views and the /api/v1 panels are pure functions of the query string,
+# the corpus contents and the code/templates that render them (no session state).
+# Their strong ETag hashes exactly those inputs:
+#
+#   - the endpoint, the canonical FilterSpec key (dependencies, features and
+#     sources as the view resolves them), and the remaining query string
+#     arguments (page, cursor, sort, visibility flags...) in a canonical key
+#     order; the pages echo every argument back into their links, so none of
+#     them can be left out;
+#   - the version stamp of the data the request reads (see app/versions.py): the
+#     selected sources' versions when the sources panel restricts the request, the
+#     corpus version otherwise;
+#   - the request headers the endpoint varies on (e.g. Accept for NDJSON);
+#   - BUILD_ID, which changes with the application code and templates, and the
+#     config values that change the output without touching the code
+#     (ETAG_CONFIG).
+#
+# All of it is known before the view runs, so a matching If-None-Match is answered
+# with 304 Not Modified without any of the view's SQL (the version stamp costs at
+# most one small read of corpus_versions per CORPUS_VERSION_TTL).
+#
+# Config:
+#   HTTP_ETAGS          enable validators and 304s (default on; off in debug mode,
+#                       where templates reload without a BUILD_ID change)
+#   HTTP_CACHE_CONTROL  Cache-Control of cacheable responses (default
+#                       "public, no-cache": shared caches may store them but must
+#                       revalidate, which the ETag makes a cheap 304)
+#   HTTP_CACHE_VARY     Vary of cacheable responses (default "Accept-Encoding"),
+#                       extended per endpoint by conditional_get(vary=...)
+#   BUILD_ID            code/template version (default: hash of the app package
+#                       files' names, sizes and mtimes at startup)
+
+
+def compute_build_id(root):
+    """Hash of the names, sizes and mtimes of the .py and template files under root."""
+    digest = hashlib.sha1()
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d != '__pycache__')
+        for filename in sorted(filenames):
+            if not filename.endswith(('.py', '.html')):
+                continue
+            path = os.path.join(dirpath, filename)
+            stat = os.stat(path)
+            digest.update(f"{os.path.relpath(path, root)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()[:12]
+
+
+# Config values that change a response without changing BUILD_ID.
+ETAG_CONFIG = ('FEATURE_FACETS', 'COLUMNAR_INDEX', 'BITMAP_INDEX')
+
+# Query string arguments already covered by the FilterSpec key.
+_SPEC_ARGS = frozenset(
+    ['selected_source', 'source_checkbox_submitted', 'syntactic_relation', 'case_value']
+    + [conf['lemma_arg'] for conf in SCRIPTS.values()]
+    + [f'co_occurring_{key}_{idx + 1}' for key in ('deprel', 'case_value', 'lemma') for idx in range(1, MAX_DEPENDENCIES)]
+    + [arg for arg, _, _ in FEATURE_FILTERS]
+)
+
+
+def request_filter_spec(script, sources_require_submit=False):
+    """
+    FilterSpec of the request's dependency, feature and source filters, with the
+    sources resolved as the view resolves them (see parse_sources).
+    """
+    args = request.args
+    selected_sources, source_submitted = parse_sources(args, require_submit=sources_require_submit)
+    return FilterSpec.from_request(
+        args, script=script, selected_sources=selected_sources, source_submitted=source_submitted,
+    )
+
+
+def request_etag(script, vary_headers=(), sources_require_submit=False):
+    spec = request_filter_spec(script, sources_require_submit)
+    config = current_app.config
+    digest = hashlib.sha1()
+    digest.update(f"{request.endpoint}\n{config['BUILD_ID']}\n{spec_version(spec)}\n".encode())
+    for name in ETAG_CONFIG:
+        digest.update(f"{name}={config.get(name)!r}\n".encode())
+    digest.update(f"{spec.cache_key()!r}\n".encode())
+    # Stable sort: the order of repeated values of one argument is kept.
+    for key, value in sorted(request.args.items(multi=True), key=lambda item: item[0]):
+        if key not in _SPEC_ARGS:
+            digest.update(f"{key}={value}\n".encode())
+    for header in vary_headers:
+        digest.update(f"{header}: {request.headers.get(header, '')}\n".encode())
+    return digest.hexdigest()
+
+
+def _cache_headers(response, etag, vary):
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = current_app.config['HTTP_CACHE_CONTROL']
+    for header in vary:
+        response.vary.add(header)
+    return response
+
+
+def conditional_get(script=None, *, vary=(), sources_require_submit=False):
+    """
+    Give a GET view a strong ETag and answer a matching If-None-Match with 304
+    before the view runs. script is the view's script ('language' / 'translit');
+    None takes it from the route's <script> argument. sources_require_submit must
+    match how the view reads the sources panel (see parse_sources).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            config = current_app.config
+            if not config['HTTP_ETAGS'] or current_app.debug or request.method not in ('GET', 'HEAD'):
+                return view(*args, **kwargs)
+
+            vary_all = [h.strip() for h in config['HTTP_CACHE_VARY'].split(',') if h.strip()] + list(vary)
+            etag = request_etag(script or kwargs['script'], vary, sources_require_submit)
+
+            if request.if_none_match.contains_weak(etag):
+                return _cache_headers(Response(status=304), etag, vary_all)
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                _cache_headers(response, etag, vary_all)
+            return response
+        return wrapper
+    return decorator
+
+
+def init_http_cache(app):
+    app.config.setdefault('HTTP_ETAGS', True)
+    app.config.setdefault('HTTP_CACHE_CONTROL', 'public, no-cache')
+    app.config.setdefault('HTTP_CACHE_VARY', 'Accept-Encoding')
+    if not app.config.get('BUILD_ID'):
+        app.config['BUILD_ID'] = compute_build_id(app.root_path)
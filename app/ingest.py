@@ -0,0 +1,463 @@
+import gzip
+import os
+import re
+import tempfile
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import click
+from flask import current_app
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from .bitmap_index import build_bitmap_index
+from .extensions import db
+from .filter_spec import FEATURE_FILTERS, lemma_initial, translit_initial
+from .sentence_payloads import PAYLOAD_TABLE, build_sentence_payloads
+from .sources import SOURCE_IDS, source_id_for_sent_id
+from .summary import refresh_verb_frequency_summary
+from .versions import bump_versions
+
+
+# -------------------------------------------------------------------
+# Bulk CoNLL-U ingestion (flask ingest)
+# -------------------------------------------------------------------
+# Builds the four tables the app reads (sentences, words, verbs, arguments) from UD
+# CoNLL-U treebanks:
+#
+#   1. parse: every input file is read line by line in a worker process and its
+#      rows are spooled to one TSV file per table (LOAD DATA escaping, \N = NULL);
+#   2. load: the spool files go into fresh <table>_new copies, by multi-row INSERT
+#      batches or LOAD DATA LOCAL INFILE (--method);
+#   3. swap: one RENAME TABLE swaps all four tables in, so readers never see a
+#      partial corpus; the verb_frequencies summary and the sentence payloads are
+#      then rebuilt and the version stamps bumped (app/versions.py), and the
+#      BITMAP_INDEX file, when configured, rebuilt for the new version.
+#
+# --source NAME replaces a single source (--append adds to the live tables instead):
+# its old rows are deleted and the new ones loaded in one transaction on the live
+# tables, and only that source's version stamp (plus the corpus one) changes.
+#
+# Conventions read from the treebank (UD Classical Armenian style):
+#   MISC Gloss=       English gloss (words.gloss, verbs.gloss)
+#   MISC Translit=    transliterated form; LTranslit= transliterated lemma
+#   # translit =      transliterated sentence (else the Translit forms, else # text)
+#   # text_en =       translation
+# Multiword token ranges (1-2) and empty nodes (1.1) are skipped.
+
+# --- Customizable: what counts as a verb / an argument / a case marker
+VERB_UPOS = frozenset({'VERB'})
+# Argument relations by their universal part (subtypes such as obl:agent included).
+ARGUMENT_DEPRELS = frozenset({'nsubj', 'csubj', 'obj', 'ccomp', 'xcomp', 'iobj', 'obl', 'aux', 'expl'})
+CASE_DEPRELS = frozenset({'case'})  # the first two become cdep_token_id / second_cdep_token_id
+FIXED_DEPREL = 'fixed'
+
+VERB_FEATURES = tuple(column for _, column, _ in FEATURE_FILTERS)  # FEATS keys == verbs columns
+
+# Column order of the spool files and of the loads.
+INGEST_TABLES = {
+    'sentences': ('sent_id', 'transliterated_text', 'translated_text', 'source_id'),
+    'words': ('sent_id', 'token_id', 'form', 'translit', 'feat', 'gloss', 'head_id', 'dep_rel', 'pos'),
+    'verbs': (
+        'sent_id', 'token_id', 'lemma', 'gloss', 'translit_verb', 'source_id',
+        'lemma_initial', 'translit_initial',
+    ) + VERB_FEATURES,
+    'arguments': (
+        'sent_id', 'head_id', 'token_id', 'dep_rel', 'case_value', 'lemma',
+        'translit_dep_lemma', 'translit_lemma',
+        'cdep_token_id', 'second_cdep_token_id', 'fdep_token_id', 'source_id',
+    ),
+}
+
+INGEST_METHODS = ('insert', 'load-data')
+
+_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+_UNESCAPE_RE = re.compile(r'\\(.)')
+_UNESCAPES = {'t': '\t', 'n': '\n', 'r': '\r', '0': '\0'}
+
+
+# -------------------------------------------------------------------
+# CoNLL-U parsing
+# -------------------------------------------------------------------
+class Token:
+    __slots__ = ('id', 'form', 'lemma', 'upos', 'feats', 'head', 'deprel', 'misc', '_feat_map')
+
+    def __init__(self, cols):
+        self.id = int(cols[0])
+        self.form = _field(cols[1])
+        self.lemma = _field(cols[2])
+        self.upos = _field(cols[3])
+        self.feats = _field(cols[5])
+        self.head = int(cols[6]) if cols[6] != '_' else None
+        self.deprel = _field(cols[7])
+        self.misc = _pairs(cols[9], '|', '=')
+        self._feat_map = None
+
+    @property
+    def feat_map(self):
+        # Only verbs and arguments need the parsed FEATS.
+        if self._feat_map is None:
+            self._feat_map = _pairs(self.feats, '|', '=')
+        return self._feat_map
+
+    @property
+    def base_deprel(self):
+        return self.deprel.split(':', 1)[0] if self.deprel else None
+
+
+def _field(value):
+    return None if value == '_' else value
+
+
+def _pairs(value, sep, eq):
+    if not value or value == '_':
+        return {}
+    pairs = {}
+    for part in value.split(sep):
+        key, found, val = part.partition(eq)
+        if found:
+            pairs.setdefault(key, val)
+    return pairs
+
+
+def read_conllu(path):
+    """Yield (comments, tokens) per sentence of a CoNLL-U file (.gz allowed), streaming."""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        comments, tokens = {}, []
+        for lineno, line in enumerate(f, 1):
+            line = line.rstrip('\r\n')
+            if not line:
+                if tokens:
+                    yield comments, tokens
+                comments, tokens = {}, []
+                continue
+            if line.startswith('#'):
+                key, found, value = line[1:].partition('=')
+                if found:
+                    comments.setdefault(key.strip(), value.strip())
+                continue
+            cols = line.split('\t')
+            if len(cols) != 10:
+                raise ValueError(f"{path}:{lineno}: expected 10 columns, got {len(cols)}")
+            if '-' in cols[0] or '.' in cols[0]:
+                continue
+            tokens.append(Token(cols))
+        if tokens:
+            yield comments, tokens
+
+
+def sentence_rows(comments, tokens, source_id=None):
+    """
+    {table: [row tuples]} of one parsed sentence. source_id defaults to the one
+    the sent_id patterns assign.
+    """
+    sent_id = comments.get('sent_id')
+    if not sent_id:
+        raise ValueError("sentence without a '# sent_id' comment")
+    if source_id is None:
+        source_id = source_id_for_sent_id(sent_id)
+
+    children = defaultdict(list)
+    for t in tokens:
+        children[t.head].append(t)
+
+    translit_forms = [t.misc.get('Translit') for t in tokens]
+    transliterated_text = (
+        comments.get('translit')
+        or (' '.join(translit_forms) if all(translit_forms) else None)
+        or comments.get('text')
+    )
+    rows = {
+        'sentences': [(sent_id, transliterated_text, comments.get('text_en'), source_id)],
+        'words': [
+            (sent_id, t.id, t.form, t.misc.get('Translit'), t.feats, t.misc.get('Gloss'), t.head, t.deprel, t.upos)
+            for t in tokens
+        ],
+        'verbs': [],
+        'arguments': [],
+    }
+
+    for verb in tokens:
+        if verb.upos not in VERB_UPOS:
+            continue
+        translit_verb = verb.misc.get('LTranslit')
+        rows['verbs'].append(
+            (sent_id, verb.id, verb.lemma, verb.misc.get('Gloss'), translit_verb, source_id,
+             lemma_initial(verb.lemma), translit_initial(translit_verb))
+            + tuple(verb.feat_map.get(feature) for feature in VERB_FEATURES)
+        )
+        for arg in children[verb.id]:
+            if arg.base_deprel in ARGUMENT_DEPRELS:
+                rows['arguments'].append(argument_row(sent_id, source_id, verb, arg, children))
+    return rows
+
+
+def argument_row(sent_id, source_id, verb, arg, children):
+    """
+    arguments row of one verb dependent. case_value is "<Case> + <marker lemmas>"
+    (either side alone when the other is missing); the fixed dependent hangs off
+    the deepest case marker (or the argument itself).
+    """
+    markers = [c for c in children[arg.id] if c.base_deprel in CASE_DEPRELS][:2]
+    governor = markers[-1] if markers else arg
+    fixed = next((c for c in children[governor.id] if c.deprel == FIXED_DEPREL), None)
+
+    marker_tokens = markers + ([fixed] if fixed is not None else [])
+    marker = ' '.join(t.lemma for t in marker_tokens if t.lemma) or None
+    translit_marker = [t.misc.get('LTranslit') for t in marker_tokens]
+    case = arg.feat_map.get('Case')
+
+    return (
+        sent_id, verb.id, arg.id, arg.deprel,
+        f"{case} + {marker}" if case and marker else (case or marker),
+        arg.lemma,
+        ' '.join(translit_marker) if marker_tokens and all(translit_marker) else None,
+        arg.misc.get('LTranslit'),
+        markers[0].id if markers else None,
+        markers[1].id if len(markers) > 1 else None,
+        fixed.id if fixed is not None else None,
+        source_id,
+    )
+
+
+# -------------------------------------------------------------------
+# Spool files (LOAD DATA format)
+# -------------------------------------------------------------------
+def _escape(value):
+    if value is None:
+        return '\\N'
+    value = str(value)
+    # translate() is slow on non-ASCII text; most fields need no escaping at all.
+    if '\\' in value or '\t' in value or '\n' in value or '\r' in value:
+        return value.translate(_ESCAPES)
+    return value
+
+
+def _unescape(field):
+    if field == '\\N':
+        return None
+    if '\\' not in field:
+        return field
+    return _UNESCAPE_RE.sub(lambda m: _UNESCAPES.get(m.group(1), m.group(1)), field)
+
+
+def parse_file(path, spool_dir, index, source_id=None):
+    """
+    Parse one CoNLL-U file into per-table spool files (runs in a worker process).
+    Returns (path, {table: (spool path, row count)}, source ids seen).
+    """
+    spool = {
+        table: os.path.join(spool_dir, f"{index:05d}.{table}.tsv") for table in INGEST_TABLES
+    }
+    counts = dict.fromkeys(INGEST_TABLES, 0)
+    source_ids = set()
+    handles = {
+        table: open(p, 'w', encoding='utf-8', newline='\n', buffering=1 << 20) for table, p in spool.items()
+    }
+    try:
+        for comments, tokens in read_conllu(path):
+            try:
+                rows = sentence_rows(comments, tokens, source_id)
+            except ValueError as e:
+                raise ValueError(f"{path}: {e}") from None
+            source_ids.add(rows['sentences'][0][-1])
+            for table, table_rows in rows.items():
+                handles[table].writelines([
+                    '\t'.join([_escape(v) for v in row]) + '\n'
+                    for row in table_rows
+                ])
+                counts[table] += len(table_rows)
+    finally:
+        for handle in handles.values():
+            handle.close()
+    return path, {table: (spool[table], counts[table]) for table in INGEST_TABLES}, source_ids
+
+
+def read_spool(path):
+    with open(path, encoding='utf-8', newline='\n') as f:
+        for line in f:
+            yield [_unescape(field) for field in line.rstrip('\n').split('\t')]
+
+
+# -------------------------------------------------------------------
+# Loading
+# -------------------------------------------------------------------
+def _load_inserts(conn, table, columns, spool_path, batch_size, commit):
+    cols = ', '.join(f"`{c}`" for c in columns)
+    insert = text(
+        f"INSERT INTO {table} ({cols}) VALUES ({', '.join(f':c{i}' for i in range(len(columns)))})"
+    )
+    batch = []
+    for row in read_spool(spool_path):
+        batch.append({f"c{i}": value for i, value in enumerate(row)})
+        if len(batch) >= batch_size:
+            conn.execute(insert, batch)  # executemany: multi-row INSERT statements
+            if commit:
+                conn.commit()
+            batch = []
+    if batch:
+        conn.execute(insert, batch)
+        if commit:
+            conn.commit()
+
+
+def _load_data_infile(conn, table, columns, spool_path, commit):
+    cols = ', '.join(f"`{c}`" for c in columns)
+    conn.execute(text(f"""
+        LOAD DATA LOCAL INFILE :path INTO TABLE {table}
+        CHARACTER SET utf8mb4
+        FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\'
+        LINES TERMINATED BY '\\n'
+        ({cols})
+    """), {'path': spool_path})
+    if commit:
+        conn.commit()
+
+
+def load_spools(conn, parsed, *, suffix='', method='insert', batch_size=5000, commit=True, echo=click.echo):
+    """Load the spool files of every parsed input into <table><suffix>; {table: rows}."""
+    totals = dict.fromkeys(INGEST_TABLES, 0)
+    for table, columns in INGEST_TABLES.items():
+        for _, spools, _ in parsed:
+            spool_path, count = spools[table]
+            if not count:
+                continue
+            if method == 'load-data':
+                _load_data_infile(conn, f"{table}{suffix}", columns, spool_path, commit)
+            else:
+                _load_inserts(conn, f"{table}{suffix}", columns, spool_path, batch_size, commit)
+            totals[table] += count
+        echo(f"loaded {table}: {totals[table]} rows")
+    return totals
+
+
+def delete_source(conn, source_id):
+    """Delete one source's rows from the corpus tables and its stored payloads."""
+    params = {'source_id': source_id}
+    # words and sentence_payloads have no source_id: go through sentences, first.
+    for table in (PAYLOAD_TABLE, 'words'):
+        conn.execute(text(f"""
+            DELETE t FROM {table} t JOIN sentences s ON s.sent_id = t.sent_id
+            WHERE s.source_id = :source_id
+        """), params)
+    for table in ('arguments', 'verbs', 'sentences'):
+        conn.execute(text(f"DELETE FROM {table} WHERE source_id = :source_id"), params)
+
+
+def input_files(paths):
+    """Expand directories to their *.conllu / *.conllu.gz files (sorted)."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(
+                    os.path.join(root, name) for name in names
+                    if name.endswith('.conllu') or name.endswith('.conllu.gz')
+                )
+        else:
+            files.append(path)
+    return sorted(files)
+
+
+def ingest(paths, *, workers=None, method='insert', batch_size=5000, payloads=True,
+           source=None, append=False, echo=click.echo):
+    """
+    Load the CoNLL-U files at paths. Returns {table: rows loaded}.
+
+      default         replace the whole corpus (fresh tables swapped in)
+      source=NAME     replace that source only; every input sentence belongs to it
+      append=True     add the sentences to the live tables (source=NAME: assign them to it)
+
+    Partial loads run in one transaction on the live tables. Afterwards the summary
+    and payloads are refreshed and the corpus version plus the touched sources'
+    versions are bumped (last, so nothing gets cached against half-derived tables).
+    """
+    files = input_files(paths)
+    if not files:
+        raise click.ClickException("no CoNLL-U input files")
+    source_id = SOURCE_IDS[source] if source else None
+    in_place = append or source_id is not None
+
+    with tempfile.TemporaryDirectory(prefix='ingest-') as spool_dir:
+        # 1. parse (one task per file); nothing is touched in the database yet
+        n = len(files)
+        try:
+            if workers == 1 or n == 1:
+                parsed = [parse_file(path, spool_dir, i, source_id) for i, path in enumerate(files)]
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    parsed = list(pool.map(parse_file, files, [spool_dir] * n, range(n), [source_id] * n))
+        except ValueError as e:
+            raise click.ClickException(str(e))
+        for path, spools, _ in parsed:
+            echo(f"parsed {path}: " + ', '.join(f"{t} {c}" for t, (_, c) in spools.items()))
+        touched = set().union(*(source_ids for _, _, source_ids in parsed))
+
+        # 2. load
+        # On a dedicated unpooled connection: the session variables set below must
+        # not leak into a pooled connection that the app reuses afterwards.
+        connect_args = {}
+        if method == 'load-data':
+            # Needs local_infile=ON on the server as well.
+            connect_args['local_infile'] = True
+        engine = create_engine(db.engine.url, connect_args=connect_args, poolclass=NullPool)
+
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SET SESSION unique_checks = 0, foreign_key_checks = 0"))
+                if in_place:
+                    if not append:
+                        delete_source(conn, source_id)
+                        echo(f"deleted source {source}")
+                    totals = load_spools(conn, parsed, method=method, batch_size=batch_size, commit=False, echo=echo)
+                    conn.commit()
+                else:
+                    for table in INGEST_TABLES:
+                        conn.execute(text(f"DROP TABLE IF EXISTS {table}_new"))
+                        conn.execute(text(f"DROP TABLE IF EXISTS {table}_old"))
+                        conn.execute(text(f"CREATE TABLE {table}_new LIKE {table}"))
+                    conn.commit()
+                    totals = load_spools(conn, parsed, suffix='_new', method=method, batch_size=batch_size, echo=echo)
+        finally:
+            engine.dispose()
+
+    # 3. full reload: swap all four tables in one step
+    if not in_place:
+        with db.engine.begin() as conn:
+            conn.execute(text("RENAME TABLE " + ', '.join(
+                f"{t} TO {t}_old, {t}_new TO {t}" for t in INGEST_TABLES
+            )))
+            for table in INGEST_TABLES:
+                conn.execute(text(f"DROP TABLE {table}_old"))
+        touched = set(SOURCE_IDS.values())
+    elif source_id is not None:
+        touched.add(source_id)
+
+    # 4. derived tables, then the version stamps
+    echo(f"verb_frequencies: {refresh_verb_frequency_summary()} rows")
+    if payloads:
+        built = build_sentence_payloads(source_ids=sorted(touched) if in_place else None)
+        echo(f"sentence_payloads: {built} sentences")
+    with db.engine.begin() as conn:
+        version = bump_versions(conn, touched)
+    echo(f"corpus version {version} (sources {', '.join(map(str, sorted(touched)))})")
+    if current_app.config.get('BITMAP_INDEX'):
+        echo(f"bitmap index: {build_bitmap_index(current_app.config['BITMAP_INDEX'])}")
+    return totals
+
+
+@click.command("ingest")
+@click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option("--workers", default=os.cpu_count() or 1, show_default=True, help="Parser processes.")
+@click.option("--method", type=click.Choice(INGEST_METHODS), default='insert', show_default=True,
+              help="Multi-row INSERT batches, or LOAD DATA LOCAL INFILE (server needs local_infile=ON).")
+@click.option("--batch-size", default=5000, show_default=True, help="Rows per INSERT batch.")
+@click.option("--skip-payloads", is_flag=True, help="Do not rebuild sentence_payloads.")
+@click.option("--source", type=click.Choice(sorted(SOURCE_IDS)),
+              help="Replace (or with --append, add to) this source only; all input sentences belong to it.")
+@click.option("--append", is_flag=True, help="Add to the live tables instead of replacing.")
+def ingest_command(paths, workers, method, batch_size, skip_payloads, source, append):
+    """Load the given CoNLL-U files/directories (whole corpus, or one source)."""
+    ingest(paths, workers=workers, method=method, batch_size=batch_size, payloads=not skip_payloads,
+           source=source, append=append)
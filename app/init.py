@@ -4,6 +4,16 @@ from urllib.parse import urlsplit, urlunsplit, quote
 from flask import Flask
 
 from .extensions import db, migrate
+from .query_memo import init_query_memo
+from .profiler import init_query_profiler
+from .metrics import init_metrics
+from .cache import init_result_cache
+from .versions import init_corpus_versions
+from .http_cache import init_http_cache
+from .columnar import init_columnar_index
+from .bitmap_index import init_bitmap_index
+from .concurrent_queries import init_concurrent_queries
+from .sentence_payloads import init_sentence_payloads
 
 
 def _normalize_database_url(raw_url: str) -> str:
@@ -48,14 +58,87 @@ def create_app() -> Flask:
     db.init_app(app)
     migrate.init_app(app, db)
 
+    # ---- Request-scoped query memo (counters in debug log / optional headers) ----
+    app.config["QUERY_MEMO_HEADERS"] = os.environ.get("QUERY_MEMO_HEADERS", "0") == "1"
+    init_query_memo(app)
+
+    # ---- Query profiler: Server-Timing, debug panel, slow-query log (see app/profiler.py) ----
+    app.config["QUERY_PROFILER"] = os.environ.get("QUERY_PROFILER", "0") == "1"
+    app.config["QUERY_PROFILER_PANEL"] = os.environ.get("QUERY_PROFILER_PANEL", "0") == "1"
+    app.config["QUERY_PROFILER_TOP_N"] = int(os.environ.get("QUERY_PROFILER_TOP_N", 10))
+    app.config["SLOW_QUERY_LOG"] = os.environ.get("SLOW_QUERY_LOG", "")
+    app.config["SLOW_QUERY_MS"] = float(os.environ.get("SLOW_QUERY_MS", 200))
+    init_query_profiler(app)
+
+    # ---- Prometheus /metrics (see app/metrics.py; PROMETHEUS_MULTIPROC_DIR under gunicorn) ----
+    app.config["METRICS"] = os.environ.get("METRICS", "1") == "1"
+    init_metrics(app)
+
+    # ---- Corpus / per-source version stamps (see app/versions.py) ----
+    # flask ingest bumps them; CORPUS_VERSION only serves as a manual override.
+    app.config["CORPUS_VERSION"] = os.environ.get("CORPUS_VERSION", "0")
+    app.config["CORPUS_VERSION_TTL"] = float(os.environ.get("CORPUS_VERSION_TTL", 5))
+    init_corpus_versions(app)
+
+    # ---- ETags / 304s and Cache-Control for the GET views (see app/http_cache.py) ----
+    app.config["HTTP_ETAGS"] = os.environ.get("HTTP_ETAGS", "1") == "1"
+    app.config["HTTP_CACHE_CONTROL"] = os.environ.get("HTTP_CACHE_CONTROL", "public, no-cache")
+    app.config["HTTP_CACHE_VARY"] = os.environ.get("HTTP_CACHE_VARY", "Accept-Encoding")
+    app.config["BUILD_ID"] = os.environ.get("BUILD_ID", "")
+    init_http_cache(app)
+
+    # ---- Cross-request result cache (see app/cache.py) ----
+    app.config["RESULT_CACHE_BACKEND"] = os.environ.get("RESULT_CACHE_BACKEND", "memory")
+    app.config["RESULT_CACHE_MAX_BYTES"] = int(os.environ.get("RESULT_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+    app.config["RESULT_CACHE_TTL"] = int(os.environ.get("RESULT_CACHE_TTL", 24 * 3600))
+    if os.environ.get("RESULT_CACHE_PATH"):
+        app.config["RESULT_CACHE_PATH"] = os.environ["RESULT_CACHE_PATH"]
+    init_result_cache(app)
+
+    # ---- Decoded sentence payloads kept per process (see app/sentence_payloads.py) ----
+    app.config["SENTENCE_PAYLOAD_CACHE_SIZE"] = int(os.environ.get("SENTENCE_PAYLOAD_CACHE_SIZE", 1000))
+    init_sentence_payloads(app)
+
+    # ---- Optional in-memory columnar engine (needs NumPy; see app/columnar.py) ----
+    app.config["COLUMNAR_INDEX"] = os.environ.get("COLUMNAR_INDEX", "0") == "1"
+    init_columnar_index(app)
+
+    # ---- Optional bitmap index file, built offline (needs NumPy; see app/bitmap_index.py) ----
+    app.config["BITMAP_INDEX"] = os.environ.get("BITMAP_INDEX", "")
+    init_bitmap_index(app)
+
+    # ---- Concurrent independent query families per page (see app/concurrent_queries.py) ----
+    app.config["CONCURRENT_QUERIES"] = os.environ.get("CONCURRENT_QUERIES", "0") == "1"
+    app.config["CONCURRENT_QUERIES_WORKERS"] = int(os.environ.get("CONCURRENT_QUERIES_WORKERS", 4))
+    init_concurrent_queries(app)
+
+    # ---- Verb feature dropdown counts: conjunctive | disjunctive (see app/facets.py) ----
+    app.config["FEATURE_FACETS"] = os.environ.get("FEATURE_FACETS", "conjunctive")
+
     # ---- Register route modules ----
     # IMPORTANT: your routes files must expose Blueprint objects with these exact names:
     #   routes_language.py  -> bp_language
     #   routes_translit.py  -> bp_translit
+    #   routes_api.py       -> bp_api (/api/v1 JSON endpoints)
     from .routes_language import bp_language
     from .routes_translit import bp_translit
+    from .routes_api import bp_api
 
     app.register_blueprint(bp_language)
     app.register_blueprint(bp_translit)
+    app.register_blueprint(bp_api)
+
+    # ---- CLI commands ----
+    from .summary import refresh_verb_summary_command
+    from .schema_check import check_query_plans_command
+    from .sentence_payloads import build_sentence_payloads_command
+    from .ingest import ingest_command
+    from .bitmap_index import build_bitmap_index_command
+
+    app.cli.add_command(refresh_verb_summary_command)
+    app.cli.add_command(check_query_plans_command)
+    app.cli.add_command(build_sentence_payloads_command)
+    app.cli.add_command(ingest_command)
+    app.cli.add_command(build_bitmap_index_command)
 
     return app
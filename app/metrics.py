@@ -0,0 +1,147 @@
+import os
+import time
+from contextlib import contextmanager
+
+from flask import Response, current_app, g, has_request_context, request
+
+from .profiler import add_query_observer
+
+try:
+    import prometheus_client
+    from prometheus_client import CollectorRegistry, Counter, Histogram, multiprocess
+except ImportError:  # optional dependency: no /metrics without it
+    prometheus_client = None
+
+
+# -------------------------------------------------------------------
+# Prometheus metrics (/metrics)
+# -------------------------------------------------------------------
+#   ud_val_request_seconds{endpoint,status}      request latency (until the response
+#                                                object is ready; streamed bodies excluded)
+#   ud_val_response_bytes{endpoint}              rendered payload size (non-streamed)
+#   ud_val_db_query_seconds{family}              time per statement, by query family
+#   ud_val_db_rows_total{family}                 rows fetched, by query family
+#   ud_val_result_cache_lookups_total{name,result}  result cache hits / misses
+#                                                (hit ratio: rate(result="hit") / rate(all))
+#
+# Query families group the statements of one job across views and the API:
+# facets, features, verb_list, initials, totals, paging, sentences, words,
+# arguments, switch_url (language <-> translit link mapping); anything untagged is
+# "other". Code marks a family with query_family(name) or memo_execute(...,
+# family=name); cached_result() tags its computation by result name (QUERY_FAMILIES).
+#
+# Multi-process gunicorn: set PROMETHEUS_MULTIPROC_DIR to an empty, writable
+# directory before the server starts (wipe it on every restart). Each worker then
+# writes its samples there and /metrics aggregates all workers. Add to the gunicorn
+# config:
+#
+#     from app.metrics import gunicorn_child_exit as child_exit
+QUERY_FAMILIES = {
+    'verbs_list': 'verb_list',
+    'dependency_facets': 'facets',
+    'translit_dependency_values': 'facets',
+    'api_dependency_facets': 'facets',
+    'feature_facets': 'features',
+    'initials': 'initials',
+    'total_sentence_count': 'totals',
+}
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+BYTES_BUCKETS = tuple(1024 * 4 ** i for i in range(9))  # 1 KiB .. 64 MiB
+
+if prometheus_client is not None:
+    REQUEST_SECONDS = Histogram(
+        'ud_val_request_seconds', 'Request latency by endpoint.',
+        ['endpoint', 'status'], buckets=LATENCY_BUCKETS,
+    )
+    RESPONSE_BYTES = Histogram(
+        'ud_val_response_bytes', 'Rendered response size by endpoint.',
+        ['endpoint'], buckets=BYTES_BUCKETS,
+    )
+    DB_QUERY_SECONDS = Histogram(
+        'ud_val_db_query_seconds', 'Database time per statement by query family.',
+        ['family'], buckets=QUERY_BUCKETS,
+    )
+    DB_ROWS = Counter('ud_val_db_rows', 'Rows fetched by query family.', ['family'])
+    RESULT_CACHE_LOOKUPS = Counter(
+        'ud_val_result_cache_lookups', 'Result cache lookups by result name.', ['name', 'result'],
+    )
+
+
+def _enabled():
+    return prometheus_client is not None and current_app.config.get('METRICS')
+
+
+@contextmanager
+def query_family(name):
+    """Time the statements run inside under query family name (None: no change)."""
+    if name is None or not has_request_context():
+        yield
+        return
+    previous = g.get('query_family')
+    g.query_family = QUERY_FAMILIES.get(name, name)
+    try:
+        yield
+    finally:
+        g.query_family = previous
+
+
+def count_cache_lookup(name, hit):
+    if has_request_context() and _enabled():
+        RESULT_CACHE_LOOKUPS.labels(name, 'hit' if hit else 'miss').inc()
+
+
+def _observe_query(ms, statement, parameters, executemany, rows):
+    if not has_request_context():
+        return  # CLI commands (ingest, rebuilds) are not part of the serving metrics
+    family = g.get('query_family') or 'other'
+    DB_QUERY_SECONDS.labels(family).observe(ms / 1000)
+    if rows:
+        DB_ROWS.labels(family).inc(rows)
+
+
+def metrics_view():
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return Response(prometheus_client.generate_latest(registry), mimetype=prometheus_client.CONTENT_TYPE_LATEST)
+
+
+def gunicorn_child_exit(server, worker):
+    """gunicorn child_exit hook: retire a dead worker's multiprocess files."""
+    if prometheus_client is not None and os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def init_metrics(app):
+    """METRICS enables /metrics and the collectors (needs prometheus-client)."""
+    app.config.setdefault('METRICS', True)
+    if not app.config['METRICS']:
+        return
+    if prometheus_client is None:
+        app.logger.warning("METRICS is set but prometheus-client is not installed; /metrics disabled.")
+        app.config['METRICS'] = False
+        return
+
+    add_query_observer(app, _observe_query)
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
+
+    @app.before_request
+    def _start_request_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _observe_request(response):
+        started = g.get('metrics_started')
+        if started is None:
+            return response
+        endpoint = request.endpoint or 'unmatched'
+        if endpoint == 'metrics':
+            return response
+        REQUEST_SECONDS.labels(endpoint, str(response.status_code)).observe(time.perf_counter() - started)
+        if not response.is_streamed:
+            RESPONSE_BYTES.labels(endpoint).observe(response.calculate_content_length() or 0)
+        return response
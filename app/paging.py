@@ -0,0 +1,161 @@
+import base64
+import hashlib
+import json
+
+from sqlalchemy import text
+
+from .query_memo import memo_execute
+
+
+# -------------------------------------------------------------------
+# Occurrence-windowed paging for the selected-verb sentence view
+# -------------------------------------------------------------------
+# A page covers a fixed window of selected-verb occurrences. Sentences are ordered
+# by sent_id and a sentence belongs to every window its hits intersect, so a
+# sentence straddling a boundary appears on both pages.
+#
+# The window is cut in SQL with a running SUM() OVER (ORDER BY sent_id). The
+# "next" link carries an opaque keyset cursor (last fully consumed sent_id +
+# cumulative hit count at that point), so following it seeks past the consumed
+# sentences instead of re-aggregating them. The cursor is tied to the filters and
+# to the data version it was issued under (app/versions.py), so a cursor from
+# before an ingest recomputes instead of seeking with stale totals.
+
+
+def _filter_fingerprint(where_clause, params, version=None):
+    """Short digest tying a cursor to the filter set and data version it was produced for."""
+    payload = json.dumps([where_clause, sorted((k, repr(v)) for k, v in params.items()), version])
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+
+def encode_page_cursor(state):
+    raw = json.dumps(state, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_page_cursor(cursor):
+    """Return the cursor dict, or None for a missing/garbled cursor."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        state = json.loads(raw.decode('utf-8'))
+    except (ValueError, UnicodeDecodeError):
+        return None
+    return state if isinstance(state, dict) else None
+
+
+def occurrence_page(joins, conditions, params, *, page, page_size, cursor=None, version=None):
+    """
+    Compute totals and the sent_ids of one occurrence window.
+
+    joins/conditions/params define the filtered sentence set over
+    "FROM sentences s" (see _build_sentence_where_for_selected_verb).
+
+    Returns:
+      total_sentences, total_tokens, prev_tokens_cum, page_sent_ids,
+      page_token_total, next_cursor
+
+    A cursor is only honoured if it was issued for the same filters, the same data
+    version (spec_version() of the view's spec) and the requested page; otherwise
+    the window is computed from the start.
+    """
+    where_clause = " AND ".join(conditions) if conditions else "1=1"
+    fingerprint = _filter_fingerprint(where_clause, params, version)
+
+    token_offset = max(0, (page - 1) * page_size)
+    window_end = token_offset + page_size
+
+    state = decode_page_cursor(cursor)
+    if not state or state.get('f') != fingerprint or state.get('o') != token_offset:
+        state = None
+
+    # 1) Totals (carried in the cursor when seeking, they never change between pages)
+    if state:
+        total_sentences = int(state.get('ts') or 0)
+        total_tokens = int(state.get('tt') or 0)
+    else:
+        q_totals = f"""
+            WITH filtered AS (
+              SELECT s.sent_id AS sent_id,
+                     COUNT(DISTINCT v.token_id) AS token_hits
+              FROM sentences s
+              {joins}
+              WHERE {where_clause}
+              GROUP BY s.sent_id
+            )
+            SELECT COUNT(*) AS total_sentences,
+                   COALESCE(SUM(token_hits), 0) AS total_tokens
+            FROM filtered
+        """
+        row = memo_execute(text(q_totals), params, family='totals').fetchone()
+        total_sentences = int(row.total_sentences or 0) if row else 0
+        total_tokens = int(row.total_tokens or 0) if row else 0
+
+    if token_offset >= total_tokens:
+        return total_sentences, total_tokens, token_offset, [], 0, None
+
+    # 2) Window rows: running hit sum in SQL, optionally seeking past the cursor
+    page_params = dict(params)
+    page_params.update({
+        '__cum_base': int(state['c']) if state else 0,
+        '__token_offset': token_offset,
+        '__window_end': window_end,
+        '__page_limit': page_size,
+    })
+    seek = ""
+    if state and state.get('a') is not None:
+        seek = " AND s.sent_id > :__after_sent_id"
+        page_params['__after_sent_id'] = state['a']
+
+    q_rows = f"""
+        WITH filtered AS (
+          SELECT s.sent_id AS sent_id,
+                 COUNT(DISTINCT v.token_id) AS token_hits
+          FROM sentences s
+          {joins}
+          WHERE {where_clause}{seek}
+          GROUP BY s.sent_id
+        ),
+        running AS (
+          SELECT sent_id, token_hits,
+                 :__cum_base + SUM(token_hits) OVER (
+                     ORDER BY sent_id ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+                 ) AS cum_end
+          FROM filtered
+        )
+        SELECT sent_id, token_hits, cum_end
+        FROM running
+        WHERE cum_end > :__token_offset
+          AND cum_end - token_hits < :__window_end
+        ORDER BY sent_id
+        LIMIT :__page_limit
+    """
+    rows = memo_execute(text(q_rows), page_params, family='paging').fetchall()
+
+    # 3) Page totals + next cursor (last sentence fully consumed by this window)
+    page_sent_ids = []
+    page_token_total = 0
+    after = state.get('a') if state else None
+    cum = int(state['c']) if state else 0
+
+    for r in rows:
+        hits = int(r.token_hits or 0)
+        cum_end = int(r.cum_end)
+        page_sent_ids.append(r.sent_id)
+        page_token_total += min(hits, window_end - (cum_end - hits))
+        if cum_end <= window_end:
+            after, cum = r.sent_id, cum_end
+
+    next_cursor = None
+    if token_offset + page_token_total < total_tokens:
+        next_cursor = encode_page_cursor({
+            'a': after,
+            'c': cum,
+            'o': window_end,
+            'ts': total_sentences,
+            'tt': total_tokens,
+            'f': fingerprint,
+        })
+
+    return total_sentences, total_tokens, token_offset, page_sent_ids, page_token_total, next_cursor
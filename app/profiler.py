@@ -0,0 +1,237 @@
+import heapq
+import json
+import logging
+import logging.handlers
+import re
+import threading
+import time
+
+from flask import current_app, g, has_request_context, request
+from markupsafe import escape
+from sqlalchemy import event
+
+from .extensions import db
+
+
+# -------------------------------------------------------------------
+# Per-request query profiler and slow-query log
+# -------------------------------------------------------------------
+# Cursor events on the db engine time every statement a request executes (memo
+# replays never reach the cursor, so they cost nothing and are not counted). Per
+# request it keeps the query count, total DB time, rows returned and the
+# QUERY_PROFILER_TOP_N slowest statements with their bound parameters.
+# Rows are the driver's cursor.rowcount: what pymysql's buffered cursor fetched;
+# unknown (not counted) for the server-side cursors of the exports.
+#
+# Surfaced as:
+#   - Server-Timing: db;dur=..;desc="N queries, M rows", app;dur=..
+#     (QUERY_PROFILER; shows up in the browser devtools' timing tab)
+#   - a table of the slowest statements appended to HTML pages
+#     (QUERY_PROFILER_PANEL; such pages get no ETag and Cache-Control: no-store)
+#   - one JSON line per statement slower than SLOW_QUERY_MS in SLOW_QUERY_LOG,
+#     rotated at SLOW_QUERY_LOG_BYTES with SLOW_QUERY_LOG_BACKUPS old files
+#     (also for statements outside requests, e.g. CLI commands)
+#
+# Everything is off by default; with all three off (and no metrics, see
+# app/metrics.py) no listener is installed.
+PROFILE_STATEMENT_CHARS = 2000  # longer statements are truncated in the panel/log
+
+_WS_RE = re.compile(r"\s+")
+
+slow_query_logger = logging.getLogger('ud_val.slow_queries')
+
+
+class QueryProfile:
+    """Counters of one request."""
+
+    def __init__(self, top_n):
+        self.started = time.perf_counter()
+        self.top_n = top_n
+        self.count = 0
+        self.total_ms = 0.0
+        self.rows = 0
+        self._slowest = []  # min-heap of (ms, seq, statement, params)
+        self._lock = threading.Lock()  # concurrent query families record into one profile
+
+    def record(self, ms, statement, params, rows):
+        with self._lock:
+            self.count += 1
+            self.total_ms += ms
+            if rows is not None and rows > 0:
+                self.rows += rows
+            entry = (ms, self.count, statement, params)
+            if len(self._slowest) < self.top_n:
+                heapq.heappush(self._slowest, entry)
+            elif ms > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def slowest(self):
+        """[(ms, statement, params)] slowest first."""
+        return [(ms, statement, params) for ms, _, statement, params in sorted(self._slowest, reverse=True)]
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+
+def current_profile():
+    """The QueryProfile of the current request, or None (profiling off / no request)."""
+    if not has_request_context():
+        return None
+    return g.get('query_profile')
+
+
+def _statement_text(statement):
+    statement = _WS_RE.sub(" ", statement).strip()
+    if len(statement) > PROFILE_STATEMENT_CHARS:
+        statement = statement[:PROFILE_STATEMENT_CHARS] + '...'
+    return statement
+
+
+def _params_summary(parameters, executemany):
+    if executemany:
+        return {'executemany': len(parameters)}
+    return parameters
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+def _after_cursor_listener(observers):
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        ms = (time.perf_counter() - conn.info['query_started'].pop()) * 1000
+        rows = cursor.rowcount if cursor.rowcount is not None and cursor.rowcount >= 0 else None
+        for observer in observers:
+            observer(ms, statement, parameters, executemany, rows)
+    return _after_cursor_execute
+
+
+def add_query_observer(app, observer):
+    """
+    Call observer(ms, statement, parameters, executemany, rows) after every
+    statement on app's engine. The cursor listeners are installed with the first
+    observer; app/metrics.py shares them.
+    """
+    observers = app.extensions.get('query_observers')
+    if observers is None:
+        observers = app.extensions['query_observers'] = []
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_listener(observers))
+    observers.append(observer)
+
+
+def _log_slow_query(ms, statement, params, rows):
+    slow_query_logger.info(json.dumps({
+        'ts': round(time.time(), 3),
+        'ms': round(ms, 2),
+        'rows': rows,
+        'endpoint': request.endpoint if has_request_context() else None,
+        'url': request.full_path if has_request_context() else None,
+        'statement': statement,
+        'params': params,
+    }, ensure_ascii=False, default=str))
+
+
+def profile_observer(slow_ms):
+    """Query observer feeding the request's QueryProfile; slow_ms=None: no slow-query log."""
+    def observe(ms, statement, parameters, executemany, rows):
+        profile = current_profile()
+        slow = slow_ms is not None and ms >= slow_ms
+        if profile is None and not slow:
+            return
+
+        statement = _statement_text(statement)
+        params = _params_summary(parameters, executemany)
+        if profile is not None:
+            profile.record(ms, statement, params, rows)
+        if slow:
+            _log_slow_query(ms, statement, params, rows)
+    return observe
+
+
+def server_timing(profile):
+    return (
+        f'db;dur={profile.total_ms:.1f};desc="{profile.count} queries, {profile.rows} rows", '
+        f'app;dur={profile.elapsed_ms():.1f}'
+    )
+
+
+def render_panel(profile):
+    """HTML table of the request's counters and slowest statements."""
+    rows = ''.join(
+        f"<tr><td style=\"text-align:right; vertical-align:top; padding-right:8px;\">{ms:.1f}&nbsp;ms</td>"
+        f"<td><code>{escape(statement)}</code><br><small>{escape(json.dumps(params, ensure_ascii=False, default=str))}</small></td></tr>"
+        for ms, statement, params in profile.slowest()
+    )
+    return (
+        '<div id="query-profile" style="margin:20px; padding:10px; border-top:1px solid #ccc; font-size:0.8em;">'
+        f"<strong>{profile.count} queries, {profile.total_ms:.1f} ms in the database, "
+        f"{profile.rows} rows; {profile.elapsed_ms():.1f} ms total</strong>"
+        f"<table>{rows}</table></div>"
+    )
+
+
+def _install_slow_query_log(app):
+    handler = logging.handlers.RotatingFileHandler(
+        app.config['SLOW_QUERY_LOG'],
+        maxBytes=int(app.config['SLOW_QUERY_LOG_BYTES']),
+        backupCount=int(app.config['SLOW_QUERY_LOG_BACKUPS']),
+        encoding='utf-8',
+    )
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    slow_query_logger.addHandler(handler)
+    slow_query_logger.setLevel(logging.INFO)
+    slow_query_logger.propagate = False
+
+
+def init_query_profiler(app):
+    """
+    QUERY_PROFILER: Server-Timing header; QUERY_PROFILER_PANEL: in-page table of
+    the QUERY_PROFILER_TOP_N slowest statements; SLOW_QUERY_LOG: JSONL path of the
+    slow-query log (statements taking SLOW_QUERY_MS or more).
+    """
+    app.config.setdefault('QUERY_PROFILER', False)
+    app.config.setdefault('QUERY_PROFILER_PANEL', False)
+    app.config.setdefault('QUERY_PROFILER_TOP_N', 10)
+    app.config.setdefault('SLOW_QUERY_LOG', '')
+    app.config.setdefault('SLOW_QUERY_MS', 200)
+    app.config.setdefault('SLOW_QUERY_LOG_BYTES', 10 * 1024 * 1024)
+    app.config.setdefault('SLOW_QUERY_LOG_BACKUPS', 5)
+
+    profiling = app.config['QUERY_PROFILER'] or app.config['QUERY_PROFILER_PANEL']
+    if not profiling and not app.config['SLOW_QUERY_LOG']:
+        return
+
+    slow_ms = None
+    if app.config['SLOW_QUERY_LOG']:
+        _install_slow_query_log(app)
+        slow_ms = float(app.config['SLOW_QUERY_MS'])
+    add_query_observer(app, profile_observer(slow_ms))
+    if not profiling:
+        return
+
+    @app.before_request
+    def _start_query_profile():
+        g.query_profile = QueryProfile(int(current_app.config['QUERY_PROFILER_TOP_N']))
+
+    @app.after_request
+    def _report_query_profile(response):
+        profile = g.get('query_profile')
+        if profile is None:
+            return response
+
+        config = current_app.config
+        if config['QUERY_PROFILER']:
+            response.headers['Server-Timing'] = server_timing(profile)
+        if (config['QUERY_PROFILER_PANEL'] and response.status_code == 200
+                and response.mimetype == 'text/html' and not response.is_streamed):
+            body = response.get_data(as_text=True)
+            marker = body.rfind('</body>')
+            if marker != -1:
+                response.set_data(body[:marker] + render_panel(profile) + body[marker:])
+                # The panel differs on every request: not a cacheable representation.
+                response.headers.pop('ETag', None)
+                response.headers['Cache-Control'] = 'no-store'
+        return response
@@ -1,5 +1,5 @@
 from sqlalchemy import text, bindparam
-from .extensions import db
+from .query_memo import memo_execute
 
 
 def _fetch_translit_for_arg_lemmas(lemmas, *, vlemma=None, vgloss=None):
@@ -32,7 +32,7 @@ def _fetch_translit_for_arg_lemmas(lemmas, *, vlemma=None, vgloss=None):
         """
     ).bindparams(bindparam("L", expanding=True))
 
-    rows = db.session.execute(q, params).fetchall()
+    rows = memo_execute(q, params, family='switch_url').fetchall()
     return {r.lemma: r.translit_lemma for r in rows if r.translit_lemma}
 
 
@@ -68,7 +68,7 @@ def _fetch_translit_for_dep_bits(dep_bits, *, vlemma=None, vgloss=None):
         """
     ).bindparams(bindparam("L", expanding=True))
 
-    rows = db.session.execute(q, params).fetchall()
+    rows = memo_execute(q, params, family='switch_url').fetchall()
     return {r.dep_bit_arm: r.translit_dep_lemma for r in rows if r.translit_dep_lemma}
 
 
@@ -102,7 +102,7 @@ def _fetch_arm_for_arg_tlemmas(tlemmas, *, vlemma=None, vgloss=None):
         """
     ).bindparams(bindparam("L", expanding=True))
 
-    rows = db.session.execute(q, params).fetchall()
+    rows = memo_execute(q, params, family='switch_url').fetchall()
     return {r.translit_lemma: r.lemma for r in rows if r.lemma}
 
 
@@ -138,7 +138,7 @@ def _fetch_arm_for_dep_tbits(tbits, *, vlemma=None, vgloss=None):
         """
     ).bindparams(bindparam("L", expanding=True))
 
-    rows = db.session.execute(q, params).fetchall()
+    rows = memo_execute(q, params, family='switch_url').fetchall()
     return {r.translit_dep_lemma: r.dep_bit_arm for r in rows if r.dep_bit_arm}
 
 
@@ -179,7 +179,7 @@ def _fetch_case_values_for_tbits(tbits, *, dep_rel=None, tlemma=None, vlemma=Non
         """
     ).bindparams(bindparam("L", expanding=True))
 
-    rows = db.session.execute(q, params).fetchall()
+    rows = memo_execute(q, params, family='switch_url').fetchall()
     out = {}
     for r in rows:
         out.setdefault(r.translit_dep_lemma, set()).add(r.case_value)
@@ -223,7 +223,7 @@ def _fetch_tbits_from_full_case_values(case_values, *, dep_rel=None, tlemma=None
         """
     ).bindparams(bindparam("L", expanding=True))
 
-    rows = db.session.execute(q, params).fetchall()
+    rows = memo_execute(q, params, family='switch_url').fetchall()
     out = {}
     for r in rows:
         if r.translit_dep_lemma:
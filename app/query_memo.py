@@ -0,0 +1,173 @@
+import re
+import threading
+
+from flask import current_app, g, has_request_context
+
+from .extensions import db
+from .metrics import query_family
+
+
+# -------------------------------------------------------------------
+# Request-scoped query memo
+# -------------------------------------------------------------------
+# One page render issues many read-only queries, and several helpers ask the same
+# question more than once (e.g. the selected verb's row, translit lookups for the
+# switch link). memo_execute() runs each distinct (SQL, params) pair once per request
+# and replays the fetched rows afterwards. The memo lives on flask.g, so it never
+# outlives the request and never sees another user's data.
+#
+# Only use it for SELECTs: results are materialized eagerly.
+#
+# With concurrent query families (app/concurrent_queries.py) the memo and its
+# counters are shared by several threads of one request. QueryFanout then puts a
+# lock on flask.g (query_memo_lock): the memo and counters are only touched under
+# it, and a statement already running in another thread is waited for instead of
+# being executed a second time.
+
+_WS_RE = re.compile(r"\s+")
+
+
+class MemoResult:
+    """Materialized rows with the subset of the Result API the views use."""
+
+    def __init__(self, rows):
+        self._rows = rows
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    first = fetchone
+
+    def scalar(self):
+        row = self.fetchone()
+        return row[0] if row is not None else None
+
+    def __iter__(self):
+        return iter(self._rows)
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_freeze(v) for v in value]
+        return tuple(sorted(items, key=repr)) if isinstance(value, (set, frozenset)) else tuple(items)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def memo_key(statement, params=None):
+    """Whitespace-normalized SQL + frozen params."""
+    sql = _WS_RE.sub(" ", str(statement)).strip()
+    return sql, _freeze(params or {})
+
+
+def query_stats():
+    """Per-request counters: {'executed': n, 'deduplicated': m}."""
+    if not has_request_context():
+        return {'executed': 0, 'deduplicated': 0}
+    stats = g.get('query_memo_stats')
+    if stats is None:
+        stats = g.query_memo_stats = {'executed': 0, 'deduplicated': 0}
+    return stats
+
+
+class _InFlight:
+    """Memo placeholder of a statement another thread of the request is executing."""
+
+    __slots__ = ('done', 'rows')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.rows = None  # stays None if the statement failed
+
+
+def memo_execute(statement, params=None, *, family=None):
+    """
+    db.session.execute() + fetchall(), memoized for the current request.
+    family names the query family the statement is timed under (app/metrics.py).
+
+    Outside a request (CLI commands) this simply executes the statement.
+    """
+    if not has_request_context():
+        return MemoResult(db.session.execute(statement, params or {}).fetchall())
+
+    memo = g.get('query_memo')
+    if memo is None:
+        memo = g.query_memo = {}
+    stats = query_stats()
+
+    key = memo_key(statement, params)
+    lock = g.get('query_memo_lock')
+    if lock is not None:
+        return _shared_memo_execute(statement, params, family, key, memo, stats, lock)
+
+    rows = memo.get(key)
+    if rows is not None:
+        stats['deduplicated'] += 1
+        return MemoResult(rows)
+
+    with query_family(family):
+        rows = db.session.execute(statement, params or {}).fetchall()
+    memo[key] = rows
+    stats['executed'] += 1
+    return MemoResult(rows)
+
+
+def _shared_memo_execute(statement, params, family, key, memo, stats, lock):
+    """memo_execute() for a memo shared between threads (see the module comment)."""
+    while True:
+        with lock:
+            entry = memo.get(key)
+            if entry is None:
+                flight = memo[key] = _InFlight()
+                break
+            if entry.__class__ is not _InFlight:
+                stats['deduplicated'] += 1
+                return MemoResult(entry)
+        entry.done.wait()
+        if entry.rows is not None:
+            with lock:
+                stats['deduplicated'] += 1
+            return MemoResult(entry.rows)
+        # The other thread failed: try again (and raise our own error if it fails).
+
+    try:
+        with query_family(family):
+            rows = db.session.execute(statement, params or {}).fetchall()
+    except BaseException:
+        with lock:
+            del memo[key]
+        flight.done.set()
+        raise
+    with lock:
+        memo[key] = rows
+        stats['executed'] += 1
+    flight.rows = rows
+    flight.done.set()
+    return MemoResult(rows)
+
+
+def init_query_memo(app):
+    """
+    Log the per-request counters at DEBUG level; with QUERY_MEMO_HEADERS enabled
+    also expose them as X-Query-Count / X-Query-Deduplicated response headers.
+    """
+    app.config.setdefault('QUERY_MEMO_HEADERS', False)
+
+    @app.after_request
+    def _report_query_memo(response):
+        stats = g.get('query_memo_stats')
+        if stats is None:
+            return response
+
+        current_app.logger.debug(
+            "queries: %d executed, %d deduplicated",
+            stats['executed'], stats['deduplicated'],
+        )
+        if current_app.config['QUERY_MEMO_HEADERS']:
+            response.headers['X-Query-Count'] = str(stats['executed'])
+            response.headers['X-Query-Deduplicated'] = str(stats['deduplicated'])
+        return response
@@ -0,0 +1,387 @@
+import json
+from collections import defaultdict
+from urllib.parse import quote
+
+from flask import Blueprint, Response, abort, jsonify, request, stream_with_context
+from sqlalchemy import text
+
+from .bitmap_index import bitmap_engine
+from .cache import cached_result
+from .columnar import columnar_index
+from .export import EXPORT_FORMATS, export_chunks
+from .facets import (
+    FEATURE_FACET_MODES,
+    LANGUAGE_DEPENDENCY_COLUMNS,
+    TRANSLIT_DEPENDENCY_COLUMNS,
+    dependency_facet_prefilter,
+    feature_facet_counts,
+    fold_dependency_facets,
+)
+from .filter_spec import MAX_DEPENDENCIES, SCRIPTS, FilterSpec, order_initials
+from .http_cache import conditional_get
+from .paging import occurrence_page
+from .query_memo import memo_execute
+from .sentence_payloads import brat_data, overlay_sentence, sentence_payloads
+from .versions import spec_version
+
+
+# -------------------------------------------------------------------
+# Versioned JSON API (/api/v1/<script>/...)
+# -------------------------------------------------------------------
+# The same data the HTML views render, one panel per endpoint, so a client can
+# refresh only what changed. Everything is driven by the query string (same
+# argument names as the HTML pages, no session state):
+#
+#   GET /api/v1/<script>/verbs      verbs with frequencies (sort, order)
+#   GET /api/v1/<script>/facets     dependency dropdown options (level=1..N, default all)
+#   GET /api/v1/<script>/features   verb feature values (counts=1: [value, occurrences]
+#                                   pairs; facets=conjunctive|disjunctive, see app/facets.py)
+#   GET /api/v1/<script>/initials   initials under the filters
+#   GET /api/v1/<script>/sentences  one occurrence page of the selected verb (page, cursor)
+#   GET /api/v1/<script>/export     every matching occurrence as a download
+#                                   (format=tsv|jsonl|conllu, gzip=1; see app/export.py)
+#
+# <script> is "language" or "translit". verbs and sentences stream as NDJSON with
+# ?format=ndjson (or Accept: application/x-ndjson): a header object first, then one
+# object per verb / sentence.
+#
+# Results go through the same result cache / bitmap index / columnar engine as
+# the HTML views (verbs_list, initials and feature_facets entries are shared with
+# them). All endpoints but export carry ETags and answer If-None-Match with 304
+# (see app/http_cache.py).
+
+bp_api = Blueprint('api_v1', __name__, url_prefix='/api/v1')
+
+SCRIPT_ROUTE = '<any(language, translit):script>'
+
+PAGE_TOKEN_SIZE = 50  # selected-verb occurrences per sentences page (as the HTML views)
+
+# Per-script differences of the HTML views the API mirrors.
+SCRIPT_VIEWS = {
+    'language': {
+        'search_arg': 'language_search_query',
+        'verb_column': 'lemma',
+        'dependency_columns': LANGUAGE_DEPENDENCY_COLUMNS,
+        'list_sense': 'verb',                 # the list groups senses
+        'panel_search_with_verb': False,      # dropdowns ignore searches once a verb is selected
+    },
+    'translit': {
+        'search_arg': 'translit_search_query',
+        'verb_column': 'translit_verb',
+        'dependency_columns': TRANSLIT_DEPENDENCY_COLUMNS,
+        'list_sense': 'verb+gloss',
+        'panel_search_with_verb': True,
+    },
+}
+
+
+def request_spec(script):
+    """FilterSpec of the current request's query string."""
+    args = request.args
+    return FilterSpec.from_request(
+        args,
+        script=script,
+        selected_sources=args.getlist('selected_source'),
+        source_submitted='source_checkbox_submitted' in args,
+        initial_letter=args.get('initial', ''),
+        search_query=args.get(SCRIPT_VIEWS[script]['search_arg'], ''),
+        english_search_query=args.get('english_search_query', ''),
+        selected_verb=args.get('selected_verb') or None,
+        selected_verb_gloss=args.get('selected_verb_gloss') or None,
+    )
+
+
+def _panel_search(spec):
+    return SCRIPT_VIEWS[spec.script]['panel_search_with_verb'] or spec.selected_verb is None
+
+
+def _int_arg(name, default, *, minimum=1, maximum=None):
+    try:
+        value = max(minimum, int(request.args.get(name, default)))
+    except (TypeError, ValueError):
+        abort(400, description=f"{name} must be an integer")
+    return min(value, maximum) if maximum else value
+
+
+def wants_ndjson():
+    if request.args.get('format') == 'ndjson':
+        return True
+    best = request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson'])
+    return best == 'application/x-ndjson'
+
+
+def ndjson_response(header, items):
+    """Stream header, then each item, as one JSON document per line."""
+    def generate():
+        yield json.dumps(header, ensure_ascii=False) + '\n'
+        for item in items:
+            yield json.dumps(item, ensure_ascii=False) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+# -------------------------------------------------------------------
+# Queries (mirror the HTML views' statements)
+# -------------------------------------------------------------------
+def query_verbs(spec, sort_order, order_direction):
+    """[(verb, gloss, frequency)] as the verbs list of the HTML view."""
+    cfg = SCRIPT_VIEWS[spec.script]
+    corpus_index = bitmap_engine(spec) or columnar_index(spec)
+    if corpus_index is not None:
+        return corpus_index.verbs_list(spec, sort_order, order_direction, sense=cfg['list_sense'])
+
+    joins, conditions, params = spec.compile('verbs', sense=cfg['list_sense'])
+    if spec.has_dependency_filters():
+        from_clause = "FROM verbs"
+        frequency = "COUNT(DISTINCT verbs.token_id, verbs.sent_id)"
+    else:
+        from_clause = "FROM verb_frequencies verbs"
+        frequency = "CAST(SUM(verbs.occurrences) AS UNSIGNED)"
+
+    verb = f"verbs.{cfg['verb_column']}"
+    direction = 'ASC' if order_direction == 'asc' else 'DESC'
+    order_by = f"frequency {direction}" if sort_order == 'frequency' else f"{verb} {direction}"
+    query = f"""
+        SELECT {verb}, verbs.gloss, {frequency} AS frequency
+        {from_clause}
+        {joins}
+        WHERE {' AND '.join(conditions) if conditions else '1=1'}
+        GROUP BY {verb}, verbs.gloss
+        ORDER BY {order_by}
+    """
+    return memo_execute(text(query), params).fetchall()
+
+
+def query_facets(spec, level):
+    """{key: sorted options} of dependency block `level` (0-based)."""
+    columns = SCRIPT_VIEWS[spec.script]['dependency_columns']
+    current_dep = spec.dependencies[level]
+    search = _panel_search(spec)
+
+    corpus_index = columnar_index(spec)
+    if corpus_index is not None:
+        rows = corpus_index.dependency_rows(spec, level, search=search)
+    else:
+        joins, conditions, params = spec.compile('v', open_level=level, search=search)
+        alias = f"a{level}"
+        prefilter, prefilter_params = dependency_facet_prefilter(current_dep, alias, columns)
+        if prefilter:
+            conditions.append(prefilter)
+            params.update(prefilter_params)
+        select = ', '.join(f"{alias}.{column}" for _, column in columns)
+        rows = memo_execute(text(f"""
+            SELECT DISTINCT {select}
+            FROM verbs v
+            {joins}
+            WHERE {' AND '.join(conditions) if conditions else '1=1'}
+        """), params).fetchall()
+
+    folded = fold_dependency_facets(rows, current_dep, columns)
+    return {
+        key: sorted(value for value in folded[column] if value is not None)
+        for key, column in columns
+    }
+
+
+def query_initials(spec):
+    """
+    Initials of the verbs under the filters (stored; translit: longest multigraph,
+    canonical order). As the views' letter bar: once a verb is selected the initial
+    and the searches no longer narrow it.
+    """
+    selected = spec.selected_verb is not None
+    spec = spec.with_(initial_letter='' if selected else spec.initial_letter)
+    flags = dict(initial='always', search=not selected, sense=None)
+
+    corpus_index = bitmap_engine(spec) or columnar_index(spec)
+    if corpus_index is not None:
+        initials = corpus_index.verb_values(spec, column='initial', **flags)
+    else:
+        joins, conditions, params = spec.compile('verbs', **flags)
+        initials = [row[0] for row in memo_execute(text(f"""
+            SELECT DISTINCT verbs.{SCRIPTS[spec.script]['initial_column']}
+            FROM verbs
+            {joins}
+            WHERE {' AND '.join(conditions) if conditions else '1=1'}
+        """), params)]
+    return order_initials(spec.script, initials)
+
+
+def query_sentences(spec, page, cursor):
+    """(page info dict, [sentence dicts]) of one selected-verb occurrence page."""
+    joins, conditions, params = spec.compile(
+        'v', dependency_join='LEFT JOIN', initial=None, search=False, source_alias='s'
+    )
+    joins = "JOIN verbs v ON s.sent_id = v.sent_id\n" + joins
+
+    (total_sentences, total_tokens, prev_tokens_cum,
+     page_sent_ids, page_token_total, next_cursor) = occurrence_page(
+        joins, conditions, params, page=page, page_size=PAGE_TOKEN_SIZE, cursor=cursor,
+        version=spec_version(spec),
+    )
+    info = {
+        'total_sentences': total_sentences,
+        'total_occurrences': total_tokens,
+        'page': page,
+        'occurrence_start': prev_tokens_cum + 1 if page_token_total else 0,
+        'occurrence_end': prev_tokens_cum + page_token_total,
+        'next_cursor': next_cursor,
+    }
+    if not page_sent_ids:
+        return info, []
+
+    page_ids = tuple(page_sent_ids)
+    headers = memo_execute(text("""
+        SELECT s.sent_id, s.transliterated_text AS text, s.translated_text
+        FROM sentences s
+        WHERE s.sent_id IN :page_ids
+        ORDER BY s.sent_id
+    """), {'page_ids': page_ids}, family='sentences').fetchall()
+
+    verb_params = dict(params, page_ids=page_ids)
+    verb_tokens = defaultdict(list)
+    for token_id, sent_id in memo_execute(text(f"""
+        SELECT DISTINCT v.token_id, v.sent_id
+        FROM sentences s
+        {joins}
+        WHERE {' AND '.join(conditions + ['s.sent_id IN :page_ids'])}
+    """), verb_params, family='sentences'):
+        verb_tokens[sent_id].append(int(token_id))
+
+    args_by_sent = defaultdict(list)
+    for arg in memo_execute(text("""
+        SELECT a.sent_id, a.head_id, a.token_id, a.dep_rel, a.cdep_token_id, a.second_cdep_token_id, a.fdep_token_id
+        FROM arguments a
+        WHERE a.sent_id IN :page_ids
+    """), {'page_ids': page_ids}, family='arguments'):
+        args_by_sent[arg.sent_id].append(arg)
+
+    payloads = sentence_payloads(page_ids, spec.script)
+    sentences = []
+    for sent_id, text_val, translated_text in headers:
+        payload = payloads.get(sent_id)
+        selected_token_ids = verb_tokens.get(sent_id)
+        if payload is None or not selected_token_ids:
+            continue
+        original_words, merged_words, relations = overlay_sentence(
+            payload, selected_token_ids, args_by_sent.get(sent_id, []), spec.script
+        )
+        sentences.append({
+            'sent_id': sent_id,
+            'text': text_val,
+            'translated_text': translated_text,
+            'words': [
+                {
+                    'token_id': word['token_id'],
+                    'form': word['form'],
+                    'tooltip': word['gloss'],
+                    'pos': word['pos'],
+                    'is_selected_verb': word['is_selected_verb'],
+                    'is_argument': word['is_argument'],
+                    'is_case_dependent': word['is_case_dependent'],
+                    'is_fixed_dependent': word['is_fixed_dependent'],
+                }
+                for word in merged_words
+            ],
+            'relations': relations,
+            'brat_data': brat_data(payload, original_words, relations),
+        })
+    return info, sentences
+
+
+# -------------------------------------------------------------------
+# Endpoints
+# -------------------------------------------------------------------
+@bp_api.route(f'/{SCRIPT_ROUTE}/verbs', methods=['GET'])
+@conditional_get(vary=('Accept',))
+def api_verbs(script):
+    spec = request_spec(script)
+    sort_order = request.args.get('sort', 'alphabetical')
+    order_direction = request.args.get('order', 'asc')
+
+    rows = cached_result(
+        'verbs_list', spec,
+        lambda: [tuple(row) for row in query_verbs(spec, sort_order, order_direction)],
+        sort_order, order_direction,
+    )
+    header = {
+        'verb_count': len(rows),
+        'occurrence_count': sum(int(row[2]) for row in rows),
+    }
+    verbs = ({'verb': row[0], 'gloss': row[1], 'frequency': int(row[2])} for row in rows)
+
+    if wants_ndjson():
+        return ndjson_response(header, verbs)
+    return jsonify(dict(header, verbs=list(verbs)))
+
+
+@bp_api.route(f'/{SCRIPT_ROUTE}/facets', methods=['GET'])
+@conditional_get()
+def api_facets(script):
+    spec = request_spec(script)
+    if 'level' in request.args:
+        levels = [_int_arg('level', 1, maximum=MAX_DEPENDENCIES) - 1]
+    else:
+        levels = range(MAX_DEPENDENCIES)
+
+    return jsonify({
+        'levels': [
+            dict(level=level + 1, **cached_result('api_dependency_facets', spec, lambda: query_facets(spec, level), level))
+            for level in levels
+        ],
+    })
+
+
+@bp_api.route(f'/{SCRIPT_ROUTE}/features', methods=['GET'])
+@conditional_get()
+def api_features(script):
+    spec = request_spec(script)
+    mode = request.args.get('facets') or None
+    if mode is not None and mode not in FEATURE_FACET_MODES:
+        abort(400, description=f"facets must be one of {', '.join(FEATURE_FACET_MODES)}")
+
+    counts = feature_facet_counts(spec, mode, search=_panel_search(spec))
+    if request.args.get('counts') == '1':
+        return jsonify({
+            feature: sorted(values.items()) for feature, values in counts.items()
+        })
+    return jsonify({feature: sorted(values) for feature, values in counts.items()})
+
+
+@bp_api.route(f'/{SCRIPT_ROUTE}/initials', methods=['GET'])
+@conditional_get()
+def api_initials(script):
+    spec = request_spec(script)
+    return jsonify({'initials': cached_result('initials', spec, lambda: query_initials(spec))})
+
+
+@bp_api.route(f'/{SCRIPT_ROUTE}/sentences', methods=['GET'])
+@conditional_get(vary=('Accept',))
+def api_sentences(script):
+    spec = request_spec(script)
+    if not spec.selected_verb:
+        abort(400, description="selected_verb is required")
+
+    info, sentences = query_sentences(spec, _int_arg('page', 1), request.args.get('cursor'))
+    if wants_ndjson():
+        return ndjson_response(info, sentences)
+    return jsonify(dict(info, sentences=sentences))
+
+
+@bp_api.route(f'/{SCRIPT_ROUTE}/export', methods=['GET'])
+def api_export(script):
+    spec = request_spec(script)
+    fmt = request.args.get('format', 'tsv')
+    if fmt not in EXPORT_FORMATS:
+        abort(400, description=f"format must be one of {', '.join(EXPORT_FORMATS)}")
+    compress = request.args.get('gzip') in ('1', 'true')
+
+    mimetype, extension = EXPORT_FORMATS[fmt]
+    filename = f"{script}_{spec.selected_verb or 'verbs'}.{extension}"
+    if compress:
+        mimetype, filename = 'application/gzip', filename + '.gz'
+
+    response = Response(stream_with_context(export_chunks(spec, fmt, compress=compress)), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f"attachment; filename*=UTF-8''{quote(filename)}"
+    response.headers['X-Accel-Buffering'] = 'no'  # let proxies pass chunks through as they come
+    return response
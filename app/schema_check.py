@@ -0,0 +1,161 @@
+import click
+from sqlalchemy import text
+
+from .extensions import db
+from .filter_spec import FilterSpec, MAX_DEPENDENCIES, DEPENDENCY_KEYS
+
+
+# -------------------------------------------------------------------
+# Query-plan check for the hot join paths
+# -------------------------------------------------------------------
+# Runs EXPLAIN on a canonical set of the views' queries (verbs list, dependency
+# facets, sentence count, selected-verb sentence set; both scripts) and reports
+# every base table the optimizer reads with a full table scan (type = ALL).
+#
+# Filter values are sampled from the loaded corpus, so the plans reflect real
+# selectivity. Derived tables / CTEs (<derivedN>) are materialized by design and
+# are not reported. Queries without any selective filter (e.g. the unfiltered
+# list) legitimately scan and are not part of the set.
+
+FULL_SCAN = 'ALL'
+
+
+def _sample_values(conn):
+    """A real verb with up to two of its dependency rows, or None on an empty corpus."""
+    verb = conn.execute(text("""
+        SELECT v.lemma, v.gloss, v.translit_verb, v.sent_id, v.token_id
+        FROM verbs v
+        JOIN arguments a ON v.token_id = a.head_id AND v.sent_id = a.sent_id
+        LIMIT 1
+    """)).fetchone()
+    if verb is None:
+        return None
+
+    deps = conn.execute(text("""
+        SELECT a.dep_rel, a.case_value, a.lemma, a.translit_dep_lemma, a.translit_lemma
+        FROM arguments a
+        WHERE a.sent_id = :sent_id AND a.head_id = :token_id
+        ORDER BY a.case_value IS NULL, a.token_id
+        LIMIT 2
+    """), {'sent_id': verb.sent_id, 'token_id': verb.token_id}).fetchall()
+    return verb, deps
+
+
+def _spec(script, verb, deps, *, n_deps, selected=False):
+    dependencies = [dict.fromkeys(DEPENDENCY_KEYS) for _ in range(MAX_DEPENDENCIES)]
+    for idx, dep in enumerate(deps[:n_deps]):
+        if script == 'translit':
+            dependencies[idx] = {
+                'deprel': dep.dep_rel, 'case_value': dep.translit_dep_lemma, 'lemma': dep.translit_lemma,
+            }
+        else:
+            dependencies[idx] = {'deprel': dep.dep_rel, 'case_value': dep.case_value, 'lemma': dep.lemma}
+    if selected:
+        selected_verb = verb.translit_verb if script == 'translit' else verb.lemma
+        return FilterSpec(
+            script=script, dependencies=dependencies,
+            selected_verb=selected_verb, selected_verb_gloss=verb.gloss,
+        )
+    return FilterSpec(script=script, dependencies=dependencies)
+
+
+def _where(conditions):
+    return ' AND '.join(conditions) if conditions else '1=1'
+
+
+def canonical_queries(sample):
+    """[(name, sql, params)] mirroring the views' statements for the sampled values."""
+    verb, deps = sample
+    queries = []
+    for script in ('language', 'translit'):
+        verb_col = 'translit_verb' if script == 'translit' else 'lemma'
+        case_col = 'translit_dep_lemma' if script == 'translit' else 'case_value'
+        lemma_col = 'translit_lemma' if script == 'translit' else 'lemma'
+
+        for n_deps in range(1, len(deps) + 1):
+            spec = _spec(script, verb, deps, n_deps=n_deps)
+
+            joins, conditions, params = spec.compile('verbs')
+            queries.append((f"{script}: verbs list, {n_deps} dependency block(s)", f"""
+                SELECT verbs.{verb_col}, verbs.gloss,
+                       COUNT(DISTINCT verbs.token_id, verbs.sent_id) AS frequency
+                FROM verbs
+                {joins}
+                WHERE {_where(conditions)}
+                GROUP BY verbs.{verb_col}, verbs.gloss
+            """, params))
+
+            queries.append((f"{script}: sentence count, {n_deps} dependency block(s)", f"""
+                SELECT COUNT(DISTINCT verbs.sent_id) AS total_sentences
+                FROM verbs
+                {joins}
+                WHERE {_where(conditions)}
+            """, params))
+
+            open_level = n_deps  # next (empty) block's dropdowns
+            if open_level < MAX_DEPENDENCIES:
+                joins, conditions, params = spec.compile('v', open_level=open_level)
+                a = f"a{open_level}"
+                queries.append((f"{script}: dependency facets, block {open_level + 1}", f"""
+                    SELECT DISTINCT {a}.dep_rel, {a}.{case_col}, {a}.{lemma_col}
+                    FROM verbs v
+                    {joins}
+                    WHERE {_where(conditions)}
+                """, params))
+
+        spec = _spec(script, verb, deps, n_deps=1, selected=True)
+        joins, conditions, params = spec.compile(
+            'v', dependency_join='LEFT JOIN', initial=None, search=False, source_alias='s'
+        )
+        queries.append((f"{script}: selected verb sentence set", f"""
+            SELECT s.sent_id, COUNT(DISTINCT v.token_id) AS token_hits
+            FROM sentences s
+            JOIN verbs v ON s.sent_id = v.sent_id
+            {joins}
+            WHERE {_where(conditions)}
+            GROUP BY s.sent_id
+        """, params))
+    return queries
+
+
+def full_scans(conn, sql, params):
+    """EXPLAIN rows (as dicts) that read a base table with a full table scan."""
+    rows = conn.execute(text("EXPLAIN " + sql), params).mappings().fetchall()
+    return [
+        dict(row) for row in rows
+        if row['type'] == FULL_SCAN and not str(row['table'] or '').startswith('<')
+    ]
+
+
+def check_query_plans():
+    """
+    EXPLAIN every canonical query.
+
+    Returns [(name, [full-scan EXPLAIN rows])]; None when the corpus is empty.
+    """
+    with db.engine.connect() as conn:
+        sample = _sample_values(conn)
+        if sample is None:
+            return None
+        return [(name, full_scans(conn, sql, params)) for name, sql, params in canonical_queries(sample)]
+
+
+@click.command("check-query-plans")
+def check_query_plans_command():
+    """EXPLAIN the hot-path queries; exit non-zero if any does a full table scan."""
+    results = check_query_plans()
+    if results is None:
+        raise click.ClickException("verbs/arguments are empty; load a corpus first")
+
+    failed = 0
+    for name, scans in results:
+        if scans:
+            failed += 1
+            tables = ', '.join(f"{row['table']} (rows={row.get('rows')})" for row in scans)
+            click.echo(f"FULL SCAN  {name}: {tables}")
+        else:
+            click.echo(f"ok         {name}")
+
+    if failed:
+        raise click.ClickException(f"{failed} of {len(results)} queries regressed to full table scans")
+    click.echo(f"{len(results)} queries checked, no full table scans")
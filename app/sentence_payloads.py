@@ -0,0 +1,389 @@
+import json
+import threading
+import zlib
+from collections import OrderedDict, defaultdict
+
+import click
+from flask import current_app, has_app_context
+from sqlalchemy import text
+
+from .extensions import db
+from .query_memo import memo_execute
+from .token_merge import (
+    FLAG_DEFAULTS, FLAG_KEYS, LANGUAGE_RULES, TRANSLIT_RULES, compile_display, merge_display, merge_groups,
+)
+from .versions import corpus_version
+
+
+# -------------------------------------------------------------------
+# Precomputed base render payload per sentence
+# -------------------------------------------------------------------
+# Everything the sentence view derives from the words table alone is the same on
+# every request: the token dicts, the display merge plan, and the BRAT text,
+# character offsets and Case attributes. It is stored once per (sentence, script)
+# in sentence_payloads; at request time the view only overlays the selected-verb /
+# argument flags and the relations of the selected verb occurrences.
+#
+# Payloads are zlib-compressed JSON tagged with PAYLOAD_FORMAT, holding compact
+# per-sentence arrays (token rows and the merge_groups() plan). Sentences without
+# a stored payload of the current format are built on the fly from words with the
+# same code, so a partially built (or missing) table only costs speed.
+#
+# Decoding a payload also compiles its word dicts and display words
+# (token_merge.compile_display). Decoded payloads are kept per process in an LRU
+# of SENTENCE_PAYLOAD_CACHE_SIZE sentences, keyed by corpus version, so a request
+# for a recently shown sentence only copies dicts and sets the marked flags.
+#
+# Must be rebuilt after every corpus (re)load: flask build-sentence-payloads.
+PAYLOAD_TABLE = "sentence_payloads"
+PAYLOAD_FORMAT = 1
+
+# Per-script surface form column and merge rules.
+SCRIPT_FORM_COLUMNS = {'language': 'form', 'translit': 'translit'}
+SCRIPT_RULES = {'language': LANGUAGE_RULES, 'translit': TRANSLIT_RULES}
+
+
+def _words_sql(columns):
+    return f"""
+        SELECT w.sent_id, w.token_id, {columns}, CAST(w.feat AS CHAR), w.gloss, w.head_id, w.dep_rel, w.pos
+        FROM words w
+        WHERE w.sent_id IN :sent_ids
+        ORDER BY w.sent_id, w.token_id
+    """
+
+
+class SentencePayload:
+    """
+    Request-independent rendering data of one sentence. Shared between requests
+    (and threads) through the decoded-payload cache: treat it as read-only.
+    """
+
+    __slots__ = ('tokens', 'groups', 'text', 'offsets', 'attributes', 'words', 'display', 'slots')
+
+    def __init__(self, tokens, groups, text, offsets, attributes):
+        self.tokens = tokens          # [token_id, form, feat, gloss, head_id, dep_rel, pos] per token
+        self.groups = groups          # merge_groups() plan
+        self.text = text              # BRAT text (unmerged forms joined by spaces)
+        self.offsets = offsets        # BRAT [start, end] per token
+        self.attributes = attributes  # BRAT Case attributes
+
+        # Compiled once per decode: word dicts with flags cleared and the display words.
+        words = []
+        for token_id, form, feat, gloss, head_id, dep_rel, pos in tokens:
+            word = {
+                'token_id': token_id,
+                'form': form,
+                'feat': feat,
+                'gloss': gloss,
+                'head_id': head_id,
+                'dep_rel': dep_rel,
+                'pos': pos,
+            }
+            word.update(FLAG_DEFAULTS)
+            word['tokens_info'] = [{'gloss': gloss, 'feat': feat}]
+            words.append(word)
+        self.words = words
+        self.display, self.slots = compile_display(words, groups)
+
+    @classmethod
+    def build(cls, rows, script):
+        """Payload from the words rows (sent_id, token_id, form, feat, gloss, head_id, dep_rel, pos) of one sentence."""
+        by_token = {}
+        for w in rows:
+            feat = w[3] if w[3] != 'None' else None
+            if feat:
+                feat = '|'.join(set(feat.split('|')))  # deduplicate
+            token_id = int(w[1])
+            by_token[token_id] = [
+                token_id,
+                w[2] if w[2] is not None else '',
+                feat,
+                w[4] if w[4] != 'None' else None,
+                int(w[5]) if w[5] is not None else None,
+                w[6],
+                w[7],
+            ]
+        tokens = list(by_token.values())
+
+        forms = [t[1] for t in tokens]
+        rules = SCRIPT_RULES[script]
+        groups = range(len(tokens)) if rules.triggers.isdisjoint(forms) else merge_groups(forms, rules)
+
+        text_val = ''
+        offsets = []
+        for form in forms:
+            start = len(text_val)
+            text_val += form + ' '
+            offsets.append([start, len(text_val) - 1])
+
+        attributes = []
+        for idx, t in enumerate(tokens):
+            if t[2]:
+                for part in t[2].split('|'):
+                    if part.startswith('Case='):
+                        attributes.append([f"A{idx + 1}", 'Case', f"T{idx + 1}", part.split('=')[1]])
+                        break
+
+        return cls(tokens, groups, text_val.strip(), offsets, attributes)
+
+    def word_map(self):
+        """Fresh {token_id: word dict} with all flags cleared, as the view builds it."""
+        return {word['token_id']: word.copy() for word in self.words}
+
+    def to_bytes(self):
+        groups = None if isinstance(self.groups, range) else self.groups
+        raw = json.dumps(
+            {'v': PAYLOAD_FORMAT, 't': self.tokens, 'g': groups,
+             'x': self.text, 'o': self.offsets, 'a': self.attributes},
+            ensure_ascii=False, separators=(',', ':'),
+        )
+        return zlib.compress(raw.encode('utf-8'))
+
+    @classmethod
+    def from_bytes(cls, blob):
+        """Decoded payload, or None for a payload of another format."""
+        data = json.loads(zlib.decompress(blob).decode('utf-8'))
+        if data.get('v') != PAYLOAD_FORMAT:
+            return None
+        groups = data['g'] if data['g'] is not None else range(len(data['t']))
+        return cls(data['t'], groups, data['x'], data['o'], data['a'])
+
+
+class PayloadCache:
+    """In-process LRU of decoded payloads by (corpus version, script, sent_id)."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        found = {}
+        with self._lock:
+            for key in keys:
+                payload = self._entries.get(key)
+                if payload is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = payload
+        return found
+
+    def set_many(self, items):
+        with self._lock:
+            for key, payload in items:
+                self._entries[key] = payload
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def init_sentence_payloads(app):
+    """
+    SENTENCE_PAYLOAD_CACHE_SIZE: decoded (sentence, script) payloads kept per
+    process (0 disables the cache). A decoded 25-token sentence takes about 55 KB.
+    """
+    app.config.setdefault('SENTENCE_PAYLOAD_CACHE_SIZE', 1000)
+    size = int(app.config['SENTENCE_PAYLOAD_CACHE_SIZE'])
+    app.extensions['sentence_payload_cache'] = PayloadCache(size) if size > 0 else None
+
+
+def sentence_payloads(sent_ids, script):
+    """
+    {sent_id: SentencePayload} for the given sentences (sentences without words
+    are left out). Decoded payloads of this process are reused for the same corpus
+    version; otherwise stored payloads are used where present and the rest is
+    built from the words table.
+    """
+    if not sent_ids:
+        return {}
+    ids = tuple(sent_ids)
+
+    cache = current_app.extensions.get('sentence_payload_cache') if has_app_context() else None
+    version = corpus_version()
+    payloads = {}
+    if cache is not None:
+        for (_, _, sent_id), payload in cache.get_many([(version, script, sid) for sid in ids]).items():
+            payloads[sent_id] = payload
+        ids = tuple(sid for sid in ids if sid not in payloads)
+        if not ids:
+            return payloads
+
+    loaded = {}
+    for sent_id, blob in memo_execute(text(f"""
+        SELECT sent_id, payload FROM {PAYLOAD_TABLE}
+        WHERE script = :script AND sent_id IN :sent_ids
+    """), {'script': script, 'sent_ids': ids}, family='words'):
+        payload = SentencePayload.from_bytes(blob)
+        if payload is not None:
+            loaded[sent_id] = payload
+
+    missing = tuple(sid for sid in ids if sid not in loaded)
+    if missing:
+        rows_by_sent = defaultdict(list)
+        form_column = f"w.{SCRIPT_FORM_COLUMNS[script]}"
+        for row in memo_execute(text(_words_sql(form_column)), {'sent_ids': missing}, family='words'):
+            rows_by_sent[row[0]].append(row)
+        for sent_id, rows in rows_by_sent.items():
+            loaded[sent_id] = SentencePayload.build(rows, script)
+
+    if cache is not None:
+        cache.set_many(((version, script, sent_id), payload) for sent_id, payload in loaded.items())
+    payloads.update(loaded)
+    return payloads
+
+
+def overlay_sentence(payload, selected_token_ids, arg_rows, script):
+    """
+    Request-time part of a sentence render: mark the selected verb tokens and their
+    argument/case/fixed dependents, derive the relation edges, merge for display.
+
+    arg_rows are the sentence's arguments rows (head_id, token_id, dep_rel,
+    cdep_token_id, second_cdep_token_id, fdep_token_id attributes).
+    Returns (original_words, merged_words, relations).
+    """
+    word_map = payload.word_map()
+    heads = set(selected_token_ids)
+    relations = []
+    marks = {}  # token_id -> FLAG_KEYS bitmask
+
+    def mark(token_id, bit):
+        word_map[token_id][FLAG_KEYS[bit]] = True
+        marks[token_id] = marks.get(token_id, 0) | 1 << bit
+
+    for verb_token_id in selected_token_ids:
+        if verb_token_id in word_map:
+            mark(verb_token_id, 0)
+
+    for arg in arg_rows:
+        head_id = int(arg.head_id)
+        if head_id not in heads:
+            continue
+        arg_id = int(arg.token_id) if arg.token_id is not None else None
+        cdep_id = int(arg.cdep_token_id) if arg.cdep_token_id is not None else None
+        sdep_id = int(arg.second_cdep_token_id) if arg.second_cdep_token_id is not None else None
+        fdep_id = int(arg.fdep_token_id) if arg.fdep_token_id is not None else None
+
+        if arg_id and arg_id in word_map:
+            mark(arg_id, 1)
+            relations.append({'from': head_id, 'to': arg_id, 'dep_rel': arg.dep_rel or 'argument'})
+
+        for dep_id in (cdep_id, sdep_id):
+            if dep_id and dep_id in word_map:
+                mark(dep_id, 2)
+                relations.append({'from': arg_id if arg_id else head_id, 'to': dep_id, 'dep_rel': 'case_dependency'})
+
+        # Fixed dependents attach to the deepest available dependent.
+        if fdep_id and fdep_id in word_map:
+            mark(fdep_id, 3)
+            governor = sdep_id or cdep_id or arg_id or head_id
+            relations.append({'from': governor, 'to': fdep_id, 'dep_rel': 'fixed_dependency'})
+
+    original_words = list(word_map.values())
+    merged_words = merge_display(payload.display, payload.slots, marks)
+    return original_words, merged_words, relations
+
+
+def brat_data(payload, original_words, relations):
+    """BRAT payload (text, entities, attributes, relations) from the stored layout."""
+    entities = []
+    token_id_to_entity_id = {}
+    for idx, (word, (start, end)) in enumerate(zip(original_words, payload.offsets)):
+        entity_id = f"T{idx + 1}"
+        token_id_to_entity_id[word['token_id']] = entity_id
+        pos = word.get('pos', 'Token')
+        entity_type = f"SelectedVerb_{pos}" if word['is_selected_verb'] else pos
+        entities.append([entity_id, entity_type, [[start, end]]])
+
+    brat_relations = []
+    for idx, rel in enumerate(relations):
+        from_entity = token_id_to_entity_id.get(int(rel['from']))
+        to_entity = token_id_to_entity_id.get(int(rel['to']))
+        if from_entity and to_entity:
+            brat_relations.append([
+                f"R{idx + 1}", rel['dep_rel'], [['Governor', from_entity], ['Dependent', to_entity]],
+            ])
+
+    return {
+        'text': payload.text,
+        'entities': entities,
+        'attributes': list(payload.attributes),
+        'relations': brat_relations,
+    }
+
+
+def build_sentence_payloads(batch_size=500, source_ids=None):
+    """
+    Rebuild sentence_payloads for every sentence and both scripts, then swap the
+    new table in atomically (same pattern as the verb_frequencies summary).
+
+    With source_ids, fill in place only the sentences of those sources that have
+    no payload yet (after an ingest appended or replaced them).
+    """
+    table = PAYLOAD_TABLE
+    if source_ids is None:
+        target = f"{table}_new"
+        with db.engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {table}_new"))
+            conn.execute(text(f"DROP TABLE IF EXISTS {table}_old"))
+            conn.execute(text(f"CREATE TABLE {table}_new LIKE {table}"))
+        joins, conditions, params = "", [], {}
+    else:
+        target = table
+        joins = f"LEFT JOIN {table} p ON p.script = 'language' AND p.sent_id = s.sent_id"
+        conditions = ["s.source_id IN :source_ids", "p.sent_id IS NULL"]
+        params = {'source_ids': tuple(source_ids) or (-1,)}
+
+    def next_batch(conn, after):
+        where = conditions + ([] if after is None else ["s.sent_id > :after"])
+        return conn.execute(text(f"""
+            SELECT s.sent_id FROM sentences s
+            {joins}
+            WHERE {' AND '.join(where) if where else '1=1'}
+            ORDER BY s.sent_id LIMIT :n
+        """), dict(params, after=after, n=batch_size)).scalars().all()
+
+    words_sql = text(_words_sql("w.form, w.translit"))
+    insert = text(f"INSERT INTO {target} (sent_id, script, payload) VALUES (:sent_id, :script, :payload)")
+
+    built = 0
+    after = None
+    while True:
+        with db.engine.begin() as conn:
+            batch = next_batch(conn, after)
+            if not batch:
+                break
+            after = batch[-1]
+
+            rows_by_sent = defaultdict(list)
+            for row in conn.execute(words_sql, {'sent_ids': tuple(batch)}):
+                rows_by_sent[row[0]].append(row)
+
+            values = []
+            for sent_id, rows in rows_by_sent.items():
+                # (sent_id, token_id, form, translit, feat, ...) -> per-script rows
+                rows = [tuple(r) for r in rows]
+                language_rows = [r[:3] + r[4:] for r in rows]
+                translit_rows = [r[:2] + r[3:] for r in rows]
+                for script, script_rows in (('language', language_rows), ('translit', translit_rows)):
+                    payload = SentencePayload.build(script_rows, script)
+                    values.append({'sent_id': sent_id, 'script': script, 'payload': payload.to_bytes()})
+            if values:
+                conn.execute(insert, values)
+            built += len(rows_by_sent)
+
+    if source_ids is None:
+        with db.engine.begin() as conn:
+            conn.execute(text(f"RENAME TABLE {table} TO {table}_old, {table}_new TO {table}"))
+            conn.execute(text(f"DROP TABLE {table}_old"))
+    return built
+
+
+@click.command("build-sentence-payloads")
+@click.option("--batch-size", default=500, show_default=True, help="Sentences per batch.")
+def build_sentence_payloads_command(batch_size):
+    """Precompute the per-sentence render payloads (run after every corpus load)."""
+    n = build_sentence_payloads(batch_size)
+    click.echo(f"{PAYLOAD_TABLE}: {n} sentences")
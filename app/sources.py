@@ -0,0 +1,62 @@
+import re
+
+
+# -------------------------------------------------------------------
+# Customizable: source/language dimension
+# -------------------------------------------------------------------
+# Each sentence (and its verbs/arguments rows) carries an indexed source_id that
+# points into the small "sources" table. The ids below must match the rows seeded
+# by the migration that introduced the table.
+SOURCE_IDS = {
+    "German": 1,
+    "Dutch": 2,
+    "French": 3,
+    "English": 4,
+    "Greek": 5,
+    "Arabic": 6,
+}
+
+# sent_id patterns the source_id column was backfilled from, in priority order
+# (first match wins). Sentences matching none of them belong to FALLBACK_SOURCE.
+# Kept here so ingestion assigns ids the same way the backfill did.
+SOURCE_SENT_ID_PATTERNS = (
+    ("German", ("LIKE", "%hdt%")),
+    ("Dutch", ("LIKE", "%wiki%")),
+    ("Dutch", ("LIKE", "%WR-P-E-I%")),
+    ("French", ("LIKE", "%fr%")),
+    ("English", ("LIKE", "%GUM%")),
+    ("Greek", ("REGEXP", "^[0-9]{5}$")),
+)
+FALLBACK_SOURCE = "Arabic"
+
+
+def _pattern_matcher(op, pattern):
+    # MySQL LIKE / REGEXP under the tables' case-insensitive collation.
+    if op == "LIKE":
+        regex = "^" + ".*".join(re.escape(part) for part in pattern.split("%")) + "$"
+    else:
+        regex = pattern
+    return re.compile(regex, re.IGNORECASE | re.DOTALL).search
+
+
+_SOURCE_MATCHERS = tuple(
+    (SOURCE_IDS[source], _pattern_matcher(op, pattern))
+    for source, (op, pattern) in SOURCE_SENT_ID_PATTERNS
+)
+
+
+def source_id_for_sent_id(sent_id):
+    """source_id of a sentence by the sent_id patterns (as the backfill assigned it)."""
+    for source_id, matches in _SOURCE_MATCHERS:
+        if matches(sent_id):
+            return source_id
+    return SOURCE_IDS[FALLBACK_SOURCE]
+
+
+def source_ids_for(selected_sources):
+    """
+    Map source labels (as submitted by the sources panel) to sorted source ids.
+    Unknown labels are ignored.
+    """
+    return sorted({SOURCE_IDS[src] for src in selected_sources if src in SOURCE_IDS})
+
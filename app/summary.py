@@ -0,0 +1,67 @@
+import click
+from sqlalchemy import text
+
+from .extensions import db
+
+
+# -------------------------------------------------------------------
+# Materialized verb-frequency summary
+# -------------------------------------------------------------------
+# One row per (lemma, gloss, translit_verb, source, feature bundle) with the number
+# of distinct verb occurrences. Every column a verbs-list filter can touch without
+# a dependency block is part of the key, so the list views can read from it with
+# the same "verbs.<column>" predicates they use against the verbs table (the stored
+# initials depend on lemma/translit_verb only, so they don't split groups). The
+# generated gloss_norm/translit_verb_norm search columns are part of the table
+# definition (copied by CREATE TABLE ... LIKE) and computed on insert.
+VERB_FREQUENCY_TABLE = "verb_frequencies"
+
+SUMMARY_KEY_COLUMNS = (
+    "lemma", "gloss", "translit_verb", "source_id", "lemma_initial", "translit_initial",
+    "VerbForm", "Aspect", "Case", "Connegative", "Mood",
+    "Number", "Person", "Tense", "Voice",
+)
+
+
+def summary_select_sql():
+    """SELECT that computes the summary rows from the verbs table."""
+    key_cols = ", ".join(f"verbs.{c}" for c in SUMMARY_KEY_COLUMNS)
+    return f"""
+        SELECT {key_cols},
+               COUNT(DISTINCT verbs.token_id, verbs.sent_id) AS occurrences
+        FROM verbs
+        GROUP BY {key_cols}
+    """
+
+
+def refresh_verb_frequency_summary():
+    """
+    Rebuild the summary table from verbs and swap it in atomically.
+
+    Readers keep using the old table until RENAME TABLE swaps both names in one step.
+    Must be run after every corpus (re)load.
+    """
+    table = VERB_FREQUENCY_TABLE
+    cols = ", ".join(f"`{c}`" for c in SUMMARY_KEY_COLUMNS)
+
+    statements = [
+        f"DROP TABLE IF EXISTS {table}_new",
+        f"DROP TABLE IF EXISTS {table}_old",
+        f"CREATE TABLE {table}_new LIKE {table}",
+        f"INSERT INTO {table}_new ({cols}, occurrences) {summary_select_sql()}",
+        f"RENAME TABLE {table} TO {table}_old, {table}_new TO {table}",
+        f"DROP TABLE {table}_old",
+    ]
+    with db.engine.begin() as conn:
+        for stmt in statements:
+            conn.execute(text(stmt))
+
+        row = conn.execute(text(f"SELECT COUNT(*) AS n FROM {table}")).fetchone()
+    return int(row.n or 0)
+
+
+@click.command("refresh-verb-summary")
+def refresh_verb_summary_command():
+    """Rebuild the verb_frequencies summary table from verbs."""
+    n = refresh_verb_frequency_summary()
+    click.echo(f"{VERB_FREQUENCY_TABLE}: {n} rows")
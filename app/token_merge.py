@@ -0,0 +1,230 @@
+# -------------------------------------------------------------------
+# Surface token merging for the sentence display
+# -------------------------------------------------------------------
+# The UD tokenization splits Armenian clitics and punctuation off their host word
+# (յ-/զ-/ց-/չ- prefixes, -ս/-դ/-ն articles, '՞'/'՛' emphasis marks...). For display
+# they are merged back into one surface word whose tooltip lists every piece and
+# whose highlight flags are the OR of its pieces.
+#
+# Merging runs in three phases:
+#   1. merge_groups(): decide the groups from the forms alone (which positions
+#      merge, the resulting surface form, the anchor token whose attributes the
+#      merged word keeps, and the order in which POS falls back across pieces);
+#   2. compile_display(): build every display word with its flags cleared
+#      (merged form, token_id string, tooltip, tokens_info, POS), plus the
+#      display slot of every token_id;
+#   3. merge_display(): per request, copy the compiled display words and set the
+#      flags of the few marked tokens on their slots (flags OR across a group).
+# Phases 1 and 2 only depend on the words table: the sentence payloads
+# (app/sentence_payloads.py) store the phase 1 plan and keep the compiled display
+# words of recently decoded sentences, so a request normally only runs phase 3.
+# Sentences without any attaching form (the common case) skip phase 1 entirely.
+
+FLAG_KEYS = ('is_selected_verb', 'is_argument', 'is_case_dependent', 'is_fixed_dependent')
+FLAG_DEFAULTS = tuple((key, False) for key in FLAG_KEYS)
+
+# The flags a bitmask sets (bit i set = FLAG_KEYS[i] is True).
+FLAG_SETS = tuple(
+    {key: True for bit, key in enumerate(FLAG_KEYS) if mask >> bit & 1}
+    for mask in range(1 << len(FLAG_KEYS))
+)
+
+
+class MergeRules:
+    """Attachment rules of one orthography, compiled once at import."""
+
+    def __init__(self, *, attach_next, attach_prev, special, vowels):
+        self.attach_next = frozenset(attach_next)  # prefixes glued to the following token
+        self.attach_prev = frozenset(attach_prev)  # suffixes/punctuation glued to the previous word
+        self.special = frozenset(special)          # marks inserted after the previous word's last vowel
+        # Only single characters can match a position in the host form.
+        self.vowels = frozenset(v for v in vowels if len(v) == 1)
+        self.triggers = self.attach_next | self.attach_prev | self.special
+
+    def insert_position(self, form):
+        """Index right after the last vowel of form (end of form if it has none)."""
+        vowels = self.vowels
+        for idx in range(len(form) - 1, -1, -1):
+            if form[idx] in vowels:
+                return idx + 1
+        return len(form)
+
+
+# Customization: these sets are language/script specific. Replace them for another
+# language (or use empty sets to disable merging).
+LANGUAGE_RULES = MergeRules(
+    attach_next={'յ', 'զ', 'ց', 'չ', 'Յ', 'Զ', 'Ց', 'Չ'},
+    attach_prev={'ս', 'դ', 'ն', '՝', '.', ':', ','},
+    special={'՞', '՛'},
+    vowels={'ա', 'ե', 'է', 'ը', 'ի', 'օ', 'ու', 'ո', 'Է'},
+)
+
+TRANSLIT_RULES = MergeRules(
+    attach_next={'y', 'z', 'cʻ', 'čʻ', 'Y', 'Z', 'Cʻ', 'Čʻ'},
+    attach_prev={'s', 'd', 'n', ';', '.', ',', ':'},
+    special={'?', '!'},
+    vowels={'a', 'e', 'ē', 'ǝ', 'i', 'o', 'u'},
+)
+
+
+def tooltip(tokens_info):
+    """'gloss.feat' (or whichever is present) of every piece, joined with '='."""
+    parts = []
+    for info in tokens_info:
+        gloss = info.get('gloss')
+        feat = info.get('feat')
+        part = f"{gloss}.{feat}" if gloss and feat else (gloss or feat)
+        if part:
+            parts.append(part)
+    return '='.join(parts)
+
+
+def merge_groups(forms, rules):
+    """
+    Group the token positions of one sentence from their forms.
+
+    Returns one entry per display word, in order: a plain position for a token
+    that stays on its own, or (positions, form, anchor, pos_chain) for a merge:
+      positions  token positions in merged order (token_id/tooltip order)
+      form       merged surface form
+      anchor     position whose other attributes the merged word keeps
+      pos_chain  positions whose POS is tried in turn ("a or b or ...")
+    """
+    special = rules.special
+    attach_prev = rules.attach_prev
+    attach_next = rules.attach_next
+
+    groups = []
+    n = len(forms)
+    i = 0
+    while i < n:
+        form = forms[i]
+        anchor = i
+        i += 1
+        if form not in rules.triggers:
+            groups.append(anchor)
+            continue
+
+        # Emphasis marks go inside the previous word, after its last vowel.
+        if form in special and groups:
+            last = _expand(groups.pop(), forms)
+            k = rules.insert_position(last[1])
+            groups.append((last[0] + [anchor], last[1][:k] + form + last[1][k:], last[2], last[3]))
+            continue
+
+        positions = [anchor]
+        pos_chain = [anchor]
+
+        # Suffix-like tokens glue onto the previous word.
+        while form in attach_prev and groups:
+            last_positions, last_form, _, last_chain = _expand(groups.pop(), forms)
+            form = last_form + form
+            positions = last_positions + positions
+            pos_chain = pos_chain + last_chain
+
+        # Prefix-like tokens glue onto the next token.
+        while form in attach_next and i < n:
+            next_form = forms[i]
+            form += next_form
+            positions.append(i)
+            pos_chain.append(i)
+            i += 1
+            if next_form not in attach_next:
+                break
+
+        groups.append(anchor if len(positions) == 1 else (positions, form, anchor, pos_chain))
+    return groups
+
+
+def _expand(entry, forms):
+    if entry.__class__ is int:
+        return [entry], forms[entry], entry, [entry]
+    return entry
+
+
+def flag_mask(word):
+    """Bitmask of the FLAG_KEYS flags set on a word dict."""
+    mask = 0
+    for bit, key in enumerate(FLAG_KEYS):
+        if word[key]:
+            mask |= 1 << bit
+    return mask
+
+
+def compile_display(words, groups):
+    """
+    Request-independent display words of one sentence.
+
+    words are per-token dicts in token order (token_id, form, feat, gloss, pos and
+    a one-piece tokens_info; flags, if present, are ignored). Returns
+    (display, slots): display holds one dict per display word carrying the
+    anchor's attributes with a '_'-joined token_id string, the merged form, the
+    combined tooltip as gloss, the concatenated tokens_info, the POS fallback and
+    all flags False; slots[token_id] is the index of the display word a token
+    ended up in (None for unused ids). Both are plain JSON-able lists.
+    """
+    display = []
+    slots = [None] * (max([w['token_id'] for w in words], default=0) + 1)
+    for entry in groups:
+        if entry.__class__ is int:
+            word = words[entry]
+            base = word.copy()
+            base['token_id'] = str(word['token_id'])
+            gloss = word['gloss']
+            feat = word['feat']
+            base['gloss'] = f"{gloss}.{feat}" if gloss and feat else (gloss or feat or '')
+            base.update(FLAG_DEFAULTS)
+            slots[word['token_id']] = len(display)
+            display.append(base)
+            continue
+
+        positions, form, anchor, pos_chain = entry
+        base = words[anchor].copy()
+        pieces = [words[p] for p in positions]
+        tokens_info = [info for piece in pieces for info in piece['tokens_info']]
+        base['form'] = form
+        base['token_id'] = '_'.join([str(piece['token_id']) for piece in pieces])
+        base['gloss'] = tooltip(tokens_info)
+        base['tokens_info'] = tokens_info
+        pos = words[pos_chain[0]]['pos']
+        for p in pos_chain[1:]:
+            pos = pos or words[p]['pos']
+        base['pos'] = pos
+        base.update(FLAG_DEFAULTS)
+        for piece in pieces:
+            slots[piece['token_id']] = len(display)
+        display.append(base)
+    return display, slots
+
+
+def merge_display(display, slots, marks):
+    """
+    Display words from compiled display words and slots (see compile_display) and
+    the flag bitmasks of the marked tokens ({token_id: mask}). Each call returns
+    fresh dicts; display is not modified.
+    """
+    merged = [base.copy() for base in display]
+    for token_id, mask in marks.items():
+        merged[slots[token_id]].update(FLAG_SETS[mask])
+    return merged
+
+
+def merge_tokens(words, rules, groups=None):
+    """
+    Merged display words for one sentence, from the per-token dicts in token order
+    as built by the views (token_id, form, feat, gloss, pos, the FLAG_KEYS flags and
+    a one-piece tokens_info); they are not modified. groups may be passed in when
+    already computed (see merge_groups).
+
+    This runs all three phases; use compile_display/merge_display directly when
+    the compiled display words can be reused.
+    """
+    if groups is None:
+        forms = [w['form'] for w in words]
+        groups = range(len(words)) if rules.triggers.isdisjoint(forms) else merge_groups(forms, rules)
+    marks = {}
+    for word in words:
+        mask = flag_mask(word)
+        if mask:
+            marks[word['token_id']] = mask
+    return merge_display(*compile_display(words, groups), marks)
@@ -0,0 +1,126 @@
+import threading
+import time
+
+from flask import current_app, g, has_app_context, has_request_context
+from sqlalchemy import text
+
+from .extensions import db
+
+
+# -------------------------------------------------------------------
+# Corpus and per-source version stamps
+# -------------------------------------------------------------------
+# corpus_versions holds one row per source (source_id) plus a CORPUS_SCOPE row for
+# the corpus as a whole. Every ingest bumps the corpus row and sets each source it
+# touched to the new corpus version, so both kinds of stamps only ever grow.
+#
+# A result that only reads some sources (sources panel restricted) is stamped with
+# those sources' versions; anything else with the corpus version. Appending or
+# replacing one source therefore leaves cached results (and ETags) of the other
+# sources valid.
+#
+# The table is read at most every CORPUS_VERSION_TTL seconds per process. The
+# CORPUS_VERSION config value prefixes every stamp as a manual override.
+VERSION_TABLE = "corpus_versions"
+CORPUS_SCOPE = 0
+
+_lock = threading.Lock()
+_snapshot = {'versions': None, 'expires_at': 0.0}
+
+
+def load_versions():
+    """{source_id or CORPUS_SCOPE: version} as of the last read of corpus_versions."""
+    now = time.monotonic()
+    versions = _snapshot['versions']
+    if versions is not None and _snapshot['expires_at'] > now:
+        return versions
+
+    with _lock:
+        if _snapshot['versions'] is None or _snapshot['expires_at'] <= now:
+            try:
+                with db.engine.connect() as conn:
+                    rows = conn.execute(text(f"SELECT source_id, version FROM {VERSION_TABLE}")).fetchall()
+                _snapshot['versions'] = {int(sid): int(version) for sid, version in rows}
+            except Exception:
+                # Before the migration: fall back to CORPUS_VERSION alone.
+                current_app.logger.warning("%s unavailable; using CORPUS_VERSION only", VERSION_TABLE)
+                _snapshot['versions'] = {}
+            _snapshot['expires_at'] = now + float(current_app.config.get('CORPUS_VERSION_TTL', 5))
+        return _snapshot['versions']
+
+
+def forget_versions():
+    """Drop this process' snapshot (after a bump)."""
+    with _lock:
+        _snapshot['versions'] = None
+
+
+def _base():
+    return str(current_app.config.get('CORPUS_VERSION', '0'))
+
+
+def corpus_version():
+    """Version stamp of the whole corpus."""
+    if not has_app_context():
+        return '0'
+    return f"{_base()}.{load_versions().get(CORPUS_SCOPE, 0)}"
+
+
+def source_versions(source_ids):
+    """((source_id, version), ...) for the given sources."""
+    versions = load_versions()
+    return tuple((sid, versions.get(sid, 0)) for sid in sorted(source_ids))
+
+
+def spec_version(spec):
+    """
+    Version stamp of the data a FilterSpec reads: its sources' versions when the
+    sources panel restricts it, the corpus version otherwise. Recorded on flask.g
+    for the X-Corpus-Version header.
+    """
+    source_ids = spec.source_ids() if spec.selected_sources else ()
+    if source_ids:
+        stamp = f"{_base()}.s" + '.'.join(f"{sid}-{v}" for sid, v in source_versions(source_ids))
+    else:
+        stamp = corpus_version()
+
+    if has_request_context():
+        stamps = g.get('data_versions')
+        if stamps is None:
+            stamps = g.data_versions = set()
+        stamps.add(stamp)
+    return stamp
+
+
+def bump_versions(conn, source_ids):
+    """Advance the corpus version and stamp source_ids with it; returns the new version."""
+    conn.execute(text(f"""
+        INSERT INTO {VERSION_TABLE} (source_id, version, updated_at) VALUES (:scope, 1, NOW())
+        ON DUPLICATE KEY UPDATE version = version + 1, updated_at = NOW()
+    """), {'scope': CORPUS_SCOPE})
+    version = conn.execute(text(
+        f"SELECT version FROM {VERSION_TABLE} WHERE source_id = :scope"
+    ), {'scope': CORPUS_SCOPE}).scalar()
+    if source_ids:
+        conn.execute(text(f"""
+            INSERT INTO {VERSION_TABLE} (source_id, version, updated_at) VALUES (:sid, :version, NOW())
+            ON DUPLICATE KEY UPDATE version = VALUES(version), updated_at = NOW()
+        """), [{'sid': sid, 'version': version} for sid in sorted(source_ids)])
+    forget_versions()
+    return int(version)
+
+
+def init_corpus_versions(app):
+    """
+    CORPUS_VERSION_TTL: seconds a process trusts its snapshot of corpus_versions.
+    Responses that used a stamped result carry it in X-Corpus-Version.
+    """
+    app.config.setdefault('CORPUS_VERSION', '0')
+    app.config.setdefault('CORPUS_VERSION_TTL', 5)
+
+    @app.after_request
+    def _report_corpus_version(response):
+        stamps = g.get('data_versions')
+        if stamps:
+            response.headers['X-Corpus-Version'] = ', '.join(sorted(stamps))
+        return response
@@ -0,0 +1,71 @@
+import argparse
+import json
+import sys
+
+
+# -------------------------------------------------------------------
+# Before/after comparison of two benchmark reports (benchmarks/run.py)
+# -------------------------------------------------------------------
+#   python -m benchmarks.compare before.json after.json [--fail-over 10]
+#
+# Prints p50/p95/p99 and statements per request side by side with the relative
+# change. --fail-over PCT exits with status 1 when any common scenario's p95 got
+# more than PCT percent slower (for CI).
+METRICS = ('p50', 'p95', 'p99')
+
+
+def _change(before, after):
+    if not before:
+        return float('inf') if after else 0.0
+    return (after - before) / before * 100
+
+
+def compare(before, after):
+    """[(scenario, {metric: (before, after, change %)})] of the scenarios in both reports."""
+    rows = []
+    for name, old in before['scenarios'].items():
+        new = after['scenarios'].get(name)
+        if new is None:
+            continue
+        values = {
+            metric: (old['latency_ms'][metric], new['latency_ms'][metric],
+                     _change(old['latency_ms'][metric], new['latency_ms'][metric]))
+            for metric in METRICS
+        }
+        values['statements'] = (old['statements'], new['statements'], _change(old['statements'], new['statements']))
+        rows.append((name, values))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark reports.")
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument('--fail-over', type=float, help="fail when a p95 regresses by more than this percent")
+    args = parser.parse_args(argv)
+
+    with open(args.before, encoding='utf-8') as f:
+        before = json.load(f)
+    with open(args.after, encoding='utf-8') as f:
+        after = json.load(f)
+
+    print(f"before: {before['meta'].get('git_revision')} {before['meta'].get('label') or ''}")
+    print(f"after:  {after['meta'].get('git_revision')} {after['meta'].get('label') or ''}")
+    print(f"{'scenario':24s}" + ''.join(f"{metric:>26s}" for metric in METRICS + ('statements',)))
+    regressions = []
+    for name, values in compare(before, after):
+        cells = ''.join(
+            f"{old:9.1f} -> {new:9.1f} {change:+5.0f}%" for old, new, change in values.values()
+        )
+        print(f"{name:24s}{cells}")
+        if args.fail_over is not None and values['p95'][2] > args.fail_over:
+            regressions.append(name)
+
+    print(f"peak RSS: {before['peak_rss_mb']:.0f} MiB -> {after['peak_rss_mb']:.0f} MiB")
+    if regressions:
+        print(f"p95 regressed by more than {args.fail_over:g}%: {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
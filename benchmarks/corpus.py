@@ -0,0 +1,266 @@
+import argparse
+import bisect
+import itertools
+import json
+import os
+import random
+
+
+# -------------------------------------------------------------------
+# Seeded synthetic UD corpus (CoNLL-U) for the benchmarks
+# -------------------------------------------------------------------
+# Writes one CoNLL-U file per source in the conventions app/ingest.py reads (MISC
+# Gloss/Translit/LTranslit, # translit and # text_en comments), so the same files
+# load into MySQL with "flask ingest" and into the SQLite stand-in with
+# benchmarks/standin.py.
+#
+# Distributions:
+#   - verb, noun and gloss choices are Zipfian (rank^-ZIPF_S): a few very frequent
+#     lemmas and a long tail, as in the real treebanks;
+#   - vocabulary grows with the corpus (Heaps' law, ~ tokens^0.55), so the tail
+#     gets longer at larger scales;
+#   - argument relations and case values follow fixed skewed weights;
+#   - sources get SOURCE_WEIGHTS shares, with sent_ids matching app/sources.py's
+#     patterns.
+#
+# The same (tokens, seed) always produces byte-identical files.
+ZIPF_S = 1.07
+
+# (Armenian letter, transliteration): lemmas are spelled with these, so the initial
+# bars of both pages see the same digraph initials as the real corpus.
+LETTERS = (
+    ('ա', 'a'), ('բ', 'b'), ('գ', 'g'), ('դ', 'd'), ('ե', 'e'), ('զ', 'z'), ('է', 'ē'),
+    ('ը', 'ǝ'), ('թ', 'tʻ'), ('ժ', 'ž'), ('ի', 'i'), ('լ', 'l'), ('խ', 'x'), ('ծ', 'c'),
+    ('կ', 'k'), ('հ', 'h'), ('ձ', 'j'), ('ղ', 'ł'), ('ճ', 'č'), ('մ', 'm'), ('յ', 'y'),
+    ('ն', 'n'), ('շ', 'š'), ('ո', 'o'), ('չ', 'čʻ'), ('պ', 'p'), ('ջ', 'ǰ'), ('ռ', 'ṙ'),
+    ('ս', 's'), ('վ', 'v'), ('տ', 't'), ('ր', 'r'), ('ց', 'cʻ'), ('ւ', 'w'), ('փ', 'pʻ'),
+    ('ք', 'kʻ'), ('ֆ', 'f'),
+)
+VOWELS = tuple(pair for pair in LETTERS if pair[1] in ('a', 'e', 'ē', 'ǝ', 'i', 'o'))
+CONSONANTS = tuple(pair for pair in LETTERS if pair not in VOWELS)
+
+SOURCE_WEIGHTS = (
+    ('German', 0.30), ('Dutch', 0.20), ('French', 0.12),
+    ('English', 0.15), ('Greek', 0.05), ('Arabic', 0.18),
+)
+# sent_id templates matching app/sources.py SOURCE_SENT_ID_PATTERNS
+SENT_ID_FORMATS = {
+    'German': 'hdt-{n}', 'Dutch': 'wiki-{n}', 'French': 'fr-{n}',
+    'English': 'GUM_bench_{n}', 'Greek': '{n:05d}', 'Arabic': 'ar-{n}',
+}
+GREEK_MAX = 99999  # five-digit sent_ids only
+
+ARGUMENT_RELATIONS = (
+    ('obj', 30), ('nsubj', 28), ('obl', 22), ('iobj', 6), ('xcomp', 4), ('ccomp', 3),
+    ('obl:agent', 2), ('aux', 2), ('csubj', 1), ('nsubj:pass', 1), ('expl', 1),
+)
+CASES = (('Nom', 25), ('Acc', 25), ('Gen', 15), ('Dat', 12), ('Abl', 8), ('Ins', 8), ('Loc', 7))
+# case markers: (lemma, transliteration)
+MARKERS = (('զ', 'z'), ('ի', 'i'), ('ընդ', 'ǝnd'), ('առ', 'aṙ'), ('ց', 'cʻ'), ('յ', 'y'), ('ըստ', 'ǝst'))
+FIXED = (('վասն', 'vasn'), ('քան', 'kʻan'))
+
+VERB_FEATURES = (
+    ('VerbForm', (('Fin', 80), ('Inf', 10), ('Part', 10))),
+    ('Aspect', (('Perf', 55), ('Imp', 45))),
+    ('Mood', (('Ind', 70), ('Sub', 20), ('Imp', 10))),
+    ('Number', (('Sing', 65), ('Plur', 35))),
+    ('Person', (('3', 70), ('1', 15), ('2', 15))),
+    ('Tense', (('Past', 50), ('Pres', 40), ('Fut', 10))),
+    ('Voice', (('Act', 75), ('Mid', 15), ('Pass', 10))),
+)
+CONNEGATIVE_RATE = 0.03
+
+GLOSS_SYLLABLES = ('go', 'see', 'take', 'give', 'say', 'make', 'know', 'call', 'bear', 'hold',
+                   'send', 'bring', 'keep', 'find', 'come', 'lead', 'turn', 'stand', 'fall', 'rise')
+GLOSS_PARTICLES = ('', '', '', '-out', '-up', '-away', '-back', '-down')
+
+FILLER_RELATIONS = (('advmod', 'ADV'), ('det', 'DET'), ('amod', 'ADJ'), ('cc', 'CCONJ'))
+
+
+def _cum_weights(weights):
+    return list(itertools.accumulate(weights))
+
+
+def zipf_weights(n, s=ZIPF_S):
+    return _cum_weights(1.0 / (rank ** s) for rank in range(1, n + 1))
+
+
+class Lexicon:
+    """Verbs (with senses) and nouns spelled in both scripts, plus their Zipf tables."""
+
+    def __init__(self, rng, tokens):
+        n_verbs = max(40, int(1.2 * tokens ** 0.55))
+        n_nouns = 3 * n_verbs
+        seen = set()
+        self.verbs = [self._word(rng, seen, suffix=('ել', 'el')) for _ in range(n_verbs)]
+        self.nouns = [self._word(rng, seen) for _ in range(n_nouns)]
+        # 1-3 senses per verb, the first one dominant
+        self.senses = [
+            [self._gloss(rng) for _ in range(rng.choice((1, 1, 1, 2, 2, 3)))] for _ in range(n_verbs)
+        ]
+        self.verb_cw = zipf_weights(n_verbs)
+        self.noun_cw = zipf_weights(n_nouns)
+
+    @staticmethod
+    def _word(rng, seen, suffix=None):
+        while True:
+            pairs = []
+            for _ in range(rng.choice((1, 2, 2, 3))):
+                pairs.append(rng.choice(CONSONANTS))
+                pairs.append(rng.choice(VOWELS))
+            if rng.random() < 0.4:
+                pairs.append(rng.choice(CONSONANTS))
+            if rng.random() < 0.15:  # vowel-initial lemmas too
+                pairs.insert(0, rng.choice(VOWELS))
+            if suffix:
+                pairs.append(suffix)
+            word = (''.join(a for a, _ in pairs), ''.join(t for _, t in pairs))
+            if word not in seen:
+                seen.add(word)
+                return word
+
+    @staticmethod
+    def _gloss(rng):
+        return rng.choice(GLOSS_SYLLABLES) + rng.choice(GLOSS_PARTICLES)
+
+    def pick(self, rng, cum_weights):
+        return bisect.bisect_left(cum_weights, rng.random() * cum_weights[-1])
+
+
+def _weighted(rng, table):
+    values, weights = zip(*table)
+    return rng.choices(values, weights=weights)[0]
+
+
+def _misc(**pairs):
+    parts = [f"{key}={value}" for key, value in pairs.items() if value]
+    return '|'.join(parts) if parts else '_'
+
+
+class SentenceBuilder:
+    """Tokens of one sentence: (form, lemma, upos, feats, head, deprel, misc)."""
+
+    def __init__(self):
+        self.tokens = []
+
+    def add(self, form, lemma, upos, feats, head, deprel, misc):
+        self.tokens.append([form, lemma, upos, feats, head, deprel, misc])
+        return len(self.tokens)
+
+    def lines(self):
+        return [
+            '\t'.join((str(i), form, lemma, upos, '_', feats, str(head), deprel, '_', misc))
+            for i, (form, lemma, upos, feats, head, deprel, misc) in enumerate(self.tokens, 1)
+        ]
+
+
+def build_sentence(rng, lexicon, sent_id):
+    """CoNLL-U block (with comments) of one synthetic sentence, and its token count."""
+    b = SentenceBuilder()
+    n_verbs = 1 if rng.random() < 0.7 else 2
+    root = None
+    for _ in range(n_verbs):
+        v = lexicon.pick(rng, lexicon.verb_cw)
+        (arm, tr), senses = lexicon.verbs[v], lexicon.senses[v]
+        gloss = senses[0] if len(senses) == 1 or rng.random() < 0.7 else rng.choice(senses[1:])
+        feats = [f"{name}={_weighted(rng, values)}" for name, values in VERB_FEATURES]
+        if rng.random() < CONNEGATIVE_RATE:
+            feats.append("Connegative=Yes")
+        if 'VerbForm=Part' in feats:
+            feats.append(f"Case={_weighted(rng, CASES)}")
+        head, deprel = (0, 'root') if root is None else (root, rng.choice(('conj', 'advcl', 'ccomp')))
+        verb = b.add(arm, arm, 'VERB', '|'.join(sorted(feats)), head, deprel,
+                     _misc(Gloss=gloss, Translit=tr, LTranslit=tr))
+        root = root or verb
+
+        for _ in range(rng.choice((1, 1, 2, 2, 2, 3, 3, 4))):
+            n = lexicon.pick(rng, lexicon.noun_cw)
+            n_arm, n_tr = lexicon.nouns[n]
+            case = _weighted(rng, CASES)
+            arg = b.add(n_arm, n_arm, 'NOUN', f"Case={case}|Number={rng.choice(('Sing', 'Plur'))}",
+                        verb, _weighted(rng, ARGUMENT_RELATIONS), _misc(Gloss=f"n{n}", Translit=n_tr, LTranslit=n_tr))
+            if rng.random() < 0.35:
+                m_arm, m_tr = rng.choice(MARKERS)
+                marker = b.add(m_arm, m_arm, 'ADP', '_', arg, 'case', _misc(Translit=m_tr, LTranslit=m_tr))
+                if rng.random() < 0.05:
+                    f_arm, f_tr = rng.choice(FIXED)
+                    b.add(f_arm, f_arm, 'ADP', '_', marker, 'fixed', _misc(Translit=f_tr, LTranslit=f_tr))
+            if rng.random() < 0.3:
+                a = lexicon.pick(rng, lexicon.noun_cw)
+                a_arm, a_tr = lexicon.nouns[a]
+                b.add(a_arm, a_arm, 'ADJ', '_', arg, 'amod', _misc(Translit=a_tr))
+
+        for _ in range(rng.randint(0, 4)):
+            deprel, upos = rng.choice(FILLER_RELATIONS)
+            f = lexicon.pick(rng, lexicon.noun_cw)
+            f_arm, f_tr = lexicon.nouns[f]
+            b.add(f_arm, f_arm, upos, '_', verb, deprel, _misc(Translit=f_tr))
+    b.add('։', '։', 'PUNCT', '_', root, 'punct', _misc(Translit='.'))
+
+    forms = [t[0] for t in b.tokens]
+    translits = [t[6].split('Translit=', 1)[1].split('|', 1)[0] for t in b.tokens]
+    glosses = [t[6].split('Gloss=', 1)[1].split('|', 1)[0] for t in b.tokens if 'Gloss=' in t[6]]
+    block = [
+        f"# sent_id = {sent_id}",
+        f"# text = {' '.join(forms)}",
+        f"# translit = {' '.join(translits)}",
+        f"# text_en = {' '.join(glosses)}",
+    ] + b.lines()
+    return '\n'.join(block) + '\n\n', len(b.tokens)
+
+
+def generate(out_dir, tokens, seed=1):
+    """Write <source>.conllu files with about `tokens` tokens to out_dir; returns the manifest."""
+    rng = random.Random(seed)
+    lexicon = Lexicon(rng, tokens)
+    os.makedirs(out_dir, exist_ok=True)
+
+    sources = [name for name, _ in SOURCE_WEIGHTS]
+    source_cw = _cum_weights(weight for _, weight in SOURCE_WEIGHTS)
+    handles = {
+        name: open(os.path.join(out_dir, f"{name.lower()}.conllu"), 'w', encoding='utf-8', newline='\n')
+        for name in sources
+    }
+    counters = dict.fromkeys(sources, 0)
+    token_counts = dict.fromkeys(sources, 0)
+    written = 0
+    try:
+        while written < tokens:
+            source = sources[bisect.bisect_left(source_cw, rng.random() * source_cw[-1])]
+            if source == 'Greek' and counters[source] >= GREEK_MAX:
+                source = 'German'
+            counters[source] += 1
+            sent_id = SENT_ID_FORMATS[source].format(n=counters[source])
+            block, n_tokens = build_sentence(rng, lexicon, sent_id)
+            handles[source].write(block)
+            token_counts[source] += n_tokens
+            written += n_tokens
+    finally:
+        for handle in handles.values():
+            handle.close()
+
+    manifest = {
+        'seed': seed,
+        'tokens': written,
+        'sentences': sum(counters.values()),
+        'verbs': len(lexicon.verbs),
+        'nouns': len(lexicon.nouns),
+        'per_source': {name: {'sentences': counters[name], 'tokens': token_counts[name]} for name in sources},
+    }
+    with open(os.path.join(out_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a seeded synthetic UD corpus (CoNLL-U).")
+    parser.add_argument('out_dir')
+    parser.add_argument('--tokens', type=int, default=100_000, help="corpus size (10k .. 10M)")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+    manifest = generate(args.out_dir, args.tokens, args.seed)
+    print(json.dumps(manifest, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+try:
+    import psutil
+except ImportError:  # optional: per-scenario RSS peaks need it, the process peak does not
+    psutil = None
+
+
+# -------------------------------------------------------------------
+# Benchmark runner
+# -------------------------------------------------------------------
+# Replays the scenario catalogue (benchmarks/scenarios.py) through the Flask test
+# client of create_app() and writes one JSON report: per scenario the latency
+# p50/p95/p99 (ms), mean statements / DB time / rows per request, errors and the
+# peak RSS, plus the process peak RSS and enough metadata (git revision, database,
+# corpus size) to compare runs with benchmarks/compare.py.
+#
+#   python -m benchmarks.corpus data/100k --tokens 100000
+#   python -m benchmarks.standin data/100k bench.sqlite3      # or: flask ingest data/100k
+#   python -m benchmarks.run --database-url sqlite:///bench.sqlite3 --out before.json
+#
+# The engines follow the environment as in the app: COLUMNAR_INDEX=1, or
+# BITMAP_INDEX=bench.npz after flask build-bitmap-index bench.npz (app/bitmap_index.py).
+#
+# Caches that would hide the work (result cache, ETags, decoded sentence payloads)
+# are off unless --cache; the request-scoped query memo stays on, it is part of the
+# code under test.
+BENCH_ENV = {
+    'RESULT_CACHE_BACKEND': 'none',
+    'HTTP_ETAGS': '0',
+    'SENTENCE_PAYLOAD_CACHE_SIZE': '0',
+    'METRICS': '0',
+    'CORPUS_VERSION_TTL': '3600',
+}
+
+
+def _rss_mb():
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / 2 ** 20
+    return None
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10  # bytes on macOS, KiB on Linux
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def percentiles(samples):
+    if len(samples) == 1:
+        return {'p50': samples[0], 'p95': samples[0], 'p99': samples[0]}
+    cuts = statistics.quantiles(samples, n=100, method='inclusive')
+    return {'p50': cuts[49], 'p95': cuts[94], 'p99': cuts[98]}
+
+
+class QueryCounter:
+    """Query observer (app/profiler.py) summing statements, DB time and rows."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.statements = 0
+        self.db_ms = 0.0
+        self.rows = 0
+
+    def __call__(self, ms, statement, parameters, executemany, rows):
+        self.statements += 1
+        self.db_ms += ms
+        self.rows += rows or 0
+
+
+def run_scenario(app, client, counter, requests, repeat, warmup):
+    latencies, statements, db_ms, rows = [], [], [], []
+    errors = []
+    peak_rss = _rss_mb()
+    for iteration in range(warmup + repeat):
+        for req in requests:
+            counter.reset()
+            started = time.perf_counter()
+            if callable(req):
+                with app.test_request_context():
+                    req()
+                status = 200
+            else:
+                response = client.get(req)
+                response.get_data()  # drain streamed bodies
+                status = response.status_code
+            elapsed = (time.perf_counter() - started) * 1000
+            if iteration < warmup:
+                continue
+            if status != 200:
+                errors.append(f"{status} {req}")
+            latencies.append(elapsed)
+            statements.append(counter.statements)
+            db_ms.append(counter.db_ms)
+            rows.append(counter.rows)
+            rss = _rss_mb()
+            if rss is not None and rss > peak_rss:
+                peak_rss = rss
+
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'first_errors': errors[:3],
+        'latency_ms': dict(
+            percentiles(latencies), mean=statistics.fmean(latencies), max=max(latencies),
+        ),
+        'statements': statistics.fmean(statements),
+        'db_ms': statistics.fmean(db_ms),
+        'rows': statistics.fmean(rows),
+        'peak_rss_mb': peak_rss,
+    }
+
+
+def create_benchmark_app(database_url, cache=False):
+    os.environ['DATABASE_URL'] = database_url
+    for key, value in BENCH_ENV.items():
+        if not (cache and key in ('RESULT_CACHE_BACKEND', 'HTTP_ETAGS', 'SENTENCE_PAYLOAD_CACHE_SIZE')):
+            os.environ.setdefault(key, value)
+
+    from app.extensions import db
+    from app.init import create_app
+    from app.profiler import add_query_observer
+
+    app = create_app()
+    with app.app_context():
+        if db.engine.dialect.name == 'sqlite':
+            from .standin import install_sqlite_dialect
+            install_sqlite_dialect(db.engine)
+    counter = QueryCounter()
+    add_query_observer(app, counter)
+    return app, counter
+
+
+def corpus_stats(app):
+    from sqlalchemy import text
+    from app.extensions import db
+
+    with app.app_context(), db.engine.connect() as conn:
+        return {
+            table: conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+            for table in ('sentences', 'words', 'verbs', 'arguments')
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark scenarios and write a JSON report.")
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL'), required='DATABASE_URL' not in os.environ)
+    parser.add_argument('--out', default='-', help="report path ('-' for stdout)")
+    parser.add_argument('--repeat', type=int, default=10, help="measured passes over each scenario")
+    parser.add_argument('--warmup', type=int, default=2, help="unmeasured passes first")
+    parser.add_argument('--scenario', action='append', help="only these scenarios (repeatable)")
+    parser.add_argument('--cache', action='store_true', help="keep the result cache, ETags and payload cache on")
+    parser.add_argument('--label', help="free-form label stored in the report")
+    args = parser.parse_args(argv)
+
+    from app.extensions import db
+    from .scenarios import Vocabulary, build_scenarios
+
+    app, counter = create_benchmark_app(args.database_url, cache=args.cache)
+    with app.app_context(), db.engine.connect() as conn:
+        vocab = Vocabulary(conn)
+        database = db.engine.url.render_as_string(hide_password=True)
+        dialect = db.engine.dialect.name
+    scenarios = build_scenarios(vocab)
+    selected = args.scenario or list(scenarios)
+    unknown = set(selected) - set(scenarios)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    client = app.test_client()
+    results = {}
+    for name in selected:
+        started = time.perf_counter()
+        results[name] = run_scenario(app, client, counter, scenarios[name], args.repeat, args.warmup)
+        latency = results[name]['latency_ms']
+        print(f"{name:24s} p50 {latency['p50']:8.1f} ms  p95 {latency['p95']:8.1f} ms  "
+              f"{results[name]['statements']:5.1f} stmts  ({time.perf_counter() - started:.1f}s)",
+              file=sys.stderr)
+
+    report = {
+        'meta': {
+            'label': args.label,
+            'git_revision': _git_revision(),
+            'database': database,
+            'dialect': dialect,
+            'python': platform.python_version(),
+            'repeat': args.repeat,
+            'warmup': args.warmup,
+            'cache': args.cache,
+            'corpus': corpus_stats(app),
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'scenarios': results,
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+
+    payload = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out == '-':
+        print(payload)
+    else:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(payload + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+from urllib.parse import urlencode
+
+from sqlalchemy import text
+
+from app.query_helpers import (
+    _fetch_arm_for_arg_tlemmas,
+    _fetch_case_values_for_tbits,
+    _fetch_translit_for_arg_lemmas,
+    _fetch_translit_for_dep_bits,
+)
+
+
+# -------------------------------------------------------------------
+# Benchmark scenario catalogue
+# -------------------------------------------------------------------
+# Each scenario is a list of requests replayed through the Flask test client:
+# URLs (path + query string) or callables run inside a request context (the
+# query_helpers mappings, which have no page of their own). Concrete verbs,
+# arguments and initials are read from the corpus being benchmarked (Vocabulary),
+# so the same catalogue works at every scale: "head" is the most frequent verb,
+# "mid" the one at the 10th percentile of the frequency ranking, "tail" the median.
+PAGE_SIZE = 50  # occurrences per sentences page (as the views)
+
+LANGUAGE_LEMMA_ARGS = ['case_dependant_lemma'] + [f'co_occurring_lemma_{i}' for i in range(2, 6)]
+TRANSLIT_LEMMA_ARGS = ['translit_lemma'] + [f'co_occurring_lemma_{i}' for i in range(2, 6)]
+
+
+class Vocabulary:
+    """Verbs, arguments and initials of the corpus under test."""
+
+    def __init__(self, conn):
+        self.verbs = conn.execute(text("""
+            SELECT lemma, gloss, translit_verb, SUM(occurrences) AS n
+            FROM verb_frequencies
+            GROUP BY lemma, gloss, translit_verb
+            ORDER BY n DESC, lemma
+        """)).fetchall()
+        if not self.verbs:
+            raise RuntimeError("verb_frequencies is empty: load a corpus first")
+        self.head = self.verbs[0]
+        self.mid = self.verbs[len(self.verbs) // 10]
+        self.tail = self.verbs[len(self.verbs) // 2]
+
+        self.initials = [row[0] for row in conn.execute(text("""
+            SELECT lemma_initial, SUM(occurrences) AS n
+            FROM verb_frequencies GROUP BY lemma_initial ORDER BY n DESC
+        """))]
+        self.translit_initials = [row[0] for row in conn.execute(text("""
+            SELECT translit_initial, SUM(occurrences) AS n
+            FROM verb_frequencies GROUP BY translit_initial ORDER BY n DESC
+        """))]
+
+        # Most frequent argument combinations of the head verb, one per dependency block.
+        self.arguments = conn.execute(text("""
+            SELECT a.dep_rel, a.case_value, a.lemma, a.translit_dep_lemma, a.translit_lemma, COUNT(*) AS n
+            FROM arguments a
+            JOIN verbs v ON v.sent_id = a.sent_id AND v.token_id = a.head_id
+            WHERE v.lemma = :lemma AND v.gloss = :gloss
+            GROUP BY a.dep_rel, a.case_value, a.lemma, a.translit_dep_lemma, a.translit_lemma
+            ORDER BY n DESC
+            LIMIT 5
+        """), {'lemma': self.head.lemma, 'gloss': self.head.gloss}).fetchall()
+
+
+def _url(path, pairs):
+    pairs = [(k, v) for k, v in pairs if v is not None]
+    return path + ('?' + urlencode(pairs) if pairs else '')
+
+
+def _verb_args(verb, script='language'):
+    return [
+        ('selected_verb', verb.lemma if script == 'language' else verb.translit_verb),
+        ('selected_verb_gloss', verb.gloss),
+    ]
+
+
+def _dependency_args(arguments, script='language'):
+    pairs = []
+    for idx, arg in enumerate(arguments):
+        case_value = arg.case_value if script == 'language' else arg.translit_dep_lemma
+        lemma = arg.lemma if script == 'language' else arg.translit_lemma
+        lemma_arg = (LANGUAGE_LEMMA_ARGS if script == 'language' else TRANSLIT_LEMMA_ARGS)[idx]
+        if idx == 0:
+            pairs += [('syntactic_relation', arg.dep_rel), ('case_value', case_value), (lemma_arg, lemma)]
+        else:
+            n = idx + 1
+            pairs += [
+                (f'dependency{n}_visible', 'true'),
+                (f'co_occurring_deprel_{n}', arg.dep_rel),
+                (f'co_occurring_case_value_{n}', case_value),
+                (lemma_arg, lemma),
+            ]
+    return pairs
+
+
+def _helpers(vocab):
+    """Direct calls of the language <-> translit mappings the switch links use."""
+    head = vocab.head
+    lemmas = [a.lemma for a in vocab.arguments if a.lemma]
+    tlemmas = [a.translit_lemma for a in vocab.arguments if a.translit_lemma]
+    bits = [a.case_value for a in vocab.arguments if a.case_value]
+    tbits = [a.translit_dep_lemma for a in vocab.arguments if a.translit_dep_lemma]
+    return [
+        lambda: _fetch_translit_for_arg_lemmas(lemmas, vlemma=head.lemma, vgloss=head.gloss),
+        lambda: _fetch_translit_for_dep_bits(bits, vlemma=head.lemma, vgloss=head.gloss),
+        lambda: _fetch_arm_for_arg_tlemmas(tlemmas),
+        lambda: _fetch_case_values_for_tbits(tbits),
+    ]
+
+
+def build_scenarios(vocab):
+    """{name: [URL or callable]} of the catalogue."""
+    head, mid, tail = vocab.head, vocab.mid, vocab.tail
+    deep_page = max(1, (head.n // PAGE_SIZE) * 3 // 4)
+    sources = [('source_checkbox_submitted', '1'), ('selected_source', 'German'), ('selected_source', 'French')]
+
+    scenarios = {
+        'landing': ['/', '/translit'],
+        'initial_letter': (
+            [_url('/', [('initial', c)]) for c in vocab.initials[:3]]
+            + [_url('/translit', [('initial', c)]) for c in vocab.translit_initials[:3]]
+        ),
+        'selected_verb': [_url('/', _verb_args(verb)) for verb in (head, mid, tail)],
+        'feature_filters': [
+            _url('/', [('verbform', 'Fin'), ('mood', 'Ind')]),
+            _url('/', [('tense', 'Past'), ('voice', 'Pass'), ('person', '3')]),
+            _url('/', _verb_args(head) + [('aspect', 'Perf'), ('number', 'Plur')]),
+        ],
+        'deep_page': [
+            _url('/', _verb_args(head) + [('page', deep_page)]),
+            _url('/translit', _verb_args(head, 'translit') + [('page', deep_page)]),
+        ],
+        'source_filter': [
+            _url('/', sources),
+            _url('/', sources + [('initial', vocab.initials[0])]),
+            _url('/', sources + _verb_args(head)),
+        ],
+        'switch': [
+            _url('/', _verb_args(head) + _dependency_args(vocab.arguments[:2])),
+            _url('/translit', _verb_args(head, 'translit') + _dependency_args(vocab.arguments[:2], 'translit')),
+        ],
+        'query_helpers': _helpers(vocab),
+        'api': [
+            '/api/v1/language/verbs',
+            _url('/api/v1/language/facets', _verb_args(head)),
+            _url('/api/v1/language/features', [('verbform', 'Fin'), ('facets', 'disjunctive'), ('counts', '1')]
+                 + _dependency_args(vocab.arguments[:1])),
+            _url('/api/v1/translit/sentences', _verb_args(head, 'translit')),
+        ],
+    }
+    for blocks in range(1, len(vocab.arguments) + 1):
+        scenarios[f'dependency_blocks_{blocks}'] = [
+            _url('/', _verb_args(head) + _dependency_args(vocab.arguments[:blocks])),
+            _url('/', _dependency_args(vocab.arguments[:blocks])),
+        ]
+    return scenarios
@@ -0,0 +1,244 @@
+import argparse
+import glob
+import os
+import re
+import sqlite3
+import time
+
+from flask import Flask
+from sqlalchemy import event
+
+from app.extensions import db
+from app.filter_spec import FEATURE_FILTERS
+from app.ingest import INGEST_TABLES, read_conllu, sentence_rows
+from app.sentence_payloads import build_sentence_payloads
+from app.sources import SOURCE_IDS
+from app.summary import SUMMARY_KEY_COLUMNS
+
+
+# -------------------------------------------------------------------
+# SQLite stand-in for the MySQL corpus database
+# -------------------------------------------------------------------
+# For benchmarking without a MySQL server: a SQLite file with the schema the
+# migrations produce (sources, source_id columns, normalized columns, summary,
+# payloads, version stamps and the hot-path indexes), filled from CoNLL-U with the
+# same row code as flask ingest.
+#
+# install_sqlite_dialect() teaches a SQLite engine the few MySQL-isms of the app's
+# SQL: REGEXP, SUBSTRING_INDEX(), the utf8mb4_bin collation, Unicode-aware LOWER(),
+# multi-column COUNT(DISTINCT a, b), reserved words as qualified column names
+# (v.Case) and tuple-valued ":param" lists in "IN :param" (pymysql expands those
+# itself).
+#
+# Timings against the stand-in are only comparable with each other (before/after
+# on the same file), never with MySQL.
+VERB_FEATURE_COLUMNS = tuple(column for _, column, _ in FEATURE_FILTERS)
+
+SCHEMA = (
+    """CREATE TABLE sources (id SMALLINT PRIMARY KEY, name VARCHAR(64) NOT NULL UNIQUE)""",
+    """CREATE TABLE sentences (
+        sent_id VARCHAR(255) PRIMARY KEY, text TEXT, transliterated_text TEXT,
+        translated_text TEXT, source_id SMALLINT)""",
+    """CREATE TABLE words (
+        sent_id VARCHAR(255) NOT NULL, token_id INTEGER NOT NULL, form VARCHAR(255),
+        translit VARCHAR(255), feat TEXT, gloss VARCHAR(255), head_id INTEGER,
+        dep_rel VARCHAR(64), pos VARCHAR(16), PRIMARY KEY (sent_id, token_id))""",
+    f"""CREATE TABLE verbs (
+        sent_id VARCHAR(255) NOT NULL, token_id INTEGER NOT NULL, lemma VARCHAR(255),
+        gloss VARCHAR(255), translit_verb VARCHAR(255), url VARCHAR(255), source_id SMALLINT,
+        lemma_initial VARCHAR(8), translit_initial VARCHAR(8),
+        {', '.join(f'"{column}" VARCHAR(32)' for column in VERB_FEATURE_COLUMNS)},
+        gloss_norm VARCHAR(255) GENERATED ALWAYS AS (LOWER(gloss)) STORED,
+        translit_verb_norm VARCHAR(255) GENERATED ALWAYS AS (LOWER(translit_verb)) STORED,
+        PRIMARY KEY (sent_id, token_id))""",
+    """CREATE TABLE arguments (
+        sent_id VARCHAR(255) NOT NULL, head_id INTEGER NOT NULL, token_id INTEGER NOT NULL,
+        dep_rel VARCHAR(64), case_value VARCHAR(255), lemma VARCHAR(255),
+        translit_dep_lemma VARCHAR(255), translit_lemma VARCHAR(255),
+        cdep_token_id INTEGER, second_cdep_token_id INTEGER, fdep_token_id INTEGER,
+        source_id SMALLINT)""",
+    f"""CREATE TABLE verb_frequencies (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        {', '.join(f'"{column}" VARCHAR(255)' for column in SUMMARY_KEY_COLUMNS)},
+        occurrences INTEGER NOT NULL,
+        gloss_norm VARCHAR(255) GENERATED ALWAYS AS (LOWER(gloss)) STORED,
+        translit_verb_norm VARCHAR(255) GENERATED ALWAYS AS (LOWER(translit_verb)) STORED)""",
+    """CREATE TABLE sentence_payloads (
+        sent_id VARCHAR(255) NOT NULL, script VARCHAR(16) NOT NULL, payload BLOB NOT NULL,
+        PRIMARY KEY (script, sent_id))""",
+    """CREATE TABLE corpus_versions (
+        source_id SMALLINT PRIMARY KEY, version INTEGER NOT NULL, updated_at TIMESTAMP NOT NULL)""",
+)
+
+# Same indexes as the migrations (83920831f892, d09d61061063, d0b3ea2f2098, c9d55b971432,
+# 5f1c3e8a9b27).
+INDEXES = (
+    ('ix_sentences_source_id', 'sentences', ['source_id', 'sent_id']),
+    ('ix_verbs_source_id', 'verbs', ['source_id', 'sent_id']),
+    ('ix_arguments_source_id', 'arguments', ['source_id', 'sent_id']),
+    ('ix_verb_frequencies_lemma_gloss', 'verb_frequencies', ['lemma', 'gloss']),
+    ('ix_verb_frequencies_translit_gloss', 'verb_frequencies', ['translit_verb', 'gloss']),
+    ('ix_verb_frequencies_source_id', 'verb_frequencies', ['source_id', 'lemma']),
+    ('ix_arguments_head_deps', 'arguments', ['sent_id', 'head_id', 'dep_rel', 'case_value', 'lemma', 'token_id']),
+    ('ix_arguments_head_deps_translit', 'arguments',
+     ['sent_id', 'head_id', 'dep_rel', 'translit_dep_lemma', 'translit_lemma', 'token_id']),
+    ('ix_arguments_deps_head', 'arguments', ['dep_rel', 'case_value', 'lemma', 'sent_id', 'head_id', 'token_id']),
+    ('ix_arguments_deps_head_translit', 'arguments',
+     ['dep_rel', 'translit_dep_lemma', 'translit_lemma', 'sent_id', 'head_id', 'token_id']),
+    ('ix_verbs_lemma_gloss', 'verbs', ['lemma', 'gloss', 'sent_id', 'token_id']),
+    ('ix_verbs_translit_gloss', 'verbs', ['translit_verb', 'gloss', 'sent_id', 'token_id']),
+    ('ix_verbs_sent_token', 'verbs', ['sent_id', 'token_id', 'lemma', 'gloss']),
+    ('ix_verbs_gloss_norm', 'verbs', ['gloss_norm', 'sent_id', 'token_id']),
+    ('ix_verbs_translit_verb_norm', 'verbs', ['translit_verb_norm', 'gloss', 'sent_id', 'token_id']),
+    ('ix_verb_frequencies_gloss_norm', 'verb_frequencies', ['gloss_norm']),
+    ('ix_verb_frequencies_translit_verb_norm', 'verb_frequencies', ['translit_verb_norm', 'gloss']),
+    ('ix_verbs_lemma_initial', 'verbs', ['lemma_initial', 'lemma', 'gloss']),
+    ('ix_verbs_translit_initial', 'verbs', ['translit_initial', 'translit_verb', 'gloss']),
+    ('ix_verb_frequencies_lemma_initial', 'verb_frequencies', ['lemma_initial', 'lemma', 'gloss']),
+    ('ix_verb_frequencies_translit_initial', 'verb_frequencies', ['translit_initial', 'translit_verb', 'gloss']),
+)
+
+BATCH_ROWS = 10_000
+
+_PARAM_RE = re.compile(r"'(?:[^']|'')*'|\?")
+_RESERVED_COLUMN_RE = re.compile(r"(?<=\.)(Case)\b")  # SQLite keywords used as verbs columns
+_COUNT_DISTINCT_PAIR_RE = re.compile(r"COUNT\(DISTINCT ([\w.]+), ([\w.]+)\)")
+
+
+def _regexp(pattern, value):
+    return value is not None and re.search(pattern, str(value), re.IGNORECASE) is not None
+
+
+def _lower(value):
+    return value.lower() if isinstance(value, str) else value
+
+
+def _substring_index(value, delimiter, count):
+    if value is None:
+        return None
+    parts = str(value).split(delimiter)
+    return delimiter.join(parts[:count] if count >= 0 else parts[count:])
+
+
+def _binary_collation(a, b):
+    a, b = a.encode('utf-8'), b.encode('utf-8')
+    return (a > b) - (a < b)
+
+
+def register_functions(dbapi_conn):
+    dbapi_conn.create_function('REGEXP', 2, _regexp, deterministic=True)
+    dbapi_conn.create_function('LOWER', 1, _lower, deterministic=True)
+    dbapi_conn.create_function('SUBSTRING_INDEX', 3, _substring_index, deterministic=True)
+    dbapi_conn.create_collation('utf8mb4_bin', _binary_collation)
+
+
+def rewrite_mysql(statement):
+    statement = _RESERVED_COLUMN_RE.sub(r'"\1"', statement)
+    return _COUNT_DISTINCT_PAIR_RE.sub(r"COUNT(DISTINCT \1 || char(31) || \2)", statement)
+
+
+def expand_list_params(statement, parameters):
+    """Rewrite "?" bound to a tuple/list into "(?, ?, ...)" (qmark paramstyle)."""
+    if not isinstance(parameters, (tuple, list)) or not any(isinstance(p, (tuple, list)) for p in parameters):
+        return statement, parameters
+    values = iter(parameters)
+    flat = []
+
+    def replace(match):
+        if match.group(0) != '?':
+            return match.group(0)  # string literal
+        value = next(values)
+        if isinstance(value, (tuple, list)):
+            flat.extend(value)
+            return '(' + ', '.join('?' * len(value)) + ')' if value else '(NULL)'
+        flat.append(value)
+        return '?'
+
+    return _PARAM_RE.sub(replace, statement), tuple(flat)
+
+
+def install_sqlite_dialect(engine):
+    """Make a SQLite engine accept the app's MySQL-flavoured SQL (see module comment)."""
+    event.listen(engine, 'connect', lambda dbapi_conn, record: register_functions(dbapi_conn))
+
+    @event.listens_for(engine, 'before_cursor_execute', retval=True)
+    def _rewrite(conn, cursor, statement, parameters, context, executemany):
+        statement = rewrite_mysql(statement)
+        if executemany:
+            return statement, parameters
+        return expand_list_params(statement, parameters)
+
+
+def _insert_rows(conn, table, columns, rows):
+    placeholders = ', '.join('?' * len(columns))
+    quoted = ', '.join(f'"{column}"' for column in columns)
+    conn.executemany(f"INSERT INTO {table} ({quoted}) VALUES ({placeholders})", rows)
+
+
+def build_standin(conllu_dir, db_path):
+    """Create db_path from the CoNLL-U files of conllu_dir; returns row counts per table."""
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    conn = sqlite3.connect(db_path)
+    register_functions(conn)
+    for statement in SCHEMA:
+        conn.execute(statement)
+    conn.executemany("INSERT INTO sources (id, name) VALUES (?, ?)",
+                     [(sid, name) for name, sid in SOURCE_IDS.items()])
+
+    counts = dict.fromkeys(INGEST_TABLES, 0)
+    pending = {table: [] for table in INGEST_TABLES}
+    sentences_columns = INGEST_TABLES['sentences'] + ('text',)
+    for path in sorted(glob.glob(os.path.join(conllu_dir, '*.conllu*'))):
+        for comments, tokens in read_conllu(path):
+            rows = sentence_rows(comments, tokens)
+            rows['sentences'] = [row + (comments.get('text'),) for row in rows['sentences']]
+            for table, table_rows in rows.items():
+                pending[table].extend(table_rows)
+                if len(pending[table]) >= BATCH_ROWS:
+                    columns = sentences_columns if table == 'sentences' else INGEST_TABLES[table]
+                    _insert_rows(conn, table, columns, pending[table])
+                    counts[table] += len(pending[table])
+                    pending[table] = []
+    for table, table_rows in pending.items():
+        columns = sentences_columns if table == 'sentences' else INGEST_TABLES[table]
+        _insert_rows(conn, table, columns, table_rows)
+        counts[table] += len(table_rows)
+
+    key_cols = ', '.join(f'"{column}"' for column in SUMMARY_KEY_COLUMNS)
+    conn.execute(f"""
+        INSERT INTO verb_frequencies ({key_cols}, occurrences)
+        SELECT {key_cols}, COUNT(*) FROM (SELECT DISTINCT {key_cols}, sent_id, token_id FROM verbs)
+        GROUP BY {key_cols}
+    """)
+    conn.execute("INSERT INTO corpus_versions (source_id, version, updated_at) VALUES (0, 1, CURRENT_TIMESTAMP)")
+    conn.execute("INSERT INTO corpus_versions (source_id, version, updated_at) "
+                 "SELECT id, 1, CURRENT_TIMESTAMP FROM sources")
+    for name, table, columns in INDEXES:
+        conn.execute(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})")
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+
+    # Payloads through the app's own builder (in-place mode: every source is "new").
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.abspath(db_path)}"
+    db.init_app(app)
+    with app.app_context():
+        install_sqlite_dialect(db.engine)
+        counts['sentence_payloads'] = build_sentence_payloads(source_ids=sorted(SOURCE_IDS.values()))
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the SQLite stand-in database from CoNLL-U files.")
+    parser.add_argument('conllu_dir')
+    parser.add_argument('db_path')
+    args = parser.parse_args(argv)
+    started = time.perf_counter()
+    counts = build_standin(args.conllu_dir, args.db_path)
+    print(f"{args.db_path}: {counts} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
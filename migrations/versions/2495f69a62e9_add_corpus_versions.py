@@ -0,0 +1,33 @@
+"""add corpus_versions (corpus and per-source version stamps)
+
+Revision ID: 2495f69a62e9
+Revises: 9eea58533d22
+Create Date: 2026-10-18 14:21:06.402913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2495f69a62e9'
+down_revision = '9eea58533d22'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # source_id 0 is the corpus as a whole (app/versions.py CORPUS_SCOPE); the
+    # other rows are the ids of the sources table.
+    op.create_table(
+        'corpus_versions',
+        sa.Column('source_id', sa.SmallInteger(), primary_key=True, autoincrement=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+    )
+    op.execute("INSERT INTO corpus_versions (source_id, version, updated_at) VALUES (0, 1, NOW())")
+    op.execute("INSERT INTO corpus_versions (source_id, version, updated_at) SELECT id, 1, NOW() FROM sources")
+
+
+def downgrade():
+    op.drop_table('corpus_versions')
@@ -0,0 +1,71 @@
+"""add stored, indexed lemma_initial / translit_initial columns
+
+Revision ID: 5f1c3e8a9b27
+Revises: 2495f69a62e9
+Create Date: 2026-10-18 15:07:52.631940
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5f1c3e8a9b27'
+down_revision = '2495f69a62e9'
+branch_labels = None
+depends_on = None
+
+
+# Transliterated initials as of this revision (app/filter_spec.py
+# TRANSLIT_INITIAL_LETTERS); a verb's initial is the longest one it starts with.
+TRANSLIT_INITIAL_LETTERS = (
+    'a', 'b', 'g', 'd', 'e', 'z', 'ē', 'ǝ', 'tʻ', 'ž', 'i', 'l', 'x', 'c', 'k', 'h', 'j', 'ł',
+    'č', 'm', 'y', 'n', 'š', 'o', 'čʻ', 'p', 'ǰ', 'ṙ', 's', 'v', 't', 'r', 'cʻ', 'w', 'pʻ',
+    'kʻ', 'f',
+)
+
+# verbs and the summary (whose list predicates are the same "verbs.<column>" ones).
+TABLES = ('verbs', 'verb_frequencies')
+
+INDEXES = (
+    ('ix_verbs_lemma_initial', 'verbs', ['lemma_initial', 'lemma', 'gloss']),
+    ('ix_verbs_translit_initial', 'verbs', ['translit_initial', 'translit_verb', 'gloss']),
+    ('ix_verb_frequencies_lemma_initial', 'verb_frequencies', ['lemma_initial', 'lemma', 'gloss']),
+    ('ix_verb_frequencies_translit_initial', 'verb_frequencies', ['translit_initial', 'translit_verb', 'gloss']),
+)
+
+
+def _translit_initial_sql():
+    params = {}
+    whens = []
+    for n, initial in enumerate(sorted(TRANSLIT_INITIAL_LETTERS, key=len, reverse=True)):
+        whens.append(f"WHEN translit_verb COLLATE utf8mb4_bin LIKE :prefix{n} THEN :initial{n}")
+        params[f'prefix{n}'] = f"{initial}%"
+        params[f'initial{n}'] = initial
+    return f"CASE {' '.join(whens)} ELSE LEFT(translit_verb, 1) END", params
+
+
+def upgrade():
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} ADD COLUMN lemma_initial VARCHAR(8) NULL")
+        op.execute(f"ALTER TABLE {table} ADD COLUMN translit_initial VARCHAR(8) COLLATE utf8mb4_bin NULL")
+
+    translit_initial, params = _translit_initial_sql()
+    for table in TABLES:
+        op.get_bind().execute(sa.text(f"""
+            UPDATE {table}
+            SET lemma_initial = LEFT(lemma, 1),
+                translit_initial = {translit_initial}
+        """), params)
+
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+
+    for table in reversed(TABLES):
+        op.drop_column(table, 'translit_initial')
+        op.drop_column(table, 'lemma_initial')
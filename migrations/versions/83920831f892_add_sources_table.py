@@ -0,0 +1,64 @@
+"""add sources table and indexed source_id columns
+
+Revision ID: 83920831f892
+Revises:
+Create Date: 2026-10-18 09:12:44.118032
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '83920831f892'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+SOURCES = [
+    (1, 'German'),
+    (2, 'Dutch'),
+    (3, 'French'),
+    (4, 'English'),
+    (5, 'Greek'),
+    (6, 'Arabic'),
+]
+
+# Backfill rule: the sent_id patterns previously used by build_sources_condition,
+# first match wins; everything else is the Arabic catch-all.
+SOURCE_ID_CASE = """
+    CASE
+        WHEN sent_id LIKE '%hdt%' THEN 1
+        WHEN sent_id LIKE '%wiki%' OR sent_id LIKE '%WR-P-E-I%' THEN 2
+        WHEN sent_id LIKE '%fr%' THEN 3
+        WHEN sent_id LIKE '%GUM%' THEN 4
+        WHEN sent_id REGEXP '^[0-9]{5}$' THEN 5
+        ELSE 6
+    END
+"""
+
+TABLES = ('sentences', 'verbs', 'arguments')
+
+
+def upgrade():
+    sources = op.create_table(
+        'sources',
+        sa.Column('id', sa.SmallInteger(), primary_key=True, autoincrement=False),
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.UniqueConstraint('name', name='uq_sources_name'),
+    )
+    op.bulk_insert(sources, [{'id': sid, 'name': name} for sid, name in SOURCES])
+
+    for table in TABLES:
+        op.add_column(table, sa.Column('source_id', sa.SmallInteger(), nullable=True))
+        op.execute(f"UPDATE {table} SET source_id = {SOURCE_ID_CASE}")
+        op.create_index(f'ix_{table}_source_id', table, ['source_id', 'sent_id'])
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        op.drop_index(f'ix_{table}_source_id', table_name=table)
+        op.drop_column(table, 'source_id')
+
+    op.drop_table('sources')
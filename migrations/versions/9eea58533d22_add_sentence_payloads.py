@@ -0,0 +1,39 @@
+"""add sentence_payloads render payload store
+
+Revision ID: 9eea58533d22
+Revises: c9d55b971432
+Create Date: 2026-10-18 13:07:52.664380
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9eea58533d22'
+down_revision = 'c9d55b971432'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # sent_id mirrors the declared type of sentences.sent_id so joins/IN lists
+    # compare without conversion.
+    sent_id_type = op.get_bind().execute(sa.text("""
+        SELECT COLUMN_TYPE FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'sentences' AND COLUMN_NAME = 'sent_id'
+    """)).scalar()
+
+    # Filled by "flask build-sentence-payloads" (see app/sentence_payloads.py).
+    op.execute(f"""
+        CREATE TABLE sentence_payloads (
+            sent_id {sent_id_type} NOT NULL,
+            script VARCHAR(16) NOT NULL,
+            payload MEDIUMBLOB NOT NULL,
+            PRIMARY KEY (script, sent_id)
+        )
+    """)
+
+
+def downgrade():
+    op.drop_table('sentence_payloads')
@@ -0,0 +1,63 @@
+"""add generated lowercase gloss_norm / translit_verb_norm search columns
+
+Revision ID: c9d55b971432
+Revises: d0b3ea2f2098
+Create Date: 2026-10-18 11:58:41.904117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9d55b971432'
+down_revision = 'd0b3ea2f2098'
+branch_labels = None
+depends_on = None
+
+
+# (generated column, source column, extra column attributes). The searches compare
+# against a value lowercased in Python, so the predicates become plain equalities
+# on an indexed column instead of LOWER(column) scans.
+NORMALIZED_COLUMNS = (
+    ('gloss_norm', 'gloss', ''),
+    ('translit_verb_norm', 'translit_verb', 'COLLATE utf8mb4_bin'),
+)
+
+TABLES = ('verbs', 'verb_frequencies')
+
+INDEXES = (
+    ('ix_verbs_gloss_norm', 'verbs', ['gloss_norm', 'sent_id', 'token_id']),
+    ('ix_verbs_translit_verb_norm', 'verbs', ['translit_verb_norm', 'gloss', 'sent_id', 'token_id']),
+    ('ix_verb_frequencies_gloss_norm', 'verb_frequencies', ['gloss_norm']),
+    ('ix_verb_frequencies_translit_verb_norm', 'verb_frequencies', ['translit_verb_norm', 'gloss']),
+)
+
+
+def _column_type(table, column):
+    """Declared type of an existing column (e.g. 'varchar(255)'), reused for its generated twin."""
+    return op.get_bind().execute(sa.text("""
+        SELECT COLUMN_TYPE FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND COLUMN_NAME = :column
+    """), {'table': table, 'column': column}).scalar()
+
+
+def upgrade():
+    for table in TABLES:
+        for name, source, attrs in NORMALIZED_COLUMNS:
+            op.execute(
+                f"ALTER TABLE {table} ADD COLUMN {name} {_column_type(table, source)} {attrs} "
+                f"GENERATED ALWAYS AS (LOWER({source})) STORED"
+            )
+
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+
+    for table in reversed(TABLES):
+        for name, _, _ in reversed(NORMALIZED_COLUMNS):
+            op.drop_column(table, name)
@@ -0,0 +1,47 @@
+"""add verb_frequencies summary table
+
+Revision ID: d09d61061063
+Revises: 83920831f892
+Create Date: 2026-10-18 10:03:27.540611
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd09d61061063'
+down_revision = '83920831f892'
+branch_labels = None
+depends_on = None
+
+
+KEY_COLUMNS = (
+    'lemma', 'gloss', 'translit_verb', 'source_id',
+    'VerbForm', 'Aspect', 'Case', 'Connegative', 'Mood',
+    'Number', 'Person', 'Tense', 'Voice',
+)
+
+
+def upgrade():
+    key_cols = ', '.join(f'verbs.{c}' for c in KEY_COLUMNS)
+
+    # CREATE ... AS SELECT keeps the column types/collations of verbs, so the
+    # existing predicates (e.g. translit_verb COLLATE utf8mb4_bin) behave the same.
+    op.execute(f"""
+        CREATE TABLE verb_frequencies (
+            id INT NOT NULL AUTO_INCREMENT PRIMARY KEY
+        ) AS
+        SELECT {key_cols},
+               COUNT(DISTINCT verbs.token_id, verbs.sent_id) AS occurrences
+        FROM verbs
+        GROUP BY {key_cols}
+    """)
+
+    op.create_index('ix_verb_frequencies_lemma_gloss', 'verb_frequencies', ['lemma', 'gloss'])
+    op.create_index('ix_verb_frequencies_translit_gloss', 'verb_frequencies', ['translit_verb', 'gloss'])
+    op.create_index('ix_verb_frequencies_source_id', 'verb_frequencies', ['source_id', 'lemma'])
+
+
+def downgrade():
+    op.drop_table('verb_frequencies')
@@ -0,0 +1,102 @@
+"""add covering composite indexes for the verbs/arguments join paths
+
+Revision ID: d0b3ea2f2098
+Revises: d09d61061063
+Create Date: 2026-10-18 11:20:05.311472
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd0b3ea2f2098'
+down_revision = 'd09d61061063'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns). Every dependency block joins
+#   arguments aN ON v.token_id = aN.head_id AND v.sent_id = aN.sent_id
+# and filters on the block's dep_rel/case value/lemma, then compares aN.token_id
+# across blocks; the verbs side is filtered by lemma/translit_verb + gloss and read
+# for sent_id/token_id. Each index carries all the columns its access path reads,
+# so the join never has to touch the base rows, as long as the key fits InnoDB's
+# limit; otherwise the widest string columns are indexed by a prefix (see
+# _prefix_lengths), which keeps the lookups but reads those columns from the row.
+INDEXES = (
+    # verbs -> arguments (head lookup), per script
+    ('ix_arguments_head_deps', 'arguments',
+     ['sent_id', 'head_id', 'dep_rel', 'case_value', 'lemma', 'token_id']),
+    ('ix_arguments_head_deps_translit', 'arguments',
+     ['sent_id', 'head_id', 'dep_rel', 'translit_dep_lemma', 'translit_lemma', 'token_id']),
+    # arguments -> verbs, when the dependency filter is the selective side
+    ('ix_arguments_deps_head', 'arguments',
+     ['dep_rel', 'case_value', 'lemma', 'sent_id', 'head_id', 'token_id']),
+    ('ix_arguments_deps_head_translit', 'arguments',
+     ['dep_rel', 'translit_dep_lemma', 'translit_lemma', 'sent_id', 'head_id', 'token_id']),
+    # selected verb / sense and the verbs list grouping
+    ('ix_verbs_lemma_gloss', 'verbs', ['lemma', 'gloss', 'sent_id', 'token_id']),
+    ('ix_verbs_translit_gloss', 'verbs', ['translit_verb', 'gloss', 'sent_id', 'token_id']),
+    # arguments -> verbs and sentences -> verbs lookups
+    ('ix_verbs_sent_token', 'verbs', ['sent_id', 'token_id', 'lemma', 'gloss']),
+)
+
+
+# InnoDB index key limit in bytes (DYNAMIC / COMPRESSED row formats).
+MAX_KEY_BYTES = 3072
+
+# Key bytes of the non-string column types.
+FIXED_BYTES = {
+    'tinyint': 1, 'smallint': 2, 'mediumint': 3, 'int': 4, 'bigint': 8,
+    'date': 3, 'datetime': 8, 'timestamp': 4,
+}
+
+
+def _columns(table):
+    """{column: (data type, max characters, max bytes per character)} of an existing table."""
+    rows = op.get_bind().execute(sa.text("""
+        SELECT c.COLUMN_NAME, c.DATA_TYPE, c.CHARACTER_MAXIMUM_LENGTH, cs.MAXLEN
+        FROM information_schema.COLUMNS c
+        LEFT JOIN information_schema.CHARACTER_SETS cs ON cs.CHARACTER_SET_NAME = c.CHARACTER_SET_NAME
+        WHERE c.TABLE_SCHEMA = DATABASE() AND c.TABLE_NAME = :table
+    """), {'table': table}).fetchall()
+    return {row[0]: (row[1].lower(), row[2], row[3]) for row in rows}
+
+
+def _prefix_lengths(table, columns):
+    """
+    {column: characters} prefixes that fit the key of columns into MAX_KEY_BYTES.
+    The byte budget left by the fixed-size columns is shared evenly by the string
+    columns; a column narrower than its share is kept whole and leaves the rest to
+    the others. TEXT columns always get a prefix.
+    """
+    info = _columns(table)
+    budget = MAX_KEY_BYTES
+    strings = []
+    for column in columns:
+        data_type, chars, maxlen = info[column]
+        if maxlen is None:
+            budget -= FIXED_BYTES.get(data_type, 8)
+        else:
+            strings.append((chars * maxlen, column, maxlen, data_type.endswith('text')))
+
+    lengths = {}
+    for remaining, (key_bytes, column, maxlen, is_text) in zip(range(len(strings), 0, -1), sorted(strings)):
+        share = budget // remaining
+        if key_bytes > share or is_text:
+            lengths[column] = min(key_bytes, share) // maxlen
+            budget -= lengths[column] * maxlen
+        else:
+            budget -= key_bytes
+    return lengths
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, mysql_length=_prefix_lengths(table, columns))
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
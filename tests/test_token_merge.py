@@ -0,0 +1,210 @@
+"""
+Golden tests for app/token_merge.py.
+
+legacy_merge() is the clitic/punctuation merge loop that the home and translit
+views used to inline (same loop in both, with different sets). The engine must
+produce exactly the same display words on every sentence below.
+
+Run from the repository root: python -m unittest tests/test_token_merge.py
+"""
+import copy
+import random
+import unittest
+
+from app.token_merge import (
+    FLAG_KEYS, LANGUAGE_RULES, TRANSLIT_RULES, compile_display, flag_mask, merge_display,
+    merge_groups, merge_tokens,
+)
+
+LANGUAGE_SETS = (
+    {'յ', 'զ', 'ց', 'չ', 'Յ', 'Զ', 'Ց', 'Չ'},
+    {'ս', 'դ', 'ն', '՝', '.', ':', ','},
+    {'՞', '՛'},
+    {'ա', 'ե', 'է', 'ը', 'ի', 'օ', 'ու', 'ո', 'Է'},
+)
+TRANSLIT_SETS = (
+    {'y', 'z', 'cʻ', 'čʻ', 'Y', 'Z', 'Cʻ', 'Čʻ'},
+    {'s', 'd', 'n', ';', '.', ',', ':'},
+    {'?', '!'},
+    {'a', 'e', 'ē', 'ǝ', 'i', 'o', 'u'},
+)
+
+
+def legacy_merge(original_words, tokens_attach_to_next, tokens_attach_to_prev, special_attach_tokens, vowels):
+    """The pre-engine view loop, verbatim apart from the parameters."""
+    merged_words = []
+    i = 0
+    while i < len(original_words):
+        current_token = original_words[i]
+        current_form = current_token['form']
+        current_token_ids = [str(current_token['token_id'])]
+        current_attrs = current_token.copy()
+        current_attrs['token_id'] = '_'.join(current_token_ids)
+        tokens_info = current_token.get('tokens_info', [{'gloss': current_token.get('gloss'), 'feat': current_token.get('feat')}])
+        i += 1
+
+        if current_form in special_attach_tokens and merged_words:
+            last_word = merged_words.pop()
+            last_form = last_word['form']
+            vowel_indices = [idx for idx, char in enumerate(last_form) if char in vowels]
+            insert_pos = (vowel_indices[-1] + 1) if vowel_indices else len(last_form)
+            last_word['form'] = last_form[:insert_pos] + current_form + last_form[insert_pos:]
+            last_word['tokens_info'] += tokens_info
+            for k in FLAG_KEYS:
+                last_word[k] = last_word[k] or current_attrs[k]
+            last_word['token_id'] = f"{last_word['token_id']}_{current_attrs['token_id']}"
+            tooltip_parts = []
+            for ti in last_word['tokens_info']:
+                g, f = ti.get('gloss'), ti.get('feat')
+                tooltip_parts.append(f"{g}.{f}" if g and f else (g or f or ''))
+            last_word['gloss'] = '='.join([p for p in tooltip_parts if p])
+            merged_words.append(last_word)
+            continue
+
+        while current_form in tokens_attach_to_prev and merged_words:
+            last_word = merged_words.pop()
+            current_form = last_word['form'] + current_form
+            current_token_ids = last_word['token_id'].split('_') + current_token_ids
+            tokens_info = last_word['tokens_info'] + tokens_info
+            for k in FLAG_KEYS:
+                current_attrs[k] = current_attrs[k] or last_word[k]
+            current_attrs['pos'] = current_attrs['pos'] or last_word['pos']
+
+        while current_form in tokens_attach_to_next and i < len(original_words):
+            nxt = original_words[i]
+            current_form += nxt['form']
+            current_token_ids.append(str(nxt['token_id']))
+            tokens_info += nxt.get('tokens_info', [{'gloss': nxt.get('gloss'), 'feat': nxt.get('feat')}])
+            for k in FLAG_KEYS:
+                current_attrs[k] = current_attrs[k] or nxt[k]
+            current_attrs['pos'] = current_attrs['pos'] or nxt['pos']
+            i += 1
+            if nxt['form'] not in tokens_attach_to_next:
+                break
+
+        tooltip_parts = []
+        for ti in tokens_info:
+            g, f = ti.get('gloss'), ti.get('feat')
+            tooltip_parts.append(f"{g}.{f}" if g and f else (g or f or ''))
+        current_attrs['form'] = current_form
+        current_attrs['token_id'] = '_'.join(current_token_ids)
+        current_attrs['gloss'] = '='.join([p for p in tooltip_parts if p])
+        current_attrs['tokens_info'] = tokens_info
+        merged_words.append(current_attrs)
+    return merged_words
+
+
+def make_words(spec):
+    """Word dicts as the views build them from (form, gloss, feat, pos, flag letters) tuples."""
+    words = []
+    for token_id, (form, gloss, feat, pos, flags) in enumerate(spec, start=1):
+        word = {
+            'token_id': token_id,
+            'form': form,
+            'feat': feat,
+            'gloss': gloss,
+            'head_id': 0 if token_id == 1 else 1,
+            'dep_rel': 'root' if token_id == 1 else 'dep',
+            'pos': pos,
+        }
+        for letter, key in zip('vacf', FLAG_KEYS):
+            word[key] = letter in flags
+        word['tokens_info'] = [{'gloss': gloss, 'feat': feat}]
+        words.append(word)
+    return words
+
+
+# (form, gloss, feat, pos, flags: v=selected verb, a=argument, c=case dep., f=fixed dep.)
+LANGUAGE_SENTENCES = [
+    # no attaching form
+    [('Եւ', 'and', None, 'CCONJ', ''), ('ասէ', 'say', 'Mood=Ind', 'VERB', 'v'), ('Յիսուս', 'Jesus', 'Case=Nom', 'PROPN', 'a')],
+    # zero-width prefix + host, article suffix, final punctuation
+    [('ետես', 'see', 'Mood=Ind', 'VERB', 'v'), ('զ', None, None, 'ADP', 'c'), ('այր', 'man', 'Case=Acc', 'NOUN', 'a'),
+     ('ն', 'the', None, 'DET', ''), ('։', None, None, 'PUNCT', ''), ('.', None, None, 'PUNCT', '')],
+    # emphasis mark inside the previous word, after its last vowel
+    [('ո՞', None, None, None, ''), ('գնաս', 'go', 'Person=2', 'VERB', 'v'), ('՞', None, None, 'PUNCT', ''),
+     ('դու', 'you', None, 'PRON', 'a'), ('՛', None, None, 'PUNCT', '')],
+    # emphasis mark as the first token stays on its own; word without vowel
+    [('՞', None, None, 'PUNCT', ''), ('ք', 'q', None, 'X', ''), ('՛', None, None, 'PUNCT', 'f')],
+    # chained prefixes and a prefix as the last token
+    [('ց', None, None, 'ADP', 'c'), ('յ', None, None, 'ADP', ''), ('երկինս', 'heaven', 'Case=Acc', 'NOUN', 'a'),
+     ('եկն', 'come', None, 'VERB', 'v'), ('զ', None, None, 'ADP', '')],
+    # suffix chains, POS fallback from the previous word, suffix at sentence start
+    [('ս', None, None, None, ''), ('տուն', 'house', 'Case=Nom', None, 'a'), ('ս', 'this', None, None, ''),
+     (',', None, None, None, ''), ('է', 'be', None, 'AUX', 'v')],
+    # suffix followed by prefix attaching forward, then an emphasis mark
+    [('բան', 'word', None, 'NOUN', ''), ('ն', None, None, 'DET', ''), ('չ', 'not', None, 'PART', ''),
+     ('գիտէր', 'know', 'Tense=Past', 'VERB', 'v'), ('՞', None, None, 'PUNCT', 'a')],
+    # empty forms
+    [('', None, None, 'X', ''), ('զ', None, None, 'ADP', ''), ('', 'x', None, None, 'a')],
+]
+
+TRANSLIT_SENTENCES = [
+    [('ew', 'and', None, 'CCONJ', ''), ('asē', 'say', 'Mood=Ind', 'VERB', 'v'), ('Yisus', 'Jesus', 'Case=Nom', 'PROPN', 'a')],
+    [('etes', 'see', None, 'VERB', 'v'), ('z', None, None, 'ADP', 'c'), ('ayr', 'man', 'Case=Acc', 'NOUN', 'a'),
+     ('n', 'the', None, 'DET', ''), (':', None, None, 'PUNCT', '')],
+    [('o', None, None, None, ''), ('?', None, None, 'PUNCT', ''), ('gnas', 'go', None, 'VERB', 'v'), ('!', None, None, 'PUNCT', 'f')],
+    [('cʻ', None, None, 'ADP', 'c'), ('y', None, None, 'ADP', ''), ('erkins', 'heaven', None, 'NOUN', 'a'), ('čʻ', 'not', None, 'PART', '')],
+    [('?', None, None, 'PUNCT', ''), ('s', None, None, None, ''), ('tun', 'house', None, None, 'a'), ('s', None, None, None, ''),
+     (';', None, None, None, '')],
+]
+
+
+def random_sentences(sets, n, seed):
+    """Seeded sentences dense in attaching forms (deterministic across runs)."""
+    attach_next, attach_prev, special, vowels = sets
+    plain = ['ab' + v for v in sorted(vowels)] + ['bcd', 'x', '']
+    pool = sorted(attach_next) + sorted(attach_prev) + sorted(special) + plain
+    rng = random.Random(seed)
+    sentences = []
+    for _ in range(n):
+        spec = []
+        for _ in range(rng.randint(1, 12)):
+            spec.append((
+                rng.choice(pool),
+                rng.choice([None, 'g', 'gloss two']),
+                rng.choice([None, 'Case=Nom', 'Case=Gen|Number=Sing']),
+                rng.choice([None, 'NOUN', 'VERB']),
+                ''.join(letter for letter in 'vacf' if rng.random() < 0.2),
+            ))
+        sentences.append(spec)
+    return sentences
+
+
+class MergeTokensGoldenTest(unittest.TestCase):
+
+    def assert_matches_legacy(self, specs, sets, rules):
+        for spec in specs:
+            words = make_words(spec)
+            expected = legacy_merge(copy.deepcopy(words), *sets)
+            untouched = copy.deepcopy(words)
+            with self.subTest(forms=[w['form'] for w in words]):
+                self.assertEqual(merge_tokens(words, rules), expected)
+                self.assertEqual(words, untouched)
+
+    def test_language_sentences(self):
+        self.assert_matches_legacy(LANGUAGE_SENTENCES, LANGUAGE_SETS, LANGUAGE_RULES)
+
+    def test_translit_sentences(self):
+        self.assert_matches_legacy(TRANSLIT_SENTENCES, TRANSLIT_SETS, TRANSLIT_RULES)
+
+    def test_language_random(self):
+        self.assert_matches_legacy(random_sentences(LANGUAGE_SETS, 2000, seed=11), LANGUAGE_SETS, LANGUAGE_RULES)
+
+    def test_translit_random(self):
+        self.assert_matches_legacy(random_sentences(TRANSLIT_SETS, 2000, seed=12), TRANSLIT_SETS, TRANSLIT_RULES)
+
+    def test_compiled_display_is_reusable(self):
+        # One compiled sentence, overlaid with different flags per "request".
+        spec = LANGUAGE_SENTENCES[1]
+        plain = make_words([(form, gloss, feat, pos, '') for form, gloss, feat, pos, _ in spec])
+        display, slots = compile_display(plain, merge_groups([w['form'] for w in plain], LANGUAGE_RULES))
+        for flags in ('', 'v', 'ac', 'vacf'):
+            words = make_words([(form, gloss, feat, pos, flags) for form, gloss, feat, pos, _ in spec])
+            marks = {w['token_id']: flag_mask(w) for w in words if flag_mask(w)}
+            with self.subTest(flags=flags):
+                self.assertEqual(merge_display(display, slots, marks), legacy_merge(copy.deepcopy(words), *LANGUAGE_SETS))
+
+
+if __name__ == '__main__':
+    unittest.main()